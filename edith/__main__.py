@@ -11,7 +11,7 @@ import sys
 from edith import LOCALEDIR
 from edith.i18n import GETTEXT_DOMAIN
 from edith.application import EdithApplication
-from edith.services import freeze_watchdog
+from edith.services import aio, freeze_watchdog
 
 # Held open for the process lifetime; see the faulthandler setup in main().
 _fault_log = None
@@ -61,6 +61,9 @@ def main():
         # An unsupported LANG shouldn't stop the app from starting.
         pass
 
+    # Before the application runs, so that its main loop is asyncio's too.
+    aio.install()
+
     app = EdithApplication()
     return app.run(sys.argv)
 
@@ -125,6 +125,11 @@ label.error { color: @error_color; }
             win = EdithWindow(application=self)
             win.present()
 
+            # Start loading spare editor WebViews, so the first file opened
+            # doesn't wait for Monaco to load.
+            from edith.widgets.editor_pool import EditorPool
+            EditorPool.get().prefill()
+
             # After present(), and on an idle callback: Adw.Dialog needs a
             # realized parent to attach to.
             from edith.widgets.whats_new_dialog import present_if_updated
@@ -240,6 +245,14 @@ label.error { color: @error_color; }
             record(f"=== application shutdown ({len(self.get_windows())} windows open) ===")
         except Exception:  # noqa: BLE001 - diagnostics must never block exit
             pass
+        # Quit without closing the windows: unsaved changes stay journalled
+        # for the next start, the journals of clean tabs are of no use.
+        for win in self.get_windows():
+            if hasattr(win, "discard_clean_journals"):
+                win.discard_clean_journals()
+        # Config changes of the last half second are still in memory.
+        from edith.services.config import ConfigService
+        ConfigService.flush()
         Adw.Application.do_shutdown(self)
 
     def _on_new_window(self, action, param):
@@ -13,7 +13,14 @@
   var pendingCalls = [];
   var ready = false;
   var loadingContent = false;  // suppress dirty tracking during setValue
-  var snapshotTimer = null;    // debounced content snapshot for crash recovery
+  var journal = null;          // change batch not yet sent to the journal
+  var journalTimer = null;
+  var JOURNAL_FLUSH_MS = 250;
+  var largeMode = false;       // file opened in large-file mode (see largeFileBegin)
+  var largeLoad = null;        // { started, language, readOnly } while chunks are arriving
+  var largeSavedOptions = null; // what LARGE_FILE_OPTIONS replaced, for leaveLargeMode
+  var following = false;       // tailing a remote file (see followBegin)
+  var followWasReadOnly = false;
 
   // Report to Python whenever the model's undo history is thrown away, so a
   // lost undo stack shows up in the log instead of being a mystery.
@@ -21,6 +28,88 @@
     postMessage("history-reset", { reason: reason });
   }
 
+  // Crash-recovery journal.  Every content change is sent to Python as the
+  // (offset, length, text) triples Monaco reports, batched for
+  // JOURNAL_FLUSH_MS; Python logs them over a base copy of the buffer and
+  // can replay them after a crash.  Offsets are UTF-16 code units.
+  // Not in large-file mode, whose whole point is never to hold the buffer
+  // twice, nor while following, where the buffer is read-only and only
+  // ever holds what the remote file has.
+  function journalRecord(e) {
+    if (largeMode || following) return;
+    if (e.isEolChange) {
+      // Not an edit with offsets: a batch of its own, after what came before.
+      journalFlush();
+      journal = { changes: [], eol: e.eol };
+      journalFlush();
+      return;
+    }
+    if (!journal) journal = { changes: [] };
+    for (var i = 0; i < e.changes.length; i++) {
+      var c = e.changes[i];
+      journal.changes.push([c.rangeOffset, c.rangeLength, c.text]);
+    }
+    if (!journalTimer) journalTimer = setTimeout(journalFlush, JOURNAL_FLUSH_MS);
+  }
+
+  function journalFlush() {
+    if (journalTimer) {
+      clearTimeout(journalTimer);
+      journalTimer = null;
+    }
+    if (!journal || !editor) return;
+    var model = editor.getModel();
+    journal.v = model.getVersionId();
+    journal.clean = model.getAlternativeVersionId() === cleanVersionId;
+    postMessage("journal", journal);
+    journal = null;
+  }
+
+  // Tell the journal the dirty state moved without the text changing.
+  function journalNote() {
+    if (largeMode) return;
+    if (!journal) journal = { changes: [] };
+    journalFlush();
+  }
+
+  // Whether the last line is in view, i.e. the user is watching new lines
+  // arrive rather than reading something further up.
+  function isScrolledToBottom() {
+    var lineHeight = editor.getOption(monaco.editor.EditorOption.lineHeight);
+    return editor.getScrollTop() + editor.getLayoutInfo().height >=
+      editor.getScrollHeight() - 2 * lineHeight;
+  }
+
+  // Apply edits that are not the user's: no undo step, no dirty flag.
+  // Follow mode only; the undo stack was dropped when it started, so
+  // nothing on it can refer to text these edits move.
+  function applyFollowEdits(edits, maxLines) {
+    var model = editor.getModel();
+    var atBottom = isScrolledToBottom();
+    var visible = editor.getVisibleRanges();
+    var topLine = visible.length ? visible[0].startLineNumber : 1;
+    var dropped = 0;
+    loadingContent = true;
+    try {
+      model.applyEdits(edits);
+      // Keep a ring of the newest maxLines lines; the oldest go first.
+      var excess = model.getLineCount() - maxLines;
+      if (maxLines > 0 && excess > 0) {
+        model.applyEdits([{ range: new monaco.Range(1, 1, excess + 1, 1), text: "" }]);
+        dropped = excess;
+      }
+    } finally {
+      loadingContent = false;
+    }
+    cleanVersionId = model.getAlternativeVersionId();
+    if (atBottom) {
+      editor.revealLine(model.getLineCount());
+    } else if (dropped) {
+      // Hold the lines being read in place while the top is trimmed away.
+      editor.setScrollTop(editor.getTopForLineNumber(Math.max(1, topLine - dropped)));
+    }
+  }
+
   // Replace the whole buffer *without* destroying undo history.
   // editor.setValue() resets the model's EditStack; pushEditOperations keeps
   // it and makes the replacement itself undoable.
@@ -58,6 +147,48 @@
     return true;
   }
 
+  // ── Large-file mode ───────────────────────────────────────────────────
+  // Everything here costs time proportional to the document (or to every
+  // visible line, on every scroll) and buys little in a multi-megabyte log.
+  var LARGE_FILE_OPTIONS = {
+    minimap: { enabled: false },
+    folding: false,
+    wordWrap: "off",
+    stickyScroll: { enabled: false },
+    bracketPairColorization: { enabled: false },
+    guides: { indentation: false, bracketPairs: false },
+    matchBrackets: "never",
+    occurrencesHighlight: "off",
+    selectionHighlight: false,
+    renderWhitespace: "none",
+    links: false,
+    colorDecorators: false,
+    codeLens: false,
+    quickSuggestions: false,
+    wordBasedSuggestions: "off",
+    unicodeHighlight: { ambiguousCharacters: false, invisibleCharacters: false },
+    smoothScrolling: false,
+  };
+  // Monaco only restricts tokenizing to the viewport for models that are
+  // over these limits when *created*; a model grown chunk by chunk is
+  // tokenized in full.  Past them, a large file stays plaintext.
+  var TOKENIZE_MAX_LENGTH = 20 * 1024 * 1024;
+  var TOKENIZE_MAX_LINES = 300 * 1000;
+
+  // Back to a normal buffer: journaled again, with the options large-file
+  // mode switched off as they were.  The next init() applies the user's
+  // settings over these.
+  function leaveLargeMode() {
+    if (!largeMode) return;
+    largeMode = false;
+    largeLoad = null;
+    loadingContent = false;
+    if (largeSavedOptions) {
+      editor.updateOptions(largeSavedOptions);
+      largeSavedOptions = null;
+    }
+  }
+
   // ── Custom options splitter ───────────────────────────────────────────
   // User-provided overrides may mix Monaco editor options with language
   // service options (HTML/CSS/JSON formatter settings). The editor options
@@ -152,7 +283,7 @@
   }
 
   // ── Post a message to Python ──────────────────────────────────────────
-  function postMessage(type, data) {
+  function send(type, data) {
     try {
       window.webkit.messageHandlers.edith.postMessage(
         JSON.stringify({ type: type, data: data || {} })
@@ -162,6 +293,49 @@
     }
   }
 
+  function postMessage(type, data) {
+    // Never ahead of the state updates before it: a close request right
+    // after a keystroke has to find the tab already marked dirty.
+    flushState();
+    send(type, data);
+  }
+
+  // State updates Python only needs the newest of (cursor position, dirty
+  // flag).  Typing fast or holding an arrow key makes one per keystroke,
+  // each a message to decode and a status bar update on the GTK main loop;
+  // instead they are collected here, newest per type, and go over as a
+  // single "batch" message once per animation frame.  "events" is how many
+  // updates the batch stands for, for the traffic counter on the Python side.
+  var statePending = null;
+  var stateEvents = 0;
+  var stateScheduled = false;
+  // Animation frames don't run while the page is hidden, e.g. a tab in the
+  // background that was just saved; the timeout sends the batch anyway.
+  var STATE_FALLBACK_MS = 100;
+
+  function postState(type, data) {
+    if (!statePending) statePending = {};
+    statePending[type] = data;
+    stateEvents++;
+    if (stateScheduled) return;
+    stateScheduled = true;
+    requestAnimationFrame(flushState);
+    setTimeout(flushState, STATE_FALLBACK_MS);
+  }
+
+  function flushState() {
+    stateScheduled = false;
+    if (!statePending) return;
+    var messages = [];
+    for (var type in statePending) {
+      messages.push({ type: type, data: statePending[type] });
+    }
+    var events = stateEvents;
+    statePending = null;
+    stateEvents = 0;
+    send("batch", { messages: messages, events: events });
+  }
+
   // ── Custom theme definitions ──────────────────────────────────────────
   function defineCustomThemes(monaco) {
     monaco.editor.defineTheme("monokai", {
@@ -484,37 +658,25 @@
       "editorTextFocus && !editorHasSelection && !suggestWidgetVisible"
     );
 
-    // Report cursor position changes to Python (debounced to reduce IPC chatter)
-    var cursorTimer = null;
+    // Report cursor position changes to Python, at most once a frame
     editor.onDidChangeCursorPosition(function (e) {
-      if (cursorTimer) clearTimeout(cursorTimer);
-      cursorTimer = setTimeout(function () {
-        cursorTimer = null;
-        postMessage("cursor-changed", {
-          line: e.position.lineNumber,
-          column: e.position.column,
-        });
-      }, 16);
+      postState("cursor-changed", {
+        line: e.position.lineNumber,
+        column: e.position.column,
+      });
     });
 
     // Track modification state
-    editor.getModel().onDidChangeContent(function () {
+    editor.getModel().onDidChangeContent(function (e) {
+      // Journalled whoever made the change: a reload moves the text just as
+      // typing does.  (Follow mode is the exception, see journalRecord.)
+      journalRecord(e);
       if (loadingContent) return;
       var currentVersionId = editor.getModel().getAlternativeVersionId();
       var isModified = currentVersionId !== cleanVersionId;
       if (isModified !== lastModifiedState) {
         lastModifiedState = isModified;
-        postMessage("modified-changed", { modified: isModified });
-      }
-      // Keep Python holding a recent copy of unsaved text: if the WebKit
-      // render process dies, the tab is rebuilt from this instead of from
-      // the (stale) file on disk.  Debounced to keep IPC traffic sane.
-      if (isModified) {
-        if (snapshotTimer) clearTimeout(snapshotTimer);
-        snapshotTimer = setTimeout(function () {
-          snapshotTimer = null;
-          postMessage("content-snapshot", { content: editor.getValue() });
-        }, 2000);
+        postState("modified-changed", { modified: isModified });
       }
     });
 
@@ -552,12 +714,16 @@
     // customOptions: arbitrary Monaco editor options from user config
     init: function (content, language, theme, fontFamily, fontSize, wordWrap, settings, customOptions) {
       function run() {
+        leaveLargeMode();
         if (content != null) {
           // Only the initial load may use setValue (fresh model, no history
           // worth keeping).  Everything else goes through setContent.
           loadingContent = true;
           editor.setValue(content);
           loadingContent = false;
+          // The journal's base is this text, sent separately (init-complete
+          // below); it must not also arrive as one giant change.
+          journal = null;
           reportHistoryReset("init");
           cleanVersionId = editor.getModel().getAlternativeVersionId();
           lastModifiedState = false;
@@ -597,10 +763,22 @@
           applyServiceOptions(split.services);
         }
         editor.updateOptions(opts);
+        // Two frames on: the first has been laid out and painted by then.
+        // Not a WebKit paint callback, but close enough to tell a pooled
+        // editor from a fresh one.
+        requestAnimationFrame(function () {
+          requestAnimationFrame(function () {
+            postMessage("first-paint", {});
+          });
+        });
         // Report detected line ending to Python
         postMessage("init-complete", {
           lineEnding: editor.getModel().getEOL() === "\r\n" ? "crlf" : "lf",
           wordWrap: editor.getOption(monaco.editor.EditorOption.wordWrap) === "on",
+          // What Python needs to check its copy of the file is the
+          // journal base (see EdithBridge.journalBase otherwise).
+          versionId: editor.getModel().getVersionId(),
+          length: editor.getModel().getValueLength(),
         });
       }
       if (ready) run();
@@ -615,8 +793,132 @@
       cleanVersionId = editor.getModel().getAlternativeVersionId();
       if (lastModifiedState) {
         lastModifiedState = false;
-        postMessage("modified-changed", { modified: false });
+        postState("modified-changed", { modified: false });
+      }
+    },
+
+    // Large-file loading: largeFileBegin(), then the file in pieces through
+    // largeFileAppend(), then largeFileEnd().  Sending the file as a single
+    // init() argument makes WebKit parse a script as big as the file, which
+    // stalls both processes and can take the web process down.
+    // The buffer is read-only until largeFileEnd(), whatever readOnly says:
+    // typing in among the arriving pieces would go unnoticed as a change.
+    largeFileBegin: function (readOnly) {
+      if (!editor) return;
+      var model = editor.getModel();
+      if (!largeSavedOptions) {
+        // Copied: updateOptions() merges into the raw options in place.
+        // Undefined (never set) restores the default.
+        var raw = editor.getRawOptions();
+        largeSavedOptions = {};
+        for (var name in LARGE_FILE_OPTIONS) {
+          largeSavedOptions[name] = raw[name] === undefined
+            ? undefined : JSON.parse(JSON.stringify(raw[name]));
+        }
       }
+      largeMode = true;
+      largeLoad = {
+        started: Date.now(),
+        language: model.getLanguageId(),
+        readOnly: !!readOnly,
+      };
+      var opts = { readOnly: true };
+      for (var key in LARGE_FILE_OPTIONS) opts[key] = LARGE_FILE_OPTIONS[key];
+      editor.updateOptions(opts);
+      // No tokenizing while the text is still arriving.
+      monaco.editor.setModelLanguage(model, "plaintext");
+      loadingContent = true;
+      model.setValue("");
+      postMessage("wrap-changed", { wordWrap: false });
+    },
+
+    largeFileAppend: function (text) {
+      if (!editor || !largeLoad) return;
+      var model = editor.getModel();
+      var line = model.getLineCount();
+      var column = model.getLineMaxColumn(line);
+      // applyEdits, not pushEditOperations: loading is not an undo step.
+      model.applyEdits([{
+        range: new monaco.Range(line, column, line, column),
+        text: text,
+      }]);
+    },
+
+    largeFileEnd: function () {
+      if (!editor || !largeLoad) return;
+      var model = editor.getModel();
+      loadingContent = false;
+      editor.updateOptions({ readOnly: largeLoad.readOnly });
+      var highlighted = model.getValueLength() < TOKENIZE_MAX_LENGTH &&
+        model.getLineCount() < TOKENIZE_MAX_LINES;
+      if (highlighted) {
+        monaco.editor.setModelLanguage(model, largeLoad.language);
+      }
+      reportHistoryReset("init");
+      cleanVersionId = model.getAlternativeVersionId();
+      lastModifiedState = false;
+      postMessage("large-file-loaded", {
+        lines: model.getLineCount(),
+        highlighted: highlighted,
+        ms: Date.now() - largeLoad.started,
+      });
+      largeLoad = null;
+    },
+
+    // Follow mode: the buffer tails a remote file.  followBegin() makes it
+    // read-only, then followAppend() adds what the file gained and
+    // followReset() replaces everything after a truncation or rotation;
+    // both keep at most maxLines lines.  followEnd() gives editing back.
+    followBegin: function () {
+      if (!editor || following) return;
+      var model = editor.getModel();
+      following = true;
+      // Python discards the journal; a batch still waiting here would
+      // only arrive after that, with no base to go on.
+      if (journalTimer) {
+        clearTimeout(journalTimer);
+        journalTimer = null;
+      }
+      journal = null;
+      followWasReadOnly = editor.getOption(monaco.editor.EditorOption.readOnly);
+      editor.updateOptions({ readOnly: true });
+      // Appends and trims bypass the undo stack, which would then point at
+      // text that is no longer where it was.  Start it over instead.
+      loadingContent = true;
+      try {
+        model.setValue(model.getValue());
+      } finally {
+        loadingContent = false;
+      }
+      reportHistoryReset("follow");
+      cleanVersionId = model.getAlternativeVersionId();
+      editor.revealLine(model.getLineCount());
+    },
+
+    followAppend: function (text, maxLines) {
+      if (!editor || !following) return;
+      var model = editor.getModel();
+      var line = model.getLineCount();
+      var column = model.getLineMaxColumn(line);
+      applyFollowEdits([{
+        range: new monaco.Range(line, column, line, column),
+        text: text,
+      }], maxLines);
+    },
+
+    followReset: function (text, maxLines) {
+      if (!editor || !following) return;
+      applyFollowEdits([{
+        range: editor.getModel().getFullModelRange(),
+        text: text,
+      }], maxLines);
+      editor.revealLine(editor.getModel().getLineCount());
+    },
+
+    followEnd: function () {
+      if (!editor || !following) return;
+      following = false;
+      editor.updateOptions({ readOnly: followWasReadOnly });
     },
 
     // Undo/redo driven from the GTK window accelerators.
@@ -662,7 +964,14 @@
         return;
       }
       var send = function () {
-        postMessage("save-content", { content: editor.getValue() });
+        // Everything up to the saved version goes to the journal first; the
+        // saved text then becomes its new base.
+        journalFlush();
+        postMessage("save-content", {
+          content: editor.getValue(),
+          version: editor.getModel().getAlternativeVersionId(),
+          versionId: editor.getModel().getVersionId(),
+        });
       };
       if (doFormat) {
         var action = editor.getAction("editor.action.formatDocument");
@@ -707,6 +1016,11 @@
       );
     },
 
+    setReadOnly: function (readOnly) {
+      if (!editor) return;
+      editor.updateOptions({ readOnly: !!readOnly });
+    },
+
     setMinimap: function (enabled) {
       if (!editor) return;
       editor.updateOptions({ minimap: { enabled: enabled } });
@@ -775,13 +1089,19 @@
       editor.focus();
     },
 
-    markClean: function () {
+    // versionId: the version that was written.  The save happens on a
+    // worker, so the buffer may have moved on by the time it is done; those
+    // later edits stay dirty.  Without it, the current version is clean.
+    markClean: function (versionId) {
       if (!editor) return;
-      cleanVersionId = editor.getModel().getAlternativeVersionId();
-      if (lastModifiedState) {
-        lastModifiedState = false;
-        postMessage("modified-changed", { modified: false });
+      var current = editor.getModel().getAlternativeVersionId();
+      cleanVersionId = (versionId === undefined || versionId === null) ? current : versionId;
+      var modified = current !== cleanVersionId;
+      if (modified !== lastModifiedState) {
+        lastModifiedState = modified;
+        postState("modified-changed", { modified: modified });
       }
+      journalNote();
     },
 
     // Force the dirty flag on — used after crash recovery, where the restored
@@ -791,8 +1111,36 @@
       cleanVersionId = null;
       if (!lastModifiedState) {
         lastModifiedState = true;
-        postMessage("modified-changed", { modified: true });
+        postState("modified-changed", { modified: true });
       }
+      journalNote();
+    },
+
+    // Hibernation: Python is about to drop this WebView.  The journal is
+    // flushed so unsaved text can be replayed, and the view state (cursor,
+    // selections, scroll, folding) goes along to be handed back on wake.
+    hibernateState: function () {
+      if (!editor) return;
+      journalFlush();
+      postMessage("view-state", { viewState: editor.saveViewState() });
+    },
+
+    restoreViewState: function (state) {
+      if (!editor || !state) return;
+      editor.restoreViewState(state);
+    },
+
+    // Send the whole buffer as the journal base, for when Python's copy of
+    // the file turned out not to match what the editor shows.
+    journalBase: function () {
+      if (!editor || largeMode) return;
+      journalFlush();
+      var model = editor.getModel();
+      postMessage("journal-base", {
+        content: model.getValue(),
+        v: model.getVersionId(),
+        clean: model.getAlternativeVersionId() === cleanVersionId,
+      });
     },
 
     isModified: function () {
@@ -11,6 +11,11 @@ class OpenFile:
     remote_path: str
     local_path: str
     is_modified: bool = False
+    # Server the file belongs to; part of the key of its recovery journal.
+    server_id: str | None = None
+    # Set when the local copy is only a preview of the remote file's head
+    # and tail (see edith.services.file_peek): the remote size it shows.
+    peek_size: int | None = None
 
     @property
     def filename(self) -> str:
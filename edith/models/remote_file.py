@@ -203,11 +203,13 @@ class RemoteFileInfo:
     def human_size(self) -> str:
         if self.is_dir:
             return "\u2014"
+        # On a copy: the listing compares infos, so size must stay in bytes.
+        size = self.size
         for unit in ("B", "KB", "MB", "GB"):
-            if self.size < 1024:
-                return f"{self.size:.0f} {unit}" if unit == "B" else f"{self.size:.1f} {unit}"
-            self.size /= 1024
-        return f"{self.size:.1f} TB"
+            if size < 1024:
+                return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+            size /= 1024
+        return f"{size:.1f} TB"
 
 
 class RemoteFileItem(GObject.Object):
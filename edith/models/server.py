@@ -3,6 +3,9 @@
 
 from dataclasses import dataclass, field, asdict
 
+# The group of a server outside every folder, where a folder id would be.
+UNGROUPED = "__ungrouped__"
+
 
 @dataclass
 class ServerInfo:
@@ -0,0 +1,161 @@
+# SPDX-FileCopyrightText: 2025 Kreuder <mk@singular.de>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""The saved servers as a list model, kept current by deltas.
+
+The server panel and the sidebar used to be Gtk.ListBoxes emptied and
+filled again on every change: edit a server, pin one, drag a group, and
+every row of every group was destroyed and built anew, a widget tree per
+server.  With a thousand servers that is a pause on every edit.
+
+Both are Gtk.ListViews now, which create rows only for what is on screen
+and recycle them while scrolling.  ServerStore holds one ServerItem per
+server in a Gio.ListStore, and sync() turns a freshly loaded config into
+changes to it: items of servers that are gone are removed, new servers
+appended, and an item whose server changed (name, group, pin) is spliced
+out and back in where it is, so the filter and sort models above re-place
+just that item and the view rebinds just its row.  Items are kept by
+server id, so the selected one stays selected across syncs.  The
+sidebar does the same with a GroupItem per group.
+
+Group and order are properties of the item (group, section, pinned,
+name), for Gtk.StringFilter, Gtk.StringSorter and Gtk.NumericSorter to
+filter and sort on without calling back into Python once per server.
+Search has an index of its own, edith.services.server_index.
+"""
+
+import gi
+gi.require_version("GObject", "2.0")
+from gi.repository import Gio, GObject
+
+from edith.models.server import UNGROUPED, FolderInfo, ServerInfo
+
+
+class ServerItem(GObject.Object):
+    """GObject wrapper around ServerInfo for use in ServerStore."""
+
+    __gtype_name__ = "ServerItem"
+
+    name = GObject.Property(type=str, default="")
+    # Folder id, or UNGROUPED.
+    group = GObject.Property(type=str, default="")
+    # Position of the group in the folder order, ungrouped last.
+    section = GObject.Property(type=int, default=0)
+    pinned = GObject.Property(type=bool, default=False)
+
+    def __init__(self):
+        super().__init__()
+        self.server_info = None
+        self.group_name = ""
+
+    def update(self, server_info: ServerInfo, group: str, group_name: str,
+               section: int, pinned: bool) -> bool:
+        """Take on new values; whether any of them differ from the old."""
+        changed = (server_info != self.server_info or group != self.group
+                   or group_name != self.group_name or section != self.section
+                   or pinned != self.pinned)
+        self.server_info = server_info
+        if not changed:
+            return False
+        self.group_name = group_name
+        self.name = server_info.display_name
+        self.group = group
+        self.section = section
+        self.pinned = pinned
+        return True
+
+
+class GroupItem(GObject.Object):
+    """One row of the server sidebar: all servers, the ungrouped ones or
+    a folder (`folder_info`), with how many servers it has."""
+
+    __gtype_name__ = "ServerGroupItem"
+
+    def __init__(self, key: str):
+        super().__init__()
+        self.key = key
+        self.folder_info = None
+        self.icon_name = ""
+        self.title = ""
+        self.count = 0
+
+    def update(self, icon_name: str, title: str, count: int,
+               folder_info: FolderInfo | None = None) -> bool:
+        """Take on new values; whether any of them differ from the old."""
+        changed = (icon_name, title, count, folder_info) != (
+            self.icon_name, self.title, self.count, self.folder_info)
+        self.icon_name = icon_name
+        self.title = title
+        self.count = count
+        self.folder_info = folder_info
+        return changed
+
+
+class ServerStore:
+    """ServerItems in a Gio.ListStore (`model`), in no particular order;
+    order is for a Gtk.SortListModel above it.  Main loop only."""
+
+    def __init__(self):
+        self.model = Gio.ListStore(item_type=ServerItem)
+        self._order = []  # ServerItems, as in model
+        self._items = {}  # server id -> ServerItem
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def get(self, server_id: str) -> ServerItem | None:
+        return self._items.get(server_id)
+
+    def sync(self, servers: list[ServerInfo], folders: list[FolderInfo],
+             pinned_ids, ungrouped_name: str = "") -> tuple[int, int, int]:
+        """Make the model hold exactly `servers`, changing only what
+        changed.  Returns how many items were (added, removed, updated)."""
+        ranks = {f.id: i for i, f in enumerate(folders)}
+        names = {f.id: f.name for f in folders}
+        pinned_ids = set(pinned_ids)
+        seen = set()
+        added, updated = [], set()
+        for server in servers:
+            if server.id in seen:
+                continue
+            seen.add(server.id)
+            if server.folder_id in ranks:
+                group, group_name = server.folder_id, names[server.folder_id]
+                section = ranks[server.folder_id]
+            else:
+                group, group_name, section = UNGROUPED, ungrouped_name, len(folders)
+            item = self._items.get(server.id)
+            if item is None:
+                item = ServerItem()
+                item.update(server, group, group_name, section, server.id in pinned_ids)
+                self._items[server.id] = item
+                added.append(item)
+            elif item.update(server, group, group_name, section, server.id in pinned_ids):
+                updated.add(server.id)
+
+        removed = self._items.keys() - seen
+        for server_id in removed:
+            del self._items[server_id]
+
+        # Removed and updated items go in one splice per run of adjacent
+        # ones, the last run first so that the positions of the others
+        # hold: updated ones out and back in at the same place, removed ones
+        # just out.  Nothing between two runs is touched.  New ones are
+        # appended.
+        touched = [i for i, item in enumerate(self._order)
+                   if item.server_info.id in removed or item.server_info.id in updated]
+        runs = []
+        for i in touched:
+            if runs and runs[-1][1] == i:
+                runs[-1][1] = i + 1
+            else:
+                runs.append([i, i + 1])
+        for first, last in reversed(runs):
+            kept = [item for item in self._order[first:last]
+                    if item.server_info.id not in removed]
+            self.model.splice(first, last - first, kept)
+            self._order[first:last] = kept
+        if added:
+            self.model.splice(len(self._order), 0, added)
+            self._order.extend(added)
+        return len(added), len(removed), len(updated)
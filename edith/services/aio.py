@@ -0,0 +1,121 @@
+# SPDX-FileCopyrightText: 2025 Kreuder <mk@singular.de>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Awaitable remote operations, on asyncio running inside the GLib main loop.
+
+The clients are blocking and serialised by one lock, and the main loop
+reaches them through run_async() callbacks.  Doing several things and
+acting when all of them are done (stat a dozen files, then list two
+directories, then decide) meant nesting callbacks and counting replies
+by hand.  With PyGObject's GLib event loop policy (PyGObject 3.50 and
+later), asyncio runs on the main loop itself, so code on the main thread
+can be written as
+
+    async def refresh(client):
+        aclient = AsyncClient(client)
+        attrs, entries = await asyncio.gather(
+            aclient.stat_many(paths), aclient.listdir_attr(directory))
+        ...   # back on the main thread, free to touch widgets
+
+    aio.spawn(refresh(client))
+
+and a cancelled asyncio task cancels the run_async() task under it.
+
+Concurrency still comes from the protocol, not from threads:
+stat_many() and read_ranges() pipeline their requests on the one SFTP
+channel, and calls for the same client keep to async_worker's per-client
+limit.  The synchronous methods remain what does the work; this is a
+view of them.  Where the GLib event loop is not available, install()
+says so and callers keep to run_async().
+"""
+
+import asyncio
+import functools
+import logging
+
+from edith.services.async_worker import run_async
+
+log = logging.getLogger(__name__)
+
+_installed = False
+_tasks = set()  # running spawn()s, kept alive until done
+
+
+def install() -> bool:
+    """Run asyncio on the GLib main loop from now on.  Call once, before
+    the application starts; False if this PyGObject can't."""
+    global _installed
+    try:
+        from gi.events import GLibEventLoopPolicy
+    except ImportError:
+        log.debug("no GLib event loop policy (PyGObject < 3.50); asyncio stays off")
+        return False
+    asyncio.set_event_loop_policy(GLibEventLoopPolicy())
+    _installed = True
+    return True
+
+
+def available() -> bool:
+    """Whether spawn() and AsyncClient can be used."""
+    return _installed
+
+
+def spawn(coro) -> asyncio.Task:
+    """Run the coroutine `coro` on the main loop.  Main thread only."""
+    task = asyncio.get_event_loop().create_task(coro)
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return task
+
+
+def in_worker(fn, *args, key=None, **kwargs) -> asyncio.Future:
+    """`fn(*args, **kwargs)` run on the worker pool, as a future of the
+    main loop.  Cancelling the future drops the worker task."""
+    loop = asyncio.get_event_loop()
+    future = loop.create_future()
+
+    def on_success(result):
+        if not future.done():
+            future.set_result(result)
+
+    def on_error(error):
+        if not future.done():
+            future.set_exception(error)
+
+    handle = run_async(functools.partial(fn, *args, **kwargs), on_success, on_error, key=key)
+    future.add_done_callback(lambda f: handle.cancel() if f.cancelled() else None)
+    return future
+
+
+class AsyncClient:
+    """Awaitable methods of an SftpClient or FtpClient."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def _call(self, name, *args, **kwargs):
+        return in_worker(getattr(self.client, name), *args, key=self.client, **kwargs)
+
+    async def stat(self, path: str):
+        return await self._call("stat", path)
+
+    async def stat_many(self, paths) -> list:
+        """SFTPAttributes or OSError per path, pipelined; see
+        SftpClient.stat_many()."""
+        return await self._call("stat_many", list(paths))
+
+    async def listdir_attr(self, path: str) -> list:
+        return await self._call("listdir_attr", path)
+
+    async def read_ranges(self, path: str, ranges) -> list[bytes]:
+        return await self._call("read_ranges", path, list(ranges))
+
+    async def download(self, remote_path: str, local_path: str, progress_cb=None):
+        """progress_cb(done, total) is called on a worker thread."""
+        return await self._call("download", remote_path, local_path, progress_cb=progress_cb)
+
+    async def upload(self, local_path: str, remote_path: str, progress_cb=None,
+                     overwrite: bool = False):
+        """progress_cb(done, total) is called on a worker thread."""
+        return await self._call("upload", local_path, remote_path,
+                                progress_cb=progress_cb, overwrite=overwrite)
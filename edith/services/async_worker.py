@@ -1,27 +1,57 @@
 # SPDX-FileCopyrightText: 2025 Kreuder <mk@singular.de>
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-"""Bridge between background threads and the GTK main loop."""
+"""Bridge between background threads and the GTK main loop.
 
+Every run_async() used to start a thread of its own.  Clicking through a
+few directories, a bulk operation and the change poller could have dozens
+of them queued on the same SftpClient lock, where all but one just wait,
+and a listing the user had long navigated away from still landed in the
+file browser when it finally got its turn.
+
+Tasks now run on a pool of at most _MAX_WORKERS threads, started as
+needed.  Tasks given the same `key` (the client they talk to) run at
+most _PER_KEY at a time, in the order they were queued: one long copy on
+a connection leaves room for a listing beside it, but a burst of work for
+one server can't take every worker from the others.
+
+run_async() returns the Task, and Task.cancel() means its callbacks are
+never called: a task still queued doesn't run at all, and one already
+running finishes in its thread with its result dropped.
+"""
+
+import collections
 import threading
 import traceback
 
-from gi.repository import GLib
+from edith.services.main_dispatch import call_soon
 
+_MAX_WORKERS = 8
+_PER_KEY = 2
 
-def run_async(task, on_success, on_error):
-    """Run `task()` in a thread; deliver result via GLib.idle_add.
 
-    Args:
-        task: Callable that does blocking work (runs in thread).
-        on_success: Called on GTK main thread with the return value.
-        on_error: Called on GTK main thread with the exception.
-    """
+class Task:
+    """One run_async() call.  cancel() from the main thread only."""
+
+    __slots__ = ("_fn", "_on_success", "_on_error", "key", "cancelled")
+
+    def __init__(self, fn, on_success, on_error, key):
+        self._fn = fn
+        self._on_success = on_success
+        self._on_error = on_error
+        self.key = key
+        self.cancelled = False
+
+    def cancel(self):
+        """Drop the result, and the work too if it hasn't started."""
+        self.cancelled = True
 
-    def worker():
+    def _run(self):
+        if self.cancelled:
+            return
         try:
-            result = task()
-            GLib.idle_add(_deliver_success, result)
+            result = self._fn()
+            call_soon(self._deliver, self._on_success, result)
         except Exception as e:
             traceback.print_exc()
             # Nothing launched from a .desktop file has a stderr anyone reads,
@@ -35,16 +65,88 @@ def run_async(task, on_success, on_error):
                 )
             except Exception:
                 pass
-            GLib.idle_add(_deliver_error, e)
+            call_soon(self._deliver, self._on_error, e)
+
+    def _deliver(self, callback, value):
+        if not self.cancelled:
+            callback(value)
+
+
+class _Pool:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queue = collections.deque()
+        self._running = collections.Counter()  # key -> tasks running
+        self._workers = 0
+        self._idle = 0  # waiting and not yet woken
+        self._wake = threading.Condition(self._lock)
 
-    def _deliver_success(result):
-        on_success(result)
-        return GLib.SOURCE_REMOVE
+    def submit(self, task: Task):
+        with self._lock:
+            self._queue.append(task)
+            if self._idle:
+                self._wake_one()
+            elif self._workers < _MAX_WORKERS:
+                self._workers += 1
+                threading.Thread(target=self._work, daemon=True,
+                                 name="edith-worker").start()
 
-    def _deliver_error(error):
-        on_error(error)
-        return GLib.SOURCE_REMOVE
+    def _wake_one(self):
+        """Wake a waiting worker.  Under the lock.
 
-    t = threading.Thread(target=worker, daemon=True)
-    t.start()
-    return t
+        Counted off here rather than by the worker once it has the lock
+        again: two submits in a row would otherwise both see the same
+        worker idle, and the second task wait for the first.
+        """
+        self._idle -= 1
+        self._wake.notify()
+
+    def _next(self):
+        """The first queued task whose key has room, or None.  Under the lock."""
+        for i, task in enumerate(self._queue):
+            if task.key is None or self._running[task.key] < _PER_KEY:
+                del self._queue[i]
+                return task
+        return None
+
+    def _work(self):
+        while True:
+            with self._lock:
+                task = self._next()
+                while task is None:
+                    self._idle += 1
+                    self._wake.wait()
+                    task = self._next()
+                if task.key is not None:
+                    self._running[task.key] += 1
+            try:
+                task._run()
+            finally:
+                with self._lock:
+                    if task.key is not None:
+                        self._running[task.key] -= 1
+                        if not self._running[task.key]:
+                            del self._running[task.key]
+                        # A task held back for this key may run now.
+                        if self._queue and self._idle:
+                            self._wake_one()
+
+
+_pool = _Pool()
+
+
+def run_async(task, on_success, on_error, key=None) -> Task:
+    """Run `task()` on a worker thread; deliver result via main_dispatch.
+
+    Args:
+        task: Callable that does blocking work (runs in thread).
+        on_success: Called on GTK main thread with the return value.
+        on_error: Called on GTK main thread with the exception.
+        key: Tasks with the same key (the client they use) run at most
+            _PER_KEY at a time, in order.
+
+    Returns the Task; cancel() it and neither callback is called.
+    """
+    handle = Task(task, on_success, on_error, key)
+    _pool.submit(handle)
+    return handle
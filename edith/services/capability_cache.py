@@ -0,0 +1,112 @@
+# SPDX-FileCopyrightText: 2025 Kreuder <mk@singular.de>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""What each server turned out to support, remembered between connections.
+
+Getting from "Connect" to a directory listing used to cost several round
+trips beyond the handshake itself: realpath(".") to resolve a "~" start
+directory, an `echo ok` exec probe, FEAT on FTP, limits@openssh.com on SFTP.
+None of those answers changes from one connection to the next, so they are
+kept here and the next connect uses them straight away.  The window re-probes
+in the background once the listing is up, so a server that changed is
+noticed on the following connect at the latest.
+
+Lives under the cache directory, not the config: losing it costs one slow
+connect, and nothing in it is worth a backup.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+# Bumped when the meaning of a field changes; older entries are then ignored.
+_VERSION = 1
+
+# Stores happen on worker threads, one per connecting window.
+_lock = threading.Lock()
+
+
+def _cache_path():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return Path(base) / "edith" / "capabilities.json"
+
+
+def _identity(server_info) -> dict:
+    """The settings a cached entry is only valid for.
+
+    Keyed by server id, but an edited host or user makes it a different
+    server as far as any of this is concerned.
+    """
+    return {
+        "host": server_info.host,
+        "port": server_info.port,
+        "username": server_info.username,
+        "protocol": getattr(server_info, "protocol", "sftp"),
+    }
+
+
+def _load_all() -> dict:
+    try:
+        data = json.loads(_cache_path().read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != _VERSION:
+        return {}
+    servers = data.get("servers")
+    return servers if isinstance(servers, dict) else {}
+
+
+def load(server_info) -> dict | None:
+    """Capabilities recorded for this server, or None if there are none
+    (or they were recorded for different connection settings)."""
+    entry = _load_all().get(server_info.id)
+    if not isinstance(entry, dict) or entry.get("identity") != _identity(server_info):
+        return None
+    caps = entry.get("caps")
+    return caps if isinstance(caps, dict) else None
+
+
+def store(server_info, caps: dict):
+    """Record capabilities for this server, replacing what was there.
+
+    Best effort: a cache that can't be written just means the next connect
+    probes again.
+    """
+    with _lock:
+        servers = _load_all()
+        servers[server_info.id] = {
+            "identity": _identity(server_info),
+            "caps": caps,
+            "updated": int(time.time()),
+        }
+        _write_all(servers)
+
+
+def update(server_info, **changes):
+    """Merge `changes` into what is recorded for this server."""
+    caps = dict(load(server_info) or {})
+    caps.update(changes)
+    store(server_info, caps)
+
+
+def forget(server_id: str):
+    """Drop whatever is recorded for a server, e.g. when it is deleted."""
+    with _lock:
+        servers = _load_all()
+        if servers.pop(server_id, None) is not None:
+            _write_all(servers)
+
+
+def _write_all(servers: dict):
+    path = _cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Written aside and renamed over, so a crash mid-write leaves the
+        # old cache rather than a truncated one.
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": _VERSION, "servers": servers}, indent=2))
+        os.replace(tmp, path)
+    except OSError:
+        pass
@@ -1,41 +1,108 @@
 # SPDX-FileCopyrightText: 2025 Kreuder <mk@singular.de>
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import atexit
+import copy
 import json
+import logging
 import os
+import threading
+import time
 from pathlib import Path
 from typing import List
 
 from edith.models.server import ServerInfo, FolderInfo
 
+log = logging.getLogger(__name__)
+
 CONFIG_DIR = Path(os.environ.get("XDG_CONFIG_HOME", Path.home() / ".config")) / "edith"
 SERVERS_FILE = CONFIG_DIR / "servers.json"
 
 
 class ConfigService:
-    """Load and save server/folder configurations to ~/.config/edith/servers.json."""
+    """Load and save server/folder configurations to ~/.config/edith/servers.json.
+
+    servers.json holds everything, and rewriting all of it to remember a
+    recent file, a pin or one preference meant serialising hundreds of
+    servers for a change of a few bytes.  Those small changes now go to a
+    journal beside it (servers.json.journal): one JSON line per change,
+    {"set": [section, key], "value": ...}, replayed over servers.json on
+    every read.  Whole-file writes (the server list, compaction) leave
+    servers.json complete again and remove the journal, and once the
+    journal passes _JOURNAL_MAX lines the next change compacts it.
+    servers.json stays the format everything else reads: backups, import
+    and export.
+
+    Nothing is written by the caller, either.  Changes are kept in memory,
+    where every read already sees them, and a writer thread puts them on
+    disk _DEBOUNCE_S after the last of a burst (at most _MAX_DELAY_S after
+    the first): dragging the sidebar, toggling five preferences or opening
+    ten files is one write, and none of it waits for the disk on the main
+    thread.  flush() writes what is pending right away; it runs at
+    shutdown and exit.
+    """
 
     _servers_file_override = None  # set via set_servers_file()
 
-    #: Last file content read, as (path, mtime_ns, size, text). Every read goes
-    #: through _load_raw, and opening a single editor tab calls it fourteen
-    #: times, so the same file was being opened and read fourteen times per tab.
-    #: Warm that is unmeasurable; with the page cache cold or the disk saturated
-    #: it is not, and it happens on the main thread — a package install
-    #: snapshotting btrfs underneath the app was enough to stall it for tens of
-    #: seconds inside MonacoEditor._build_ui.
-    _raw_cache = None
+    #: Last content read per file, path -> (mtime_ns, size, text). Every read
+    #: goes through _load_raw, and opening a single editor tab calls it
+    #: fourteen times, so the same file was being opened and read fourteen
+    #: times per tab. Warm that is unmeasurable; with the page cache cold or
+    #: the disk saturated it is not, and it happens on the main thread — a
+    #: package install snapshotting btrfs underneath the app was enough to
+    #: stall it for tens of seconds inside MonacoEditor._build_ui.
+    _raw_cache = {}
+
+    #: Journal lines before a change compacts them into servers.json.
+    _JOURNAL_MAX = 256
+
+    _DEBOUNCE_S = 0.5
+    _MAX_DELAY_S = 2.0
+
+    #: Guards everything below it.  What is waiting to be written is either
+    #: a whole config (_pending_full) or journal entries (_pending_keys,
+    #: (section, key) -> value), never both: a whole config is made from a
+    #: read that already includes the entries, and entries made after it
+    #: are applied to it.  _in_flight is what the writer is writing now, so
+    #: that reads keep seeing it until it is on disk.
+    _cond = threading.Condition()
+    _pending_full = None
+    _pending_keys = {}
+    _in_flight = None
+    _first_pending = None
+    _due = None
+    _writer = None
+    #: Held for the duration of every write, so writes land in order.
+    _io_lock = threading.Lock()
+
+    #: The "preferences" section as of the last parse or write.  Even with
+    #: the text cached, a preference read still parsed the whole file, and
+    #: with hundreds of servers in it that is most of the cost of a tab
+    #: opening; preferences are read from here instead.  A change made to
+    #: the file by something else shows up at the next write, which re-reads
+    #: it anyway.
+    _prefs = None
+    #: Called with the set of keys whenever preferences change; see
+    #: edith.services.preferences, which turns this into GObject signals.
+    _prefs_listeners = []
 
     @classmethod
     def set_servers_file(cls, path: str):
         """Use a custom servers file instead of the default."""
+        cls.flush()
         cls._servers_file_override = Path(path)
-        cls._raw_cache = None
+        cls._raw_cache = {}
+        cls._prefs = None
 
     @classmethod
     def _servers_file(cls) -> Path:
         return cls._servers_file_override or SERVERS_FILE
 
+    @classmethod
+    def _journal_file(cls) -> Path:
+        path = cls._servers_file()
+        return path.with_name(path.name + ".journal")
+
     # --- Internal helpers ---
 
     @classmethod
@@ -59,12 +126,13 @@ class ConfigService:
         try:
             st = path.stat()
         except OSError:
-            cls._raw_cache = None
+            cls._raw_cache.pop(path, None)
             return None
 
-        key = (path, st.st_mtime_ns, st.st_size)
-        if cls._raw_cache is not None and cls._raw_cache[:3] == key:
-            return cls._raw_cache[3]
+        key = (st.st_mtime_ns, st.st_size)
+        cached = cls._raw_cache.get(path)
+        if cached is not None and cached[:2] == key:
+            return cached[2]
 
         # A failed read is left to propagate, as it did before this cache
         # existed. Returning {} instead would be worse than the exception: the
@@ -73,23 +141,120 @@ class ConfigService:
         # would see no servers to protect and let the write through.
         text = path.read_text()
 
-        cls._raw_cache = key + (text,)
+        cls._raw_cache[path] = key + (text,)
         return text
 
     @classmethod
     def _load_raw(cls) -> dict:
+        """The config as it is now: on disk, with every change that is still
+        on its way there applied."""
+        with cls._cond:
+            layers = [(copy.deepcopy(full), dict(keys))
+                      for full, keys in (cls._in_flight or (None, {}),
+                                         (cls._pending_full, cls._pending_keys))
+                      if full is not None or keys]
+        # Oldest first.  A whole config already holds every change before
+        # it, so it replaces what came before rather than going under it.
+        data = None
+        for full, keys in layers:
+            if full is not None:
+                data = full
+            elif data is None:
+                data = cls._load_disk()
+            for (section, key), value in keys.items():
+                cls._apply(data, section, key, copy.deepcopy(value))
+        return data if data is not None else cls._load_disk()
+
+    @staticmethod
+    def _apply(data: dict, section: str, key, value):
+        if key is None:
+            data[section] = value
+        else:
+            if not isinstance(data.get(section), dict):
+                data[section] = {}
+            data[section][key] = value
+
+    @classmethod
+    def _load_disk(cls) -> dict:
         path = cls._servers_file()
         text = cls._read_cached(path)
-        if text is None:
-            return {}
-        try:
-            return json.loads(text)
-        except (json.JSONDecodeError, KeyError):
-            return {}
+        data = {}
+        if text is not None:
+            try:
+                data = json.loads(text)
+            except (json.JSONDecodeError, KeyError):
+                data = {}
+        for section, key, value in cls._journal_entries():
+            cls._apply(data, section, key, value)
+        return data
+
+    @classmethod
+    def _journal_entries(cls) -> list:
+        """(section, key or None, value) for every change in the journal."""
+        text = cls._read_cached(cls._journal_file())
+        entries = []
+        for line in (text or "").splitlines():
+            try:
+                entry = json.loads(line)
+                section, key = (entry["set"] + [None])[:2]
+                entries.append((section, key, entry["value"]))
+            except (ValueError, KeyError, TypeError):
+                # A line cut short by a crash mid-append, the last one: the
+                # change it held is lost, everything before it stands.
+                continue
+        return entries
+
+    @classmethod
+    def _write_key(cls, section: str, key, value):
+        """Set data[section][key] (data[section] with key None); on disk, one
+        line appended to the journal instead of the file rewritten."""
+        with cls._cond:
+            if cls._pending_full is not None:
+                cls._apply(cls._pending_full, section, key, value)
+            else:
+                # Re-inserted, so the journal gets the entries in the order
+                # their latest values were set.
+                cls._pending_keys.pop((section, key), None)
+                cls._pending_keys[(section, key)] = value
+            cls._schedule_write()
+        if section == "preferences":
+            prefs = dict(cls.preferences())
+            prefs[key] = value
+            cls._remember_preferences(prefs)
+
+    @classmethod
+    def _remember_preferences(cls, prefs):
+        """Keep `prefs` as the current preferences and tell the listeners
+        which keys differ from before."""
+        previous = cls._prefs
+        cls._prefs = copy.deepcopy(prefs) if isinstance(prefs, dict) else {}
+        if previous is None:
+            return  # the first read: nothing to compare with
+        missing = object()
+        changed = {
+            key for key in previous.keys() | cls._prefs.keys()
+            if previous.get(key, missing) != cls._prefs.get(key, missing)
+        }
+        if changed:
+            for listener in list(cls._prefs_listeners):
+                listener(changed)
+
+    @classmethod
+    def preferences(cls) -> dict:
+        """Every preference, read from the file only the first time.  Not to
+        be modified; get_preference() hands out copies."""
+        if cls._prefs is None:
+            cls._remember_preferences(cls._load_raw().get("preferences", {}))
+        return cls._prefs
+
+    @classmethod
+    def add_preferences_listener(cls, listener):
+        cls._prefs_listeners.append(listener)
 
     @classmethod
     def _write_raw(cls, data: dict, deliberate: bool = False):
-        """Write the whole config back, refusing to silently drop every server.
+        """Queue the whole config for writing, refusing to silently drop every
+        server.
 
         Everything the app knows lives in this one file, so a writer that meant
         to touch a single preference can take the server list with it if the
@@ -103,8 +268,6 @@ class ConfigService:
         only those may take it to zero, which is what deleting your last server
         legitimately does.
         """
-        path = cls._servers_file()
-
         if not deliberate:
             current = cls._load_raw()
             if current.get("servers") and not data.get("servers"):
@@ -115,17 +278,130 @@ class ConfigService:
                 from edith.services.freeze_watchdog import record
                 record(
                     f"REFUSED config write that would drop "
-                    f"{len(current['servers'])} servers from {path} "
+                    f"{len(current['servers'])} servers from {cls._servers_file()} "
                     f"(payload keys: {sorted(data)})"
                 )
                 return
 
+        # `data` is the writer's from here on; it came from _load_raw, so the
+        # entries waiting for the journal are in it already.
+        with cls._cond:
+            cls._pending_full = data
+            cls._pending_keys = {}
+            cls._schedule_write()
+        cls._remember_preferences(data.get("preferences", {}))
+
+    # --- Write-behind ---
+
+    @classmethod
+    def _schedule_write(cls):
+        """Have the writer thread write what is pending soon.  Under _cond."""
+        now = time.monotonic()
+        if cls._first_pending is None:
+            cls._first_pending = now
+        cls._due = min(now + cls._DEBOUNCE_S, cls._first_pending + cls._MAX_DELAY_S)
+        if cls._writer is None:
+            cls._writer = threading.Thread(target=cls._write_behind, daemon=True,
+                                           name="edith-config-writer")
+            cls._writer.start()
+            atexit.register(cls.flush)
+        cls._cond.notify()
+
+    @classmethod
+    def _write_behind(cls):
+        while True:
+            with cls._cond:
+                while cls._due is None or cls._due > time.monotonic():
+                    cls._cond.wait(None if cls._due is None else cls._due - time.monotonic())
+                cls._due = None
+            cls._write_pending()
+
+    @classmethod
+    def flush(cls):
+        """Write everything pending now, in the calling thread."""
+        with cls._cond:
+            cls._due = None
+        cls._write_pending()
+
+    @classmethod
+    def _write_pending(cls):
+        with cls._io_lock:
+            with cls._cond:
+                full, keys = cls._pending_full, cls._pending_keys
+                if full is None and not keys:
+                    return
+                cls._pending_full, cls._pending_keys = None, {}
+                cls._first_pending = None
+                cls._in_flight = (full, keys)
+            try:
+                if full is None and len(cls._journal_entries()) + len(keys) > cls._JOURNAL_MAX:
+                    full = cls._load_disk()
+                    for (section, key), value in keys.items():
+                        cls._apply(full, section, key, value)
+                if full is not None:
+                    cls._write_file(full)
+                else:
+                    cls._append_journal(keys)
+            except OSError as e:
+                # Kept, for the next write or flush() to try again; reads
+                # go on seeing the changes meanwhile.
+                log.warning("could not write the config: %s", e)
+                from edith.services.freeze_watchdog import record
+                record(f"config write failed, kept in memory: {e}")
+                with cls._cond:
+                    if cls._pending_full is None:
+                        if full is not None:
+                            for (section, key), value in cls._pending_keys.items():
+                                cls._apply(full, section, key, value)
+                            cls._pending_full, cls._pending_keys = full, {}
+                        else:
+                            cls._pending_keys = {**keys, **cls._pending_keys}
+            finally:
+                with cls._cond:
+                    cls._in_flight = None
+
+    @classmethod
+    def _append_journal(cls, keys: dict):
+        journal = cls._journal_file()
+        lines = "".join(
+            json.dumps({"set": [section] if key is None else [section, key],
+                        "value": value}) + "\n"
+            for (section, key), value in keys.items()
+        )
+        # After a torn last line, start on a fresh one rather than finish it.
+        torn = not (cls._read_cached(journal) or "\n").endswith("\n")
+        journal.parent.mkdir(parents=True, exist_ok=True)
+        with open(journal, "a") as f:
+            f.write(("\n" if torn else "") + lines)
+
+    @classmethod
+    def _write_file(cls, data: dict):
+        path = cls._servers_file()
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(json.dumps(data, indent=2))
+        # Replaced, not rewritten in place: a crash half way through leaves
+        # the old file, not half of the new one.
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(data, indent=2))
+        os.replace(tmp, path)
+        # `data` came from _load_raw, journal included, so what the journal
+        # held is in the file now.  Removed only after the replace: a crash
+        # in between replays changes the file already has, which is harmless.
+        try:
+            cls._journal_file().unlink()
+        except FileNotFoundError:
+            pass
         # Dropped rather than refreshed with what was just written: the stat
         # check would catch the change anyway, and re-reading once after a
         # write costs nothing next to trusting that the bytes landed.
-        cls._raw_cache = None
+        cls._raw_cache = {}
+
+    @classmethod
+    def compact(cls):
+        """Write what is pending and fold the journal into servers.json."""
+        cls.flush()
+        with cls._io_lock:
+            if cls._journal_entries():
+                cls._write_file(cls._load_disk())
 
     @classmethod
     def _save(cls, servers: List[ServerInfo], folders: List[FolderInfo]):
@@ -148,6 +424,8 @@ class ConfigService:
         """
         path = cls._servers_file()
         try:
+            # The backup is of servers.json alone, so it has to be complete.
+            cls.compact()
             if not path.exists():
                 return
             content = path.read_bytes()
@@ -208,6 +486,8 @@ class ConfigService:
         servers = ConfigService.load_servers()
         servers = [s for s in servers if s.id != server_id]
         ConfigService.save_servers(servers)
+        from edith.services import capability_cache
+        capability_cache.forget(server_id)
         return servers
 
     # --- Folder operations ---
@@ -284,21 +564,14 @@ class ConfigService:
 
     @staticmethod
     def push_recent(server_id: str, path: str):
-        data = ConfigService._load_raw()
-        recents = data.get("recents", {})
-        paths = [p for p in recents.get(server_id, []) if p != path]
+        paths = [p for p in ConfigService.get_recents(server_id) if p != path]
         paths.insert(0, path)
-        recents[server_id] = paths[:ConfigService.RECENTS_MAX]
-        data["recents"] = recents
-        ConfigService._write_raw(data)
+        ConfigService._write_key("recents", server_id, paths[:ConfigService.RECENTS_MAX])
 
     @staticmethod
     def delete_recent(server_id: str, path: str):
-        data = ConfigService._load_raw()
-        recents = data.get("recents", {})
-        recents[server_id] = [p for p in recents.get(server_id, []) if p != path]
-        data["recents"] = recents
-        ConfigService._write_raw(data)
+        paths = [p for p in ConfigService.get_recents(server_id) if p != path]
+        ConfigService._write_key("recents", server_id, paths)
 
     # --- Pins ---
 
@@ -309,22 +582,15 @@ class ConfigService:
 
     @staticmethod
     def add_pin(server_id: str, path: str, is_dir: bool):
-        data = ConfigService._load_raw()
-        pins = data.get("pins", {})
-        entries = pins.get(server_id, [])
+        entries = ConfigService.get_pins(server_id)
         if not any(e["path"] == path for e in entries):
             entries.append({"path": path, "is_dir": is_dir})
-        pins[server_id] = entries
-        data["pins"] = pins
-        ConfigService._write_raw(data)
+        ConfigService._write_key("pins", server_id, entries)
 
     @staticmethod
     def delete_pin(server_id: str, path: str):
-        data = ConfigService._load_raw()
-        pins = data.get("pins", {})
-        pins[server_id] = [e for e in pins.get(server_id, []) if e["path"] != path]
-        data["pins"] = pins
-        ConfigService._write_raw(data)
+        entries = [e for e in ConfigService.get_pins(server_id) if e["path"] != path]
+        ConfigService._write_key("pins", server_id, entries)
 
     # --- Pinned servers ---
 
@@ -339,14 +605,25 @@ class ConfigService:
 
     @staticmethod
     def toggle_server_pin(server_id: str):
-        data = ConfigService._load_raw()
-        pins = data.get("pinned_servers", [])
+        pins = ConfigService.get_pinned_servers()
         if server_id in pins:
             pins.remove(server_id)
         else:
             pins.append(server_id)
-        data["pinned_servers"] = pins
-        ConfigService._write_raw(data)
+        ConfigService._write_key("pinned_servers", None, pins)
+
+    # --- Server use ---
+
+    @staticmethod
+    def get_last_used() -> dict:
+        """server id -> when it was last connected to (Unix time)."""
+        data = ConfigService._load_raw()
+        last_used = data.get("last_used", {})
+        return last_used if isinstance(last_used, dict) else {}
+
+    @staticmethod
+    def mark_server_used(server_id: str):
+        ConfigService._write_key("last_used", server_id, int(time.time()))
 
     # --- Preferences ---
 
@@ -358,17 +635,20 @@ class ConfigService:
         packaging-agnostic: pacman, Flatpak and a source checkout all leave the
         config alone. Call it before anything writes config this session.
         """
-        return ConfigService._servers_file().exists()
+        return (ConfigService._servers_file().exists()
+                or ConfigService._journal_file().exists())
 
     @staticmethod
     def get_preference(key: str, default=None):
-        data = ConfigService._load_raw()
-        return data.get("preferences", {}).get(key, default)
+        value = ConfigService.preferences().get(key, default)
+        # A copy, so a caller editing what it got can't change the cache.
+        return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
 
     @staticmethod
     def set_preference(key: str, value):
-        data = ConfigService._load_raw()
-        prefs = data.get("preferences", {})
-        prefs[key] = value
-        data["preferences"] = prefs
-        ConfigService._write_raw(data)
+        prefs = ConfigService.preferences()
+        if key in prefs and prefs[key] == value:
+            # Nothing to write.  Preferences saves every editor setting when
+            # any one of them is toggled.
+            return
+        ConfigService._write_key("preferences", key, value)
@@ -0,0 +1,215 @@
+# SPDX-FileCopyrightText: 2025 Kreuder <mk@singular.de>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Remote file contents kept on disk between opens and between sessions.
+
+Every open used to download the file afresh into a new temp directory, and
+all of those went at exit, so reopening the same 5 MB file in another tab,
+or tomorrow, paid for the whole transfer again.  Now a copy of what was
+downloaded stays here, keyed by server and remote path, next to the size
+and mtime the server reported for it.  Opening the file asks the server
+for one stat; if size and mtime still match, the copy is used and nothing
+is downloaded.
+
+The tab never edits the cached copy itself: it gets a copy of its own in
+the usual temp directory, so a save that never makes it to the server
+can't leave the cache holding text the server doesn't have.  Only
+downloads whose before and after stats agree are stored, so a file
+written to while it was being fetched is not remembered with the newer
+mtime.
+
+Config key content_cache_mb caps the total (default 256; 0 turns the cache
+off).  Least recently used files go first, and no file bigger than a
+quarter of the cap is kept.  Hits, misses and the bytes that didn't have to
+be downloaded are logged, and written to the diagnostic log at exit.
+"""
+
+import atexit
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+from edith.services.config import ConfigService
+
+log = logging.getLogger(__name__)
+
+_CACHE_MB = 256
+# A hit only moves the entry's "used" time, which matters for nothing but
+# the order of eviction: written with the next store, at most this long
+# after the hit otherwise, and at exit.
+_USED_SAVE_DELAY_S = 30
+
+
+def _cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return Path(base) / "edith" / "content"
+
+
+class ContentCache:
+    """Downloaded remote files, shared by every window of the process.
+
+    Safe to call from the transfer workers; one lock covers the index.
+    """
+
+    _instance = None
+
+    @classmethod
+    def get(cls) -> "ContentCache":
+        if cls._instance is None:
+            cls._instance = cls()
+            atexit.register(cls._instance._record_stats)
+            atexit.register(cls._instance.flush)
+        return cls._instance
+
+    def __init__(self, directory: Path | None = None):
+        self._dir = directory or _cache_dir()
+        self._index_path = self._dir / "index.json"
+        self._lock = threading.Lock()
+        self._index = None  # key -> {"size", "mtime", "bytes", "used"}
+        self._dirty = False  # _index has "used" times not yet written
+        self._save_timer = None
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    @staticmethod
+    def _cap() -> int:
+        try:
+            return max(0, int(ConfigService.get_preference("content_cache_mb", _CACHE_MB))) << 20
+        except (TypeError, ValueError):
+            return _CACHE_MB << 20
+
+    @staticmethod
+    def _key(server_id: str, remote_path: str) -> str:
+        return hashlib.sha256(f"{server_id}\0{remote_path}".encode()).hexdigest()[:32]
+
+    @staticmethod
+    def _usable(server_id, attr) -> bool:
+        # Without an mtime (some FTP servers) a changed file of the same
+        # size can't be told apart from the cached one.
+        return bool(server_id) and bool(getattr(attr, "st_mtime", None)) \
+            and getattr(attr, "st_size", None) is not None
+
+    def _load_index(self):
+        if self._index is None:
+            try:
+                self._index = json.loads(self._index_path.read_text())
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _save_index(self):
+        self._dirty = False
+        try:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            tmp = self._index_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self._index))
+            os.replace(tmp, self._index_path)
+        except OSError as e:
+            log.warning("could not write the content cache index: %s", e)
+
+    def fetch(self, server_id: str | None, remote_path: str, attr, dest) -> bool:
+        """Copy the cached content to `dest` if it is still what the server
+        has, going by `attr` (a fresh stat of the remote file)."""
+        if not self._usable(server_id, attr) or not self._cap():
+            return False
+        key = self._key(server_id, remote_path)
+        with self._lock:
+            entry = self._load_index().get(key)
+            if (entry is None or entry["size"] != attr.st_size
+                    or entry["mtime"] != attr.st_mtime):
+                self.misses += 1
+                return False
+            try:
+                shutil.copyfile(self._dir / key, dest)
+            except OSError:
+                # Gone from under us (someone cleared ~/.cache): a miss.
+                self._index.pop(key, None)
+                self._save_index()
+                self.misses += 1
+                return False
+            entry["used"] = time.time()
+            self._save_later()
+            self.hits += 1
+            self.bytes_saved += attr.st_size
+        log.debug("content cache hit for %s (%d bytes)", remote_path, attr.st_size)
+        return True
+
+    def _save_later(self):
+        """Write the index within _USED_SAVE_DELAY_S.  Under the lock."""
+        self._dirty = True
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(_USED_SAVE_DELAY_S, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        """Write the index now if a hit left it changed."""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if self._dirty:
+                self._save_index()
+
+    def store(self, server_id: str | None, remote_path: str, attr, source):
+        """Remember `source` as the content of the remote file `attr` describes."""
+        cap = self._cap()
+        if not self._usable(server_id, attr) or not cap:
+            return
+        try:
+            size = os.path.getsize(source)
+        except OSError:
+            return
+        if size != attr.st_size or size > cap // 4:
+            return
+        key = self._key(server_id, remote_path)
+        with self._lock:
+            index = self._load_index()
+            try:
+                self._dir.mkdir(parents=True, exist_ok=True)
+                tmp = self._dir / f"{key}.tmp"
+                shutil.copyfile(source, tmp)
+                os.replace(tmp, self._dir / key)
+            except OSError as e:
+                log.warning("could not cache %s: %s", remote_path, e)
+                return
+            index[key] = {"size": attr.st_size, "mtime": attr.st_mtime,
+                          "bytes": size, "used": time.time()}
+            self._evict(cap)
+            self._save_index()
+
+    def _evict(self, cap: int):
+        total = sum(e["bytes"] for e in self._index.values())
+        for key in sorted(self._index, key=lambda k: self._index[k]["used"]):
+            if total <= cap:
+                break
+            total -= self._index.pop(key)["bytes"]
+            with contextlib.suppress(OSError):
+                (self._dir / key).unlink()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "bytes_saved": self.bytes_saved,
+        }
+
+    def _record_stats(self):
+        stats = self.stats()
+        if not stats["hits"] and not stats["misses"]:
+            return
+        from edith.services.freeze_watchdog import record
+        record(
+            f"content cache: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['hit_rate']:.0%}), {stats['bytes_saved'] / (1 << 20):.1f} MiB "
+            f"not downloaded"
+        )
@@ -18,6 +18,7 @@ import threading
 from gi.repository import Gdk, Gio, GLib
 
 from edith.i18n import _, ngettext
+from edith.services.main_dispatch import call_soon
 
 
 class _Cancel:
@@ -96,9 +97,9 @@ class RemoteFilesProvider(Gdk.ContentProvider):
             try:
                 downloaded = self._download_all(cancellable)
             except Exception as exc:                      # noqa: BLE001
-                GLib.idle_add(self._fail, str(exc))
+                call_soon(self._fail, str(exc))
                 return
-            GLib.idle_add(self._succeed, downloaded)
+            call_soon(self._succeed, downloaded)
 
         self._notify(_("Preparing {what} for drop…").format(what=self._describe()), "info")
         threading.Thread(target=worker, daemon=True).start()
@@ -115,7 +116,7 @@ class RemoteFilesProvider(Gdk.ContentProvider):
 
     def _notify(self, message, kind):
         if self._on_status:
-            GLib.idle_add(self._on_status, message, kind)
+            call_soon(self._on_status, message, kind)
 
     def _download_all(self, cancellable):
         from edith.services.temp_manager import TempManager
@@ -183,9 +184,9 @@ class RemoteFilesProvider(Gdk.ContentProvider):
                 stream.write_all(payload, cancellable)
                 stream.close(cancellable)
             except GLib.Error as exc:
-                GLib.idle_add(self._return_error, task, exc)
+                call_soon(self._return_error, task, exc)
                 return
-            GLib.idle_add(self._return_ok, task)
+            call_soon(self._return_ok, task)
 
         threading.Thread(target=worker, daemon=True,
                          name="edith-drag-write").start()
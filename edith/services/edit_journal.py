@@ -0,0 +1,181 @@
+# SPDX-FileCopyrightText: 2025 Kreuder <mk@singular.de>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Per-tab journal of editor changes, for getting unsaved work back.
+
+Crash recovery used to rest on a copy of the whole buffer sent over from
+the editor every couple of seconds while it was dirty: expensive for big
+files, and still up to two seconds behind.  The journal instead records
+the buffer once (the base) and then every change Monaco reports, as the
+(offset, length, text) triples its content-change events carry.  Replaying
+those over the base gives back the buffer exactly as it was at the last
+batch the editor sent, whether the renderer crashed or the whole app was
+killed.
+
+Two files per tab under the cache directory, keyed by server and remote
+path so that reopening the file after a kill finds them:
+
+- `<key>.base`: JSON with the base text, the model version it is at, and
+  whether that was the saved state;
+- `<key>.log`: one JSON object per batch of changes, appended as they come.
+
+The log is folded into a new base whenever the file is saved (the saved
+text *is* the new base) and whenever it grows past _COMPACT_BYTES, so
+replaying never has much to do.
+
+Offsets are Monaco's, i.e. UTF-16 code units, which is why the replay
+works on UTF-16 bytes rather than on Python strings: the two disagree as
+soon as the text holds anything outside the BMP.
+
+Not thread-safe; the editor drives each journal from one worker at a time.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+
+# Log size past which it is folded into the base.
+_COMPACT_BYTES = 256 * 1024
+
+_LINE_BREAK = re.compile(r"\r\n|\r|\n")
+
+
+def _journal_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return Path(base) / "edith" / "journal"
+
+
+def _utf16(text: str) -> bytes:
+    return text.encode("utf-16-le", "surrogatepass")
+
+
+def _from_utf16(data) -> str:
+    return bytes(data).decode("utf-16-le", "surrogatepass")
+
+
+def write_atomic(path, content: str):
+    """Write `content` to `path` without anyone ever seeing half of it.
+
+    For the journal's base and for the editor's save alike: the upload that
+    follows a save reads the file, and so may an external editor watching
+    its directory; writing into a temp file beside it and renaming that
+    over the original means they get the old text or the new, never a
+    prefix of the new.
+    """
+    directory = os.path.dirname(os.fspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        with contextlib.suppress(OSError):
+            shutil.copymode(path, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+
+class EditJournal:
+    """Base text plus change log for one open file."""
+
+    def __init__(self, server_id: str | None, remote_path: str):
+        key = hashlib.sha256(
+            f"{server_id or ''}\0{remote_path}".encode()).hexdigest()[:32]
+        directory = _journal_dir()
+        self._base_path = directory / f"{key}.base"
+        self._log_path = directory / f"{key}.log"
+
+    def set_base(self, text: str, version: int, clean: bool = True):
+        """Start over from `text`, which the editor holds at `version`.
+
+        Everything logged so far is dropped: the editor sends its messages
+        in order, so nothing in the log can be newer than the base.
+        """
+        self._base_path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self._base_path, json.dumps(
+            {"v": version, "clean": clean, "text": text}))
+        with open(self._log_path, "w"):
+            pass
+
+    def set_base_if_matches(self, text: str, eol: str, length: int, version: int) -> bool:
+        """Use `text` as the base if it is what the editor shows.
+
+        The editor normalises line breaks on load, so `text` (the file as
+        read from disk) is normalised the same way; if its length then
+        still differs from what the editor reports, the editor's own copy
+        has to be fetched instead.
+        """
+        text = _LINE_BREAK.sub(eol, text)
+        if len(_utf16(text)) // 2 != length:
+            return False
+        self.set_base(text, version)
+        return True
+
+    def append(self, batch: dict):
+        """Log one batch of changes: {"v", "clean", "changes", "eol"?}.
+
+        Folds the log into the base once it has grown large.
+        """
+        if not self._base_path.exists():
+            return  # no base yet: nothing this batch could be replayed onto
+        with open(self._log_path, "a") as f:
+            f.write(json.dumps(batch) + "\n")
+            size = f.tell()
+        if size > _COMPACT_BYTES:
+            self.compact()
+
+    def compact(self):
+        state = self.replay()
+        if state is not None:
+            text, version, clean = state
+            self.set_base(text, version, clean)
+
+    def replay(self):
+        """(text, version, clean) as of the last logged batch, or None if
+        there is no usable journal."""
+        try:
+            base = json.loads(self._base_path.read_text())
+            text, version, clean = base["text"], base["v"], base["clean"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        buf = bytearray(_utf16(text))
+        try:
+            with open(self._log_path) as f:
+                lines = f.readlines()
+        except OSError:
+            lines = []
+        for line in lines:
+            try:
+                batch = json.loads(line)
+            except ValueError:
+                break  # cut short by a kill mid-write; all before it is good
+            clean = batch.get("clean", clean)
+            if batch.get("v", 0) <= version:
+                continue
+            version = batch["v"]
+            # Applied in the order Monaco reported them, as VS Code does:
+            # within one event they are arranged so that this is correct.
+            for offset, length, new_text in batch.get("changes", ()):
+                buf[2 * offset:2 * (offset + length)] = _utf16(new_text)
+            if batch.get("eol"):
+                buf = bytearray(_utf16(_LINE_BREAK.sub(batch["eol"], _from_utf16(buf))))
+        return _from_utf16(buf), version, clean
+
+    def unsaved_text(self) -> str | None:
+        """The journalled text if it holds changes that were never saved."""
+        state = self.replay()
+        if state is None or state[2]:
+            return None
+        return state[0]
+
+    def discard(self):
+        for path in (self._base_path, self._log_path):
+            with contextlib.suppress(OSError):
+                path.unlink()
@@ -0,0 +1,54 @@
+# SPDX-FileCopyrightText: 2025 Kreuder <mk@singular.de>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""The start and end of a large remote file, without downloading the rest.
+
+Opening a multi-gigabyte dump or log to see what is in it used to mean
+downloading all of it first.  From peek_threshold_mb up (default 16; 0
+opens everything in full), a file opens as a read-only preview instead:
+the first and last peek_kb (default 64) kilobytes, fetched with positioned
+reads (SFTP reads at an offset, FTP REST) through the client's
+read_ranges(), and cut to whole lines.  The tab offers to load the full
+file from there.
+"""
+
+from edith.services.preferences import current as current_preferences
+
+_THRESHOLD_MB = 16
+_PART_KB = 64
+
+# Stands between head and tail in the preview, on a line of its own.
+SEPARATOR = "⋯"
+
+
+def _int_preference(key: str, default: int) -> int:
+    try:
+        return max(0, int(current_preferences().get(key, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+def should_peek(size: int | None) -> bool:
+    """Whether a file of `size` bytes opens as a preview."""
+    threshold = _int_preference("peek_threshold_mb", _THRESHOLD_MB) << 20
+    return bool(threshold) and size is not None and size >= threshold
+
+
+def read_peek(client, remote_path: str, size: int) -> bytes:
+    """Head and tail of the file, `size` bytes long as of a recent stat.
+
+    Each part is cut to whole lines, so that neither starts or ends in the
+    middle of one (or of a multi-byte character).  A file small enough to
+    fit in both parts comes back whole.
+    """
+    part = max(1, _int_preference("peek_kb", _PART_KB)) << 10
+    if size <= 2 * part:
+        return client.read_ranges(remote_path, [(0, size)])[0]
+    head, tail = client.read_ranges(remote_path, [(0, part), (size - part, part)])
+    cut = head.rfind(b"\n")
+    if cut >= 0:
+        head = head[:cut + 1]
+    cut = tail.find(b"\n")
+    if cut >= 0:
+        tail = tail[cut + 1:]
+    return head + f"\n{SEPARATOR}\n\n".encode() + tail
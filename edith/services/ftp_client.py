@@ -6,8 +6,9 @@
 import os
 import socket
 import stat as stat_module
+import tempfile
 import threading
-from ftplib import FTP, FTP_TLS, error_perm  # nosec B402
+from ftplib import FTP, FTP_TLS, all_errors, error_perm  # nosec B402
 from io import BytesIO
 from pathlib import Path
 
@@ -37,6 +38,10 @@ class _ImplicitFTP_TLS(FTP_TLS):
         return self.welcome
 
 
+class _RangeComplete(Exception):
+    """Raised from a RETR callback once a ranged read has what it wants."""
+
+
 class FtpFileAttr:
     """Mimics paramiko SFTPAttributes for FTP directory entries."""
 
@@ -90,12 +95,21 @@ class FtpClient:
     # Seconds between keep-alive NOOPs on an idle control connection.
     _KEEPALIVE_INTERVAL = 30
 
+    # A client-side copy holds at most this much in memory; the rest of the
+    # file spills to a temp file until the upload reads it back.
+    _SPOOL_MAX_MEMORY = 8 << 20
+
     def __init__(self):
         self._ftp = None
         self._lock = threading.Lock()
         self._use_tls = False
         self._keepalive_thread = None
         self._keepalive_stop = None
+        # SITE CPFR/CPTO (ProFTPD's mod_copy): None until the first copy
+        # finds out, since FEAT doesn't list SITE subcommands.
+        self._has_site_copy = None
+        self._has_mlsd = False
+        self.home = None
 
     def connect(
         self,
@@ -105,11 +119,15 @@ class FtpClient:
         password: str | None = None,
         encryption: str = "none",
         timeout: float = 10,
+        capabilities: dict | None = None,
         **kwargs,
     ):
         """Connect to an FTP server.
 
         encryption: "none", "explicit_optional", "explicit_required", "implicit"
+
+        `capabilities` is what capabilities() returned on an earlier
+        connection; whatever it covers is taken as read instead of probed.
         """
         self._use_tls = encryption != "none"
 
@@ -136,7 +154,12 @@ class FtpClient:
             ftp.prot_p()
 
         # Check for MLSD support
-        self._has_mlsd = self._check_mlsd(ftp)
+        if capabilities and "mlsd" in capabilities:
+            self._has_mlsd = bool(capabilities["mlsd"])
+        else:
+            self._has_mlsd = self._check_mlsd(ftp)
+        if capabilities:
+            self.home = capabilities.get("home")
 
         with self._lock:
             self._ftp = ftp
@@ -182,6 +205,20 @@ class FtpClient:
         self._keepalive_thread = None
         self._keepalive_stop = None
 
+    def capabilities(self) -> dict:
+        """What this connection found out about the server, in a form that
+        can be stored and handed back to connect() next time."""
+        return {"home": self.home, "mlsd": self._has_mlsd}
+
+    def probe_capabilities(self) -> dict:
+        """Ask the server again for everything capabilities() reports."""
+        self.home = self.normalize(".")
+        with self._lock:
+            if not self._ftp:
+                raise RuntimeError("Not connected")
+            self._has_mlsd = self._check_mlsd(self._ftp)
+        return self.capabilities()
+
     @staticmethod
     def _check_mlsd(ftp):
         try:
@@ -457,6 +494,49 @@ class FtpClient:
                 raise FileNotFoundError(f"No such file or directory: '{path}'")
             return FtpFileAttr(path.rsplit("/", 1)[-1], facts)
 
+    def stat_many(self, paths) -> list:
+        """Same contract as SftpClient.stat_many(), one command at a time:
+        FTP has nothing to pipeline them with."""
+        results = []
+        for path in paths:
+            try:
+                results.append(self.stat(path))
+            except OSError as e:
+                results.append(e)
+        return results
+
+    def read_ranges(self, path: str, ranges) -> list[bytes]:
+        """Read (offset, length) byte ranges of a remote file via REST+RETR.
+
+        Each range is its own data connection; one that ends before the file
+        does is cut off and the server's 426/226 for it swallowed.
+        """
+        with self._lock:
+            if not self._ftp:
+                raise RuntimeError("Not connected")
+            self._ftp.voidcmd("TYPE I")
+            return [self._read_range_unlocked(path, offset, length)
+                    for offset, length in ranges]
+
+    def _read_range_unlocked(self, path: str, offset: int, length: int) -> bytes:
+        if length <= 0:
+            return b""
+        buf = bytearray()
+
+        def callback(chunk):
+            buf.extend(chunk)
+            if len(buf) >= length:
+                raise _RangeComplete()
+
+        try:
+            self._ftp.retrbinary(f"RETR {path}", callback, rest=offset or None)
+        except _RangeComplete:
+            try:
+                self._ftp.voidresp()
+            except all_errors:
+                pass
+        return bytes(buf[:length])
+
     def mkdir(self, path: str):
         with self._lock:
             if not self._ftp:
@@ -476,10 +556,13 @@ class FtpClient:
         with self._lock:
             if not self._ftp:
                 raise RuntimeError("Not connected")
-            mode_str = oct(mode)[2:]
-            resp = self._ftp.sendcmd(f"SITE CHMOD {mode_str} {path}")
-            if not resp.startswith("2"):
-                raise OSError(f"SITE CHMOD not supported by this server: {resp}")
+            self._chmod_unlocked(path, mode)
+
+    def _chmod_unlocked(self, path: str, mode: int):
+        mode_str = oct(mode)[2:]
+        resp = self._ftp.sendcmd(f"SITE CHMOD {mode_str} {path}")
+        if not resp.startswith("2"):
+            raise OSError(f"SITE CHMOD not supported by this server: {resp}")
 
     def remove(self, path: str):
         with self._lock:
@@ -515,6 +598,96 @@ class FtpClient:
                 self._ftp.delete(child)
         self._ftp.rmd(path)
 
+    # ── Batch metadata operations ─────────────────────────────────────
+    #
+    # Same contract as SftpClient's: a list in, [(path, error)] back for the
+    # items that failed.  There is one control connection and FTP has no
+    # pipelining to speak of, so these still go one command at a time; what
+    # they add is carrying on past a failure instead of stopping there.
+
+    def remove_many(self, items, use_exec: bool = True) -> list:
+        failures = []
+        with self._lock:
+            if not self._ftp:
+                raise RuntimeError("Not connected")
+            for path, is_dir in items:
+                try:
+                    if is_dir:
+                        self._rmdir_recursive_unlocked(path)
+                    else:
+                        self._ftp.delete(path)
+                except all_errors as e:
+                    failures.append((path, e))
+        return failures
+
+    def rename_many(self, moves, overwrite: bool = False, use_exec: bool = True) -> list:
+        failures = []
+        with self._lock:
+            if not self._ftp:
+                raise RuntimeError("Not connected")
+            for src, dst in moves:
+                if src == dst:
+                    continue
+                try:
+                    if self._exists_unlocked(dst):
+                        if not overwrite:
+                            name = dst.rsplit("/", 1)[-1]
+                            raise FileExistsError(f"'{name}' already exists at the destination")
+                        if self._is_dir_unlocked(dst):
+                            self._rmdir_recursive_unlocked(dst)
+                        else:
+                            self._ftp.delete(dst)
+                    self._ftp.rename(src, dst)
+                except all_errors as e:
+                    failures.append((src, e))
+        return failures
+
+    def chmod_many(self, items, mode: int, recursive: bool = False) -> list:
+        failures = []
+        with self._lock:
+            if not self._ftp:
+                raise RuntimeError("Not connected")
+            for path, is_dir in items:
+                try:
+                    if recursive and is_dir:
+                        self._chmod_tree_unlocked(path, mode)
+                    else:
+                        self._chmod_unlocked(path, mode)
+                except all_errors as e:
+                    failures.append((path, e))
+        return failures
+
+    def _chmod_tree_unlocked(self, path: str, mode: int):
+        if self._has_mlsd:
+            entries = list(self._ftp.mlsd(path))
+        else:
+            entries = self._listdir_list_raw(path)
+        for name, facts in entries:
+            if name in (".", ".."):
+                continue
+            entry_type = facts.get("type", "file").lower()
+            if entry_type.startswith("os.unix=slink"):
+                continue  # like chmod -R, leave symlinks alone
+            child = f"{path.rstrip('/')}/{name}"
+            if entry_type == "dir":
+                self._chmod_tree_unlocked(child, mode)
+            else:
+                self._chmod_unlocked(child, mode)
+        # Contents first, so a mode without execute can't lock us out of them.
+        self._chmod_unlocked(path, mode)
+
+    def mkdir_many(self, paths) -> list:
+        failures = []
+        with self._lock:
+            if not self._ftp:
+                raise RuntimeError("Not connected")
+            for path in sorted(paths, key=lambda p: p.rstrip("/").count("/")):
+                try:
+                    self._ftp.mkd(path)
+                except all_errors as e:
+                    failures.append((path, e))
+        return failures
+
     def copy_remote(self, src: str, dst: str):
         with self._lock:
             if not self._ftp:
@@ -531,14 +704,45 @@ class FtpClient:
             if self._exists_unlocked(dst):
                 name = dst.rsplit("/", 1)[-1]
                 raise FileExistsError(f"'{name}' already exists at the destination")
+            # mod_copy copies whole trees, which saves a listing per directory.
+            if self._site_copy_unlocked(src, dst):
+                return
             self._copy_recursive_unlocked(src, dst)
 
     def _copy_file_unlocked(self, src: str, dst: str):
-        """Copy by downloading to memory and re-uploading."""
-        buf = BytesIO()
-        self._ftp.retrbinary(f"RETR {src}", buf.write)
-        buf.seek(0)
-        self._ftp.storbinary(f"STOR {dst}", buf)
+        """Copy server-side if the server can, else download and re-upload.
+
+        One control connection carries one transfer at a time, so the RETR
+        has to finish before the STOR can start and the bytes have to be
+        parked somewhere in between.  A spool keeps that bounded: small
+        files stay in memory, anything larger goes to a temp file rather
+        than costing its full size in RAM.
+        """
+        if self._site_copy_unlocked(src, dst):
+            return
+        with tempfile.SpooledTemporaryFile(max_size=self._SPOOL_MAX_MEMORY) as spool:
+            self._ftp.retrbinary(f"RETR {src}", spool.write)
+            spool.seek(0)
+            self._ftp.storbinary(f"STOR {dst}", spool)
+
+    def _site_copy_unlocked(self, src: str, dst: str) -> bool:
+        """Copy with SITE CPFR/CPTO. False when the server has no such command."""
+        if self._has_site_copy is False:
+            return False
+        try:
+            self._ftp.sendcmd(f"SITE CPFR {src}")
+        except error_perm as e:
+            # 500/502/504: SITE CPFR isn't a command here, so stop asking.
+            # Anything else (550 for a missing source) is left to the regular
+            # copy, which reports it properly.
+            if str(e)[:3] in ("500", "502", "504"):
+                self._has_site_copy = False
+            return False
+        # The source was accepted, so a refusal here is about the destination
+        # and a plain copy would be refused the same way.
+        self._ftp.sendcmd(f"SITE CPTO {dst}")
+        self._has_site_copy = True
+        return True
 
     def _copy_recursive_unlocked(self, src: str, dst: str):
         if self._is_dir_unlocked(src):
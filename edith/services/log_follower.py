@@ -0,0 +1,104 @@
+# SPDX-FileCopyrightText: 2025 Kreuder <mk@singular.de>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Following a remote file as it grows, the way `tail -F` does.
+
+Reloading a log every time its mtime moves means downloading the whole
+thing again and replacing the editor content, which for a busy log of a
+few hundred megabytes is several seconds per line written.  A follower
+instead remembers how far into the file it has read and only fetches what
+lies past that offset.
+
+Two things make a file not simply "longer than last time":
+
+- truncation (`> app.log`, logrotate's copytruncate): the file is now
+  shorter than our offset;
+- rotation (`mv app.log app.log.1` plus a fresh app.log): the path now
+  names a different file, which may already be longer than our offset.
+
+Both are caught by remembering the first bytes of the file and checking
+them whenever the size moves; either way the follower starts over at
+offset 0 and says so, so the editor replaces its content instead of
+appending to it.
+
+This deliberately polls with positioned reads instead of running
+`tail -F` over exec: it works the same on FTP and on SFTP-only accounts,
+and holds no channel open between polls.
+"""
+
+import codecs
+
+# How much of the start of the file identifies it across rotations.
+_HEAD_BYTES = 256
+
+# Most that is fetched per poll.  A log growing faster than this is being
+# watched for its latest lines, not read, so the rest is skipped over.
+_MAX_READ = 4 * 1024 * 1024
+
+
+class LogFollower:
+    """Tracks the read offset of one remote file.
+
+    poll() does network I/O and is meant to run on a worker thread; the
+    follower itself is not shared between threads while it runs.
+    """
+
+    def __init__(self, client, remote_path: str, offset: int = 0, head: bytes = b""):
+        self.client = client
+        self.remote_path = remote_path
+        self.offset = offset
+        self._head = head[:_HEAD_BYTES]
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    @classmethod
+    def from_local_copy(cls, client, remote_path: str, local_path: str) -> "LogFollower":
+        """A follower picking up where the downloaded copy ends.
+
+        The editor shows the local copy, so that is what "already read"
+        means; anything the server has gained since then arrives on the
+        first poll.
+        """
+        with open(local_path, "rb") as f:
+            head = f.read(_HEAD_BYTES)
+            f.seek(0, 2)
+            offset = f.tell()
+        return cls(client, remote_path, offset, head)
+
+    def poll(self) -> tuple[bool, str]:
+        """Fetch what was appended since the last poll.
+
+        Returns (reset, text).  When reset is true the file was truncated
+        or replaced and text is its content from the start (or the tail of
+        it, past _MAX_READ); otherwise text is to be appended.  Text is
+        empty when nothing changed.
+        """
+        size = self.client.stat(self.remote_path).st_size or 0
+        if size == self.offset:
+            return False, ""
+
+        reset = size < self.offset
+        start = 0 if reset else self.offset
+        if size - start > _MAX_READ:
+            # Too far behind to be worth catching up on: show the tail.
+            reset = True
+            start = size - _MAX_READ
+
+        head, data = self.client.read_ranges(
+            self.remote_path, [(0, _HEAD_BYTES), (start, size - start)])
+
+        # The remembered head may be shorter than _HEAD_BYTES if the file
+        # was when we first saw it; it only has to still be a prefix.
+        if not reset and head[:len(self._head)] != self._head:
+            # Same path, different file: start over with the new one.
+            reset = True
+            start = max(0, size - _MAX_READ)
+            head, data = self.client.read_ranges(
+                self.remote_path, [(0, _HEAD_BYTES), (start, size - start)])
+
+        if reset:
+            self._decoder.reset()
+        self._head = head
+        self.offset = start + len(data)
+        # A multi-byte character split across two polls stays in the
+        # decoder until its last byte arrives.
+        return reset, self._decoder.decode(data)
@@ -0,0 +1,135 @@
+# SPDX-FileCopyrightText: 2025 Kreuder <mk@singular.de>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Calls from worker threads onto the main loop, a frame's worth at a time.
+
+Each background result and each progress step used to be a GLib.idle_add
+of its own.  A transfer of a few thousand small files meant a few
+thousand started/progress/done wake-ups, and a burst of listings as many
+more, each a separate trip through the main loop, and progress for a file
+already done still queued behind the next one.
+
+call_soon() now queues the call and makes sure one drain is scheduled:
+at most one per frame (_FRAME_MS), running queued calls in order until
+_BUDGET_MS have gone by.  Whatever is left waits for the next frame, so
+a flood arrives spread over a few frames instead of freezing one.
+call_latest() is for updates where only the newest matters (progress):
+a call still queued under the same key has its arguments replaced, and
+keeps its place.
+
+stats() has the counters: calls queued now and at most, calls coalesced,
+drains and how long the longest took.  They go to the diagnostic log at
+exit when a drain ever ran over budget.
+"""
+
+import atexit
+import collections
+import threading
+import time
+import traceback
+
+from gi.repository import GLib
+
+_FRAME_MS = 16
+_BUDGET_MS = 8
+
+_lock = threading.Lock()
+_queue = collections.deque()  # [key, callback, args]
+_latest = {}                  # key -> its entry in _queue
+_source_id = None
+_last_drain = 0.0
+_stats = {
+    "queued": 0,
+    "max_depth": 0,
+    "coalesced": 0,
+    "drains": 0,
+    "over_budget": 0,
+    "max_drain_ms": 0.0,
+}
+
+
+def call_soon(callback, *args):
+    """Call `callback(*args)` on the main loop.  From any thread; the
+    return value is ignored."""
+    _enqueue(None, callback, args)
+
+
+def call_latest(key, callback, *args):
+    """call_soon(), replacing a call queued under `key` that hasn't run yet."""
+    _enqueue(key, callback, args)
+
+
+def _enqueue(key, callback, args):
+    global _source_id
+    with _lock:
+        entry = _latest.get(key) if key is not None else None
+        if entry is not None:
+            entry[1], entry[2] = callback, args
+            _stats["coalesced"] += 1
+            return
+        entry = [key, callback, args]
+        _queue.append(entry)
+        if key is not None:
+            _latest[key] = entry
+        _stats["queued"] += 1
+        _stats["max_depth"] = max(_stats["max_depth"], len(_queue))
+        if _source_id is None:
+            _source_id = _schedule()
+
+
+def _schedule():
+    """A drain no sooner than a frame after the last one.  Under the lock."""
+    wait = _FRAME_MS - (time.monotonic() - _last_drain) * 1000
+    if wait > 1:
+        return GLib.timeout_add(int(wait), _drain)
+    return GLib.idle_add(_drain)
+
+
+def _drain():
+    global _source_id, _last_drain
+    start = time.monotonic()
+    deadline = start + _BUDGET_MS / 1000
+    while True:
+        with _lock:
+            if not _queue:
+                break
+            key, callback, args = _queue.popleft()
+            if key is not None:
+                del _latest[key]
+        try:
+            callback(*args)
+        except Exception:
+            traceback.print_exc()
+        if time.monotonic() >= deadline:
+            break
+    elapsed = (time.monotonic() - start) * 1000
+    with _lock:
+        _last_drain = start
+        _stats["drains"] += 1
+        _stats["max_drain_ms"] = max(_stats["max_drain_ms"], elapsed)
+        if elapsed > _BUDGET_MS:
+            _stats["over_budget"] += 1
+        _source_id = _schedule() if _queue else None
+    return GLib.SOURCE_REMOVE
+
+
+def stats() -> dict:
+    """The counters, with `depth` the number of calls queued right now."""
+    with _lock:
+        return dict(_stats, depth=len(_queue))
+
+
+def _record_stats():
+    counters = stats()
+    if not counters["over_budget"]:
+        return
+    from edith.services.freeze_watchdog import record
+    record(
+        f"main-loop dispatch: {counters['queued']} calls in {counters['drains']} drains, "
+        f"{counters['coalesced']} coalesced, at most {counters['max_depth']} queued; "
+        f"{counters['over_budget']} drains over {_BUDGET_MS} ms, "
+        f"longest {counters['max_drain_ms']:.0f} ms"
+    )
+
+
+atexit.register(_record_stats)
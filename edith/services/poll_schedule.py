@@ -0,0 +1,75 @@
+# SPDX-FileCopyrightText: 2025 Kreuder <mk@singular.de>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""When to next ask the server whether an open file changed.
+
+The poll for remote changes used to stat every open tab every three
+seconds, the file someone is editing on the server right now as often as
+the one nobody has touched in a year.  Now each file has an interval of
+its own: back to _MIN_S whenever it is seen to change, doubled every time
+it is found unchanged, up to _MAX_S.  A busy file is noticed within a
+couple of seconds, and a quiet one costs a stat a minute.
+
+The interval stretches further where a late reload is harmless: by
+BACKGROUND_FACTOR while the window isn't the active one, by TAB_FACTOR
+for tabs that aren't showing.  Those factors apply when deciding what is
+due, so switching back to a tab makes it due at its own pace at once.
+
+Counts what it costs as it goes; summary() is what goes to the diagnostic
+log at disconnect.
+"""
+
+import time
+
+_MIN_S = 2
+_START_S = 3  # a newly opened file, as often as the fixed poll was
+_MAX_S = 60
+
+BACKGROUND_FACTOR = 4
+TAB_FACTOR = 2
+
+
+class PollSchedule:
+    """Per-file poll intervals for one connection.  Main loop only."""
+
+    def __init__(self):
+        self._files = {}  # remote_path -> [interval_s, last_polled]
+        self._started = time.monotonic()
+        self.stats = 0
+        self.changes = 0
+
+    def is_due(self, remote_path: str, now: float, factor: float = 1) -> bool:
+        """Whether `remote_path` should be polled at `now` (monotonic),
+        with its interval stretched by `factor`."""
+        entry = self._files.get(remote_path)
+        if entry is None:
+            # Just opened, so just downloaded: nothing to ask yet.
+            self._files[remote_path] = [_START_S, now]
+            return False
+        interval, last = entry
+        return now - last >= interval * factor
+
+    def polled(self, remote_path: str, changed: bool, now: float):
+        """Record a stat of `remote_path` and what it showed."""
+        self.stats += 1
+        if changed:
+            self.changed(remote_path, now)
+            return
+        entry = self._files.setdefault(remote_path, [_START_S, now])
+        entry[0] = min(entry[0] * 2, _MAX_S)
+        entry[1] = now
+
+    def changed(self, remote_path: str, now: float):
+        """`remote_path` changed, however that was noticed."""
+        self.changes += 1
+        self._files[remote_path] = [_MIN_S, now]
+
+    def retain(self, remote_paths):
+        """Forget every file not among `remote_paths` (closed tabs)."""
+        for path in self._files.keys() - set(remote_paths):
+            del self._files[path]
+
+    def summary(self) -> str:
+        minutes = max((time.monotonic() - self._started) / 60, 1 / 60)
+        return (f"remote polling: {self.stats} stats ({self.stats / minutes:.1f}/min), "
+                f"{self.changes} changes detected over {minutes:.0f} min")
@@ -0,0 +1,163 @@
+# SPDX-FileCopyrightText: 2025 Kreuder <mk@singular.de>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Preferences as an immutable, typed snapshot, with a signal when they change.
+
+Preferences live in servers.json next to every server, and reading one used
+to mean parsing all of it: a single editor tab read more than a dozen, each
+a json.loads of hundreds of servers for the sake of a font size.  Widgets
+also had to be told about changes by hand, window to panel to tab, and
+anything nobody remembered to tell kept showing the old setting.
+
+Now ConfigService keeps what it last parsed or wrote, and this module turns
+that into a PreferencesSnapshot: a frozen dataclass with the settings the
+app acts on as typed fields, values of the wrong type replaced by the
+default, and everything else reachable through get().  A new snapshot is
+made only when a preference actually changed, after which Preferences emits
+"changed" with the key as its detail, so
+
+    Preferences.get().connect("changed::editor_font", on_font_changed)
+
+runs only for that key.  watch() ties such a subscription to a widget being
+in a window, so a closed tab doesn't stay connected to a process-wide object.
+"""
+
+import dataclasses
+import threading
+from types import MappingProxyType
+from typing import Mapping
+
+from gi.repository import GLib, GObject
+
+from edith.services.config import ConfigService
+
+_EMPTY = MappingProxyType({})
+
+
+def _frozen(value):
+    if isinstance(value, dict):
+        return MappingProxyType({k: _frozen(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_frozen(v) for v in value)
+    return value
+
+
+def _typed(value, default):
+    """`value` as the type of `default`, or `default` if it isn't one."""
+    if isinstance(default, bool):
+        return value if isinstance(value, bool) else default
+    if isinstance(default, (int, float)):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return default
+        return type(default)(value)
+    if isinstance(default, str):
+        return value if isinstance(value, str) else default
+    if isinstance(default, Mapping):
+        return _frozen(value) if isinstance(value, dict) else default
+    return value
+
+
+@dataclasses.dataclass(frozen=True)
+class PreferencesSnapshot:
+    """The preferences at one point in time.  Never changes; a change makes
+    a new one."""
+
+    editor_font: str = ""
+    editor_font_size: int = 0  # 0: the editor's own default
+    editor_insert_spaces: bool = True
+    editor_tab_size: int = 4
+    editor_minimap: bool = False
+    editor_render_whitespace: str = "selection"
+    editor_sticky_scroll: bool = False
+    editor_font_ligatures: bool = False
+    editor_line_numbers: str = "on"
+    editor_overrides: Mapping = dataclasses.field(default_factory=lambda: _EMPTY)
+    editor_format_on_save: bool = False
+    syntax_scheme: str = ""
+    single_click_open: bool = False
+    # Every stored preference, typed field or not, as stored.
+    raw: Mapping = dataclasses.field(default_factory=lambda: _EMPTY)
+
+    @classmethod
+    def from_dict(cls, prefs: dict) -> "PreferencesSnapshot":
+        values = {}
+        for f in dataclasses.fields(cls):
+            if f.name != "raw" and f.name in prefs:
+                default = (f.default if f.default is not dataclasses.MISSING
+                           else f.default_factory())
+                values[f.name] = _typed(prefs[f.name], default)
+        return cls(raw=_frozen(prefs), **values)
+
+    def get(self, key: str, default=None):
+        """A preference without a field of its own, as stored."""
+        return self.raw.get(key, default)
+
+
+class Preferences(GObject.Object):
+    """The current PreferencesSnapshot, shared by every window of the process."""
+
+    __gsignals__ = {
+        # The preference that changed, also given as the signal's detail.
+        "changed": (GObject.SignalFlags.RUN_FIRST | GObject.SignalFlags.DETAILED,
+                    None, (str,)),
+    }
+
+    _instance = None
+
+    @classmethod
+    def get(cls) -> "Preferences":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        super().__init__()
+        self.snapshot = PreferencesSnapshot.from_dict(ConfigService.preferences())
+        ConfigService.add_preferences_listener(self._on_config_changed)
+
+    def _on_config_changed(self, keys):
+        if threading.current_thread() is not threading.main_thread():
+            GLib.idle_add(self._update, keys)
+        else:
+            self._update(keys)
+
+    def _update(self, keys):
+        self.snapshot = PreferencesSnapshot.from_dict(ConfigService.preferences())
+        for key in sorted(keys):
+            self.emit(f"changed::{key}", key)
+        return GLib.SOURCE_REMOVE
+
+    def watch(self, widget, callback, *keys):
+        """Call `callback(key)` when one of `keys` changes, while `widget`
+        is in a window.
+
+        Taken out of a window and put back (a tab moved to another one),
+        the widget may have missed changes; `callback(None)` then says
+        that anything may have.
+        """
+        state = {"handlers": [], "seen": self.snapshot}
+
+        def on_changed(prefs, key):
+            state["seen"] = self.snapshot
+            callback(key)
+
+        def on_root(*_args):
+            rooted = widget.get_root() is not None
+            if rooted and not state["handlers"]:
+                state["handlers"] = [self.connect(f"changed::{key}", on_changed)
+                                     for key in keys]
+                if state["seen"] is not self.snapshot:
+                    state["seen"] = self.snapshot
+                    callback(None)
+            elif not rooted:
+                for handler_id in state["handlers"]:
+                    self.disconnect(handler_id)
+                state["handlers"] = []
+
+        widget.connect("notify::root", on_root)
+        on_root()
+
+
+def current() -> PreferencesSnapshot:
+    """The preferences as they are now."""
+    return Preferences.get().snapshot
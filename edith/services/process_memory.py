@@ -0,0 +1,82 @@
+# SPDX-FileCopyrightText: 2025 Kreuder <mk@singular.de>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Resident memory of Edith together with the processes it started.
+
+Most of what a session with many tabs costs is not in this process but
+in the WebKit web processes behind the editors, which is why it is the
+whole process tree that is counted.  Read from /proc; elsewhere there
+is nothing to read and the total is None.
+"""
+
+import os
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _children_by_parent() -> dict:
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue  # exited while we looked
+        # The command name is in parentheses and may itself hold spaces or
+        # parentheses; the fields after the last ")" are fixed.
+        fields = stat[stat.rfind(")") + 2:].split()
+        children.setdefault(int(fields[1]), []).append(int(entry))
+    return children
+
+
+def _rss(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _comm(pid: int) -> str:
+    try:
+        with open(f"/proc/{pid}/comm") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def _tree(pid: int | None):
+    """`pid` (default: this process) and all of its descendants."""
+    children = _children_by_parent()
+    pending = [pid or os.getpid()]
+    while pending:
+        current = pending.pop()
+        yield current
+        pending.extend(children.get(current, ()))
+
+
+def rss(pid: int | None = None) -> int:
+    """Bytes resident in `pid` (default: this process) alone."""
+    return _rss(pid or os.getpid())
+
+
+def tree_rss(pid: int | None = None) -> int | None:
+    """Bytes resident in `pid` (default: this process) and all of its
+    descendants, or None where /proc is not available."""
+    if not os.path.isdir("/proc/self"):
+        return None
+    return sum(_rss(p) for p in _tree(pid))
+
+
+def web_process_rss(pid: int | None = None) -> list[int] | None:
+    """Bytes resident in each WebKit web process among the descendants of
+    `pid` (default: this process), or None where /proc is not available.
+
+    Told apart by name ("WebKitWebProcess", cut to the kernel's fifteen
+    characters); the network process and the like don't count.
+    """
+    if not os.path.isdir("/proc/self"):
+        return None
+    return [_rss(p) for p in _tree(pid) if _comm(p) == "WebKitWebProcess"[:15]]
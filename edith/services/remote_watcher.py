@@ -0,0 +1,213 @@
+# SPDX-FileCopyrightText: 2025 Kreuder <mk@singular.de>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Remote changes pushed by the server instead of polled for.
+
+Noticing that an open file changed on the server used to mean a stat per
+open file every three seconds, for as long as the connection lasted: a
+round trip per file whether anything happened or not, and still up to
+three seconds late when something did.  Where the account may run
+commands and the host has inotifywait (inotify-tools), one exec channel
+now runs
+
+    inotifywait -m -e close_write -e moved_to ... DIR...
+
+on the directories of the open files and the one the browser shows, and
+every line it prints names a path that just changed.  Directories, not
+files, are watched: most editors and deploy tools save by writing a new
+file and renaming it over the old one, which an inotify watch on the old
+file never sees.
+
+inotifywait can't be told about new directories once running, so a
+change to the set restarts it.  It runs on a pty so that closing its
+channel hangs it up; a plain exec channel would leave the old one blocked
+on the server, holding an inotify instance, until something in its
+directories changed.  Until it reports its watches established,
+and whenever it can't run at all (no exec, not installed, a directory
+gone, out of inotify watches), nothing counts as watched and the caller
+keeps polling; covers() says which paths it may stop polling for.  One
+that ends on its own is started again by a later watch(), the same set
+of directories after a pause that grows while it keeps failing.
+"""
+
+import logging
+import shlex
+import threading
+import time
+
+from gi.repository import GLib
+
+from edith.services.main_dispatch import call_soon
+
+log = logging.getLogger(__name__)
+
+_EVENTS = ("close_write", "moved_to", "moved_from", "create", "delete")
+
+# inotifywait prints this (on stderr, which the pty merges into the one
+# stream) once every watch is in place.
+_ESTABLISHED = "Watches established."
+
+# A save is several events (create, close_write, moved_to); they arrive
+# as one change this long after the first of them.
+_SETTLE_MS = 150
+
+# After inotifywait ended on its own, the same directories are tried again
+# no sooner than this, doubled on every further failure up to _RETRY_MAX_S.
+_RETRY_S = 5
+_RETRY_MAX_S = 300
+
+
+class RemoteWatcher:
+    """Watches directories on one connection through inotifywait.
+
+    Call watch(), covers() and stop() from the main loop only;
+    on_changes(paths) is called there too, with a set of changed paths.
+    """
+
+    def __init__(self, client, on_changes):
+        self._client = client
+        self._on_changes = on_changes
+        self._dirs = frozenset()
+        self._covered = frozenset()
+        self._generation = 0
+        self._channel = None
+        self._channel_lock = threading.Lock()
+        self._available = None  # None: not asked yet
+        self._pending = set()
+        self._settle_id = None
+        self._failed = None  # (dirs, not before) after inotifywait ended
+        self._retry_s = _RETRY_S
+
+    @staticmethod
+    def supported(client) -> bool:
+        """Whether `client` can run the watcher at all (SFTP with exec)."""
+        return bool(getattr(client, "can_exec", False)) and hasattr(client, "open_exec_stream")
+
+    def watch(self, dirs):
+        """Watch exactly `dirs` from now on, restarting inotifywait if that
+        is not what it watches already."""
+        dirs = frozenset(d for d in dirs if d)
+        if dirs == self._dirs or self._available is False:
+            return
+        if self._failed is not None and self._failed[0] == dirs \
+                and time.monotonic() < self._failed[1]:
+            return  # ended on these a moment ago; retried once it's time
+        self._dirs = dirs
+        self._covered = frozenset()
+        self._generation += 1
+        self._close_channel()
+        if dirs:
+            threading.Thread(target=self._run, args=(self._generation, dirs),
+                             daemon=True).start()
+
+    def covers(self, path: str) -> bool:
+        """Whether a change to `path` would be pushed, so needn't be polled."""
+        return (path.rsplit("/", 1)[0] or "/") in self._covered
+
+    def watches(self, directory: str) -> bool:
+        """Whether changes to entries of `directory` are pushed."""
+        return directory in self._covered
+
+    def stop(self):
+        self._generation += 1
+        self._dirs = self._covered = frozenset()
+        self._close_channel()
+        if self._settle_id:
+            GLib.source_remove(self._settle_id)
+            self._settle_id = None
+        self._pending.clear()
+
+    def _close_channel(self):
+        with self._channel_lock:
+            channel, self._channel = self._channel, None
+        if channel is not None:
+            try:
+                channel.close()
+            except OSError:
+                pass
+
+    # --- worker thread ---
+
+    def _run(self, generation, dirs):
+        if self._available is None:
+            try:
+                code, _out, _err = self._client.exec_command(
+                    "command -v inotifywait", timeout=10)
+            except Exception as e:
+                log.debug("inotifywait probe failed: %s", e)
+                call_soon(self._ended, generation, dirs)
+                return
+            self._available = code == 0
+            if not self._available:
+                log.info("inotifywait not found on the server; polling for changes")
+                return
+        events = " ".join(f"-e {e}" for e in _EVENTS)
+        command = (f"exec inotifywait -m {events} --format '%w%f' -- "
+                   + " ".join(shlex.quote(d.rstrip("/") + "/") for d in sorted(dirs)))
+        try:
+            channel = self._client.open_exec_stream(command)
+        except Exception as e:
+            log.debug("could not start inotifywait: %s", e)
+            call_soon(self._ended, generation, dirs)
+            return
+        with self._channel_lock:
+            if generation != self._generation:
+                channel.close()
+                return
+            self._channel = channel
+        try:
+            self._read(channel, generation, dirs)
+        finally:
+            channel.close()
+            call_soon(self._ended, generation, dirs)
+
+    def _read(self, channel, generation, dirs):
+        lines = channel.makefile("rb")
+        for raw in lines:
+            line = raw.decode("utf-8", errors="replace").strip()
+            if line == _ESTABLISHED:
+                call_soon(self._established, generation, dirs)
+                break
+            if line and not line.startswith("Setting up watches"):
+                log.info("inotifywait: %s", line)
+        else:
+            return  # exited before it was watching anything
+        for raw in lines:
+            path = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+            if path:
+                call_soon(self._changed, generation, path)
+
+    # --- main loop ---
+
+    def _established(self, generation, dirs):
+        if generation == self._generation:
+            self._covered = dirs
+            self._failed = None
+            self._retry_s = _RETRY_S
+            log.debug("watching %d remote directories", len(dirs))
+        return GLib.SOURCE_REMOVE
+
+    def _ended(self, generation, dirs):
+        # Died on its own (a watched directory removed, connection lost):
+        # back to polling, and the next watch() starts it again, right away
+        # for a different set and after a growing pause for the same one.
+        if generation == self._generation:
+            self._covered = self._dirs = frozenset()
+            self._failed = (dirs, time.monotonic() + self._retry_s)
+            self._retry_s = min(self._retry_s * 2, _RETRY_MAX_S)
+        return GLib.SOURCE_REMOVE
+
+    def _changed(self, generation, path):
+        if generation != self._generation:
+            return GLib.SOURCE_REMOVE
+        self._pending.add(path)
+        if not self._settle_id:
+            self._settle_id = GLib.timeout_add(_SETTLE_MS, self._deliver)
+        return GLib.SOURCE_REMOVE
+
+    def _deliver(self):
+        self._settle_id = None
+        paths, self._pending = self._pending, set()
+        if paths:
+            self._on_changes(paths)
+        return GLib.SOURCE_REMOVE
@@ -0,0 +1,211 @@
+# SPDX-FileCopyrightText: 2025 Kreuder <mk@singular.de>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Search over the saved servers, indexed once and kept up to date.
+
+Searching the server panel used to lower-case and join name, host and
+user of every server on every keystroke, and find the query as one
+substring of that.  "prod web" found nothing for web-prod, the group a
+server is in couldn't be searched at all, and the servers you actually
+use came in no particular place among the matches.
+
+ServerIndex keeps, per server, its name, host, user and group name
+already lower-cased, a bitmask of the characters in them (one integer
+test rules most servers out for a term), and which servers each word of
+them belongs to, the words in a sorted list: the servers with a word
+starting with a term are a bisect and a few set operations away.  The
+query is split into terms, and a server matches when every term is, from
+best to worst:
+
+    a word of it                          "web"     web-prod-01
+    the start of a word of it             "pro"     web-prod-01
+    a substring of a field                "b-pr"    web-prod-01
+    an abbreviation of part of a field    "wbprd1"  web-prod-01
+
+The last means the term's characters in order, from the start of a word
+on and at most _MAX_GAP apart, so that "acm" doesn't find every host
+ending in .example.com.
+
+Matches come best first, then the most recently used first, then by
+name.  A query that extends the last one (the next keystroke) is only
+tried against the last one's matches.
+
+sync() takes the whole server list each time, compares it with what is
+indexed and re-indexes only the servers that changed.
+"""
+
+import bisect
+import re
+
+from edith.models.server import UNGROUPED, FolderInfo, ServerInfo
+
+# How well a term matched, per term; a server's score is the sum.
+_WORD = 4
+_PREFIX = 3
+_SUBSTRING = 2
+_ABBREVIATION = 1
+
+# Characters an abbreviation may skip between two of its own.
+_MAX_GAP = 8
+
+_SPLIT = re.compile(r"[\W_]+")
+
+
+def _mask(text: str) -> int:
+    """A bit per character (modulo 63) that occurs in `text`."""
+    mask = 0
+    for c in text:
+        mask |= 1 << (ord(c) % 63)
+    return mask
+
+
+def _abbreviation(term: str) -> re.Pattern:
+    gap = f"[^\n]{{0,{_MAX_GAP}}}?"
+    return re.compile(r"(?<![^\W_])" + gap.join(map(re.escape, term)))
+
+
+class _Entry:
+    __slots__ = ("fields", "haystack", "words", "mask", "group", "name")
+
+    def __init__(self, fields: tuple, group: str):
+        self.fields = fields
+        self.group = group
+        self.name = fields[0]
+        # Fields one per line, so that an abbreviation stays within one.
+        self.haystack = "\n".join(fields)
+        self.words = {w for f in fields for w in _SPLIT.split(f) if w}
+        self.mask = _mask(self.haystack)
+
+
+class ServerIndex:
+    """Searchable name, host, user and group of every server.  Not
+    thread-safe; the server panel uses it from the main loop."""
+
+    def __init__(self):
+        self._entries = {}    # server id -> _Entry
+        self._servers = {}    # word -> ids of the servers with that word
+        self._words = []      # the keys of _servers, sorted
+        self._ranks = {}      # server id -> place by name
+        self._last_used = {}  # server id -> Unix time
+        self._generation = 0  # bumped on every change; invalidates _last
+        self._last = None     # (terms, group, generation, {id: score})
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def sync(self, servers: list[ServerInfo], folders: list[FolderInfo]) -> tuple[int, int, int]:
+        """Index exactly `servers`, re-indexing only what changed.
+        Returns how many were (added, removed, updated)."""
+        names = {f.id: f.name for f in folders}
+        seen = set()
+        new_words = []
+        added = updated = 0
+        for server in servers:
+            seen.add(server.id)
+            if server.folder_id in names:
+                group, group_name = server.folder_id, names[server.folder_id]
+            else:
+                group, group_name = UNGROUPED, ""
+            fields = (server.display_name.lower(), server.host.lower(),
+                      server.username.lower(), group_name.lower())
+            entry = self._entries.get(server.id)
+            if entry is not None and entry.fields == fields and entry.group == group:
+                continue
+            if entry is None:
+                added += 1
+            else:
+                updated += 1
+                self._unindex(server.id, entry)
+            entry = _Entry(fields, group)
+            self._entries[server.id] = entry
+            for word in entry.words:
+                ids = self._servers.get(word)
+                if ids is None:
+                    ids = self._servers[word] = set()
+                    new_words.append(word)
+                ids.add(server.id)
+        removed = self._entries.keys() - seen
+        for server_id in removed:
+            self._unindex(server_id, self._entries.pop(server_id))
+
+        if len(new_words) > 64:
+            self._words.extend(new_words)
+            self._words.sort()
+        else:
+            for word in new_words:
+                bisect.insort(self._words, word)
+        if added or updated or removed:
+            entries = self._entries
+            self._ranks = {i: r for r, i in enumerate(sorted(entries, key=lambda i: entries[i].name))}
+            self._generation += 1
+        return added, len(removed), updated
+
+    def _unindex(self, server_id: str, entry: _Entry):
+        for word in entry.words:
+            ids = self._servers[word]
+            ids.discard(server_id)
+            if not ids:
+                del self._servers[word]
+                del self._words[bisect.bisect_left(self._words, word)]
+
+    def set_last_used(self, last_used: dict):
+        """server id -> when it was last used (Unix time), for ranking."""
+        if last_used != self._last_used:
+            self._last_used = dict(last_used)
+            self._generation += 1
+
+    def search(self, query: str, group: str | None = None) -> list[str]:
+        """Ids of the servers matching every term of `query`, best first;
+        only those in `group` (a folder id or UNGROUPED) unless None."""
+        terms = query.lower().split()
+        if not terms:
+            return []
+
+        # The next keystroke: only the last matches can still match.
+        last = self._last
+        if (last is not None and last[1] == group and last[2] == self._generation
+                and len(terms) >= len(last[0])
+                and all(t.startswith(p) for t, p in zip(terms, last[0]))):
+            pool = last[3].keys()
+        elif group is None:
+            pool = self._entries.keys()
+        else:
+            pool = [i for i, e in self._entries.items() if e.group == group]
+
+        scores = dict.fromkeys(pool, 0)
+        for term in terms:
+            scores = self._match(term, scores)
+            if not scores:
+                break
+        self._last = (terms, group, self._generation, scores)
+
+        ranks, last_used = self._ranks, self._last_used
+        # One integer per server: score, then last use, then name
+        return sorted(scores, key=lambda i: ((-scores[i] << 40) - last_used.get(i, 0) << 24)
+                      + ranks[i])
+
+    def _match(self, term: str, scores: dict) -> dict:
+        """The servers among `scores` that `term` matches, with the score
+        of that match added."""
+        pool = scores.keys()
+        matched = dict.fromkeys(self._servers.get(term, set()) & pool, _WORD)
+        # Words starting with the term, from the sorted word list
+        words = self._words
+        i = bisect.bisect_left(words, term)
+        while i < len(words) and words[i].startswith(term):
+            matched.update(dict.fromkeys((self._servers[words[i]] & pool) - matched.keys(),
+                                         _PREFIX))
+            i += 1
+
+        term_mask = _mask(term)
+        abbreviation = _abbreviation(term) if len(term) > 1 else None
+        entries = self._entries
+        for server_id in pool - matched.keys():
+            entry = entries[server_id]
+            if entry.mask & term_mask != term_mask:
+                continue
+            if term in entry.haystack:
+                matched[server_id] = _SUBSTRING
+            elif abbreviation is not None and abbreviation.search(entry.haystack):
+                matched[server_id] = _ABBREVIATION
+        return {i: scores[i] + s for i, s in matched.items()}
@@ -3,14 +3,155 @@
 
 """Paramiko SFTP wrapper with thread-safe operations."""
 
+import base64
 import contextlib
+import errno
+import hashlib
 import os
+import shlex
 import stat
+import struct
 import threading
 import time
 from pathlib import Path
 
 import paramiko
+from paramiko.message import Message
+from paramiko.sftp import (
+    CMD_EXTENDED, CMD_EXTENDED_REPLY, CMD_INIT, CMD_LSTAT, CMD_MKDIR,
+    CMD_REMOVE, CMD_RENAME, CMD_RMDIR, CMD_SETSTAT, CMD_STAT, CMD_STATUS, CMD_VERSION,
+    SFTPError, _VERSION, int64,
+)
+
+
+class _Replies:
+    """Collects replies to pipelined requests.
+
+    paramiko routes every reply to the object registered with its request
+    via _async_response(); SFTPFile uses that for prefetching.  Anything
+    with the same method can stand in for the file.
+    """
+
+    def __init__(self):
+        self.received = {}
+
+    def _async_response(self, t, msg, num):
+        self.received[num] = (t, msg)
+
+
+class _SFTPClient(paramiko.SFTPClient):
+    """paramiko.SFTPClient that remembers what the server advertised.
+
+    The server's VERSION reply lists the extensions it supports as
+    (name, data) pairs after the version number.  paramiko reads that packet
+    and throws the list away, so the only other way to learn whether, say,
+    copy-data is there would be to try it on a real file and interpret the
+    failure.
+    """
+
+    extensions = {}
+
+    # Filled in by query_limits(); zero or absent means "not stated".
+    limits = {}
+
+    def _send_version(self):
+        # BaseSFTP._send_version, keeping the tail of the reply.
+        m = Message()
+        m.add_int(_VERSION)
+        self._send_packet(CMD_INIT, m)
+        t, data = self._read_packet()
+        if t != CMD_VERSION:
+            raise SFTPError("Incompatible sftp protocol")
+        self.extensions = self._parse_extensions(data[4:])
+        return struct.unpack(">I", data[:4])[0]
+
+    @staticmethod
+    def _parse_extensions(data: bytes) -> dict:
+        extensions = {}
+        pos = 0
+        try:
+            while pos < len(data):
+                (n,) = struct.unpack(">I", data[pos:pos + 4])
+                name = data[pos + 4:pos + 4 + n].decode("utf-8", "replace")
+                pos += 4 + n
+                (n,) = struct.unpack(">I", data[pos:pos + 4])
+                extensions[name] = data[pos + 4:pos + 4 + n]
+                pos += 4 + n
+        except struct.error:
+            pass  # truncated list: keep what parsed cleanly
+        return extensions
+
+    def query_limits(self):
+        """Ask an OpenSSH server how large a read or write it will accept.
+
+        Without this the request size is guesswork: too small wastes round
+        trips, too large and the server answers with short reads that
+        paramiko's prefetch then fills in one synchronous request at a time.
+        """
+        if "limits@openssh.com" not in self.extensions:
+            return
+        t, msg = self._request(CMD_EXTENDED, "limits@openssh.com")
+        if t != CMD_EXTENDED_REPLY:
+            return
+        self.limits = {
+            key: msg.get_int64()
+            for key in ("max-packet-length", "max-read-length",
+                        "max-write-length", "max-open-handles")
+        }
+
+    def statvfs(self, path) -> tuple:
+        """statvfs@openssh.com: (f_bsize, f_frsize, f_blocks, f_bfree,
+        f_bavail, f_files, f_ffree, f_favail, f_fsid, f_flag, f_namemax)."""
+        t, msg = self._request(CMD_EXTENDED, "statvfs@openssh.com", self._adjust_cwd(path))
+        if t != CMD_EXTENDED_REPLY:
+            raise SFTPError("Expected extended reply")
+        return tuple(msg.get_int64() for _ in range(11))
+
+    def batch(self, requests: list, window: int) -> list:
+        """Send every (cmd, *args) in `requests`, `window` of them at a time.
+
+        paramiko's own calls wait for each reply before sending the next
+        request, so a hundred renames cost a hundred round trips.  Here the
+        next request goes out as soon as a slot frees up, and the replies
+        are matched to their requests by number as they come back.
+
+        Returns one entry per request, in order: the reply as (type, Message),
+        or the OSError the server's status carried.
+        """
+        replies = _Replies()
+        results = [None] * len(requests)
+        pending = {}
+        queue = iter(enumerate(requests))
+        more = True
+        while more or pending:
+            while more and len(pending) < window:
+                item = next(queue, None)
+                if item is None:
+                    more = False
+                    break
+                i, (cmd, *args) = item
+                pending[self._async_request(replies, cmd, *args)] = i
+            if not pending:
+                break
+            self._read_response()
+            for num in [n for n in pending if n in replies.received]:
+                t, msg = replies.received.pop(num)
+                i = pending.pop(num)
+                results[i] = (t, msg)
+                if t == CMD_STATUS:
+                    try:
+                        self._convert_status(msg)
+                    except EOFError as e:
+                        results[i] = OSError(str(e))
+                    except OSError as e:
+                        results[i] = e
+        return results
+
+
+def _fingerprint(key) -> str:
+    """OpenSSH-style SHA256 fingerprint (PKey.fingerprint needs paramiko 3.2)."""
+    digest = hashlib.sha256(key.asbytes()).digest()
+    return "SHA256:" + base64.b64encode(digest).decode("ascii").rstrip("=")
 
 
 class SftpClient:
@@ -21,6 +162,12 @@ class SftpClient:
         self._sftp = None
         self._lock = threading.Lock()
         self.can_exec = False
+        # realpath("."), once known: where a "~" start directory points.
+        self.home = None
+        # SHA256 fingerprint of the key that authenticated, if one did.
+        self.auth_key_fingerprint = None
+        # Seconds spent in each phase of the last connect(), for diagnostics.
+        self.connect_timings = {}
 
     def connect(
         self,
@@ -31,13 +178,29 @@ class SftpClient:
         key_file: str | None = None,
         passphrase: str | None = None,
         timeout: float = 10,
+        capabilities: dict | None = None,
     ):
-        """Connect to an SFTP server. Blocks until connected."""
+        """Connect to an SFTP server. Blocks until connected.
+
+        `capabilities` is what capabilities() returned on an earlier
+        connection; whatever it covers is taken as read instead of probed.
+        """
         import socket
 
+        timings = {}
+        mark = time.monotonic()
+
+        def phase(name):
+            nonlocal mark
+            now = time.monotonic()
+            timings[name] = now - mark
+            mark = now
+
         sock = socket.create_connection((host, port), timeout=timeout)
+        phase("tcp")
         transport = paramiko.Transport(sock)
         transport.start_client()
+        phase("kex")
 
         pkey = None
         if key_file and os.path.isfile(key_file):
@@ -45,34 +208,97 @@ class SftpClient:
 
         if pkey:
             transport.auth_publickey(username, pkey)
+            self.auth_key_fingerprint = _fingerprint(pkey)
         elif password:
             transport.auth_password(username, password)
         else:
             # Try SSH agent
             agent = paramiko.Agent()
-            agent_keys = agent.get_keys()
+            agent_keys = list(agent.get_keys())
             if not agent_keys:
                 agent.close()
                 raise ValueError("No authentication method provided (no password, key file, or SSH agent keys)")
+            # Each rejected key is a full round trip, and enough of them trip
+            # the server's MaxAuthTries before the right one is reached.  The
+            # key that worked last time goes first; the rest keep agent order.
+            last_key = (capabilities or {}).get("auth_key")
+            if last_key:
+                agent_keys.sort(key=lambda k: _fingerprint(k) != last_key)
             authenticated = False
+            attempts = 0
             for agent_key in agent_keys:
+                attempts += 1
                 try:
                     transport.auth_publickey(username, agent_key)
                     authenticated = True
+                    self.auth_key_fingerprint = _fingerprint(agent_key)
                     break
                 except paramiko.AuthenticationException:
                     continue
             agent.close()
+            timings["agent_keys_tried"] = attempts
             if not authenticated:
                 raise paramiko.AuthenticationException("All SSH agent keys were rejected")
+        phase("auth")
 
         transport.set_keepalive(30)
-        sftp = paramiko.SFTPClient.from_transport(transport)
+        sftp = _SFTPClient.from_transport(transport)
+        if capabilities and isinstance(capabilities.get("limits"), dict):
+            sftp.limits = dict(capabilities["limits"])
+        else:
+            try:
+                sftp.query_limits()
+            except (OSError, SFTPError):
+                pass  # keep the defaults
+        phase("sftp")
+        if capabilities:
+            self.home = capabilities.get("home")
+            self.can_exec = bool(capabilities.get("can_exec", False))
+
+        self.connect_timings = timings
+        from edith.services.freeze_watchdog import record
+        record(
+            f"connect {username}@{host}:{port} "
+            + " ".join(
+                f"{name}={value}" if name == "agent_keys_tried"
+                else f"{name}={value * 1000:.0f}ms"
+                for name, value in timings.items()
+            )
+        )
 
         with self._lock:
             self._transport = transport
             self._sftp = sftp
 
+    def capabilities(self) -> dict:
+        """What this connection found out about the server, in a form that
+        can be stored and handed back to connect() next time."""
+        sftp = self._sftp
+        return {
+            "home": self.home,
+            "can_exec": self.can_exec,
+            "limits": dict(sftp.limits) if sftp is not None else {},
+            "auth_key": self.auth_key_fingerprint,
+        }
+
+    def probe_capabilities(self) -> dict:
+        """Ask the server again for everything capabilities() reports."""
+        self.home = self.normalize(".")
+        # Shared hosts often block exec
+        try:
+            code, _, _ = self.exec_command("echo ok", timeout=5)
+            self.can_exec = code == 0
+        except Exception:
+            self.can_exec = False
+        with self._lock:
+            if not self._sftp:
+                raise RuntimeError("Not connected")
+            try:
+                self._sftp.query_limits()
+            except (OSError, SFTPError):
+                pass
+        return self.capabilities()
+
     def close(self):
         with self._lock:
             if self._sftp:
@@ -96,6 +322,33 @@ class SftpClient:
             and self._sftp is not None
         )
 
+    @property
+    def extensions(self) -> dict:
+        """SFTP extensions the server advertised, name -> data."""
+        sftp = self._sftp
+        return dict(sftp.extensions) if sftp is not None else {}
+
+    def _has_extension(self, name: str) -> bool:
+        sftp = self._sftp
+        return sftp is not None and name in sftp.extensions
+
+    @property
+    def _read_size(self) -> int:
+        """Bytes per SSH_FXP_READ: the server's stated maximum, capped at
+        _DL_REQ_SIZE, or _DL_REQ_SIZE when it doesn't say."""
+        sftp = self._sftp
+        stated = sftp.limits.get("max-read-length", 0) if sftp is not None else 0
+        return min(stated, self._DL_REQ_SIZE) if stated else self._DL_REQ_SIZE
+
+    @property
+    def _write_size(self) -> int:
+        """Bytes per SSH_FXP_WRITE.  Unlike reads, an oversized write is an
+        error rather than a short count, so without a stated limit this stays
+        at the 32 KiB every server has to accept."""
+        sftp = self._sftp
+        stated = sftp.limits.get("max-write-length", 0) if sftp is not None else 0
+        return min(stated, self._DL_REQ_SIZE) if stated else self._UL_REQ_SIZE
+
     def normalize(self, path: str) -> str:
         """Resolve a remote path to its absolute form (calls server realpath)."""
         with self._lock:
@@ -113,7 +366,13 @@ class SftpClient:
     _DL_CHUNK = 1 << 20  # 1 MiB — matches MAX_REQUEST_SIZE for aligned prefetch reads
     _DL_WINDOW = 1 << 25  # 32 MiB SSH channel window (vs paramiko's 2 MiB default)
     _DL_MAX_PKT = 1 << 17  # 128 KiB max packet size (vs paramiko's 32 KiB default)
-    _DL_REQ_SIZE = 1 << 20  # 1 MiB per SSH_FXP_READ request (vs paramiko's 32 KiB default)
+    _DL_REQ_SIZE = 1 << 20  # upper bound per SSH_FXP_READ/WRITE; see _read_size
+    _UL_REQ_SIZE = 1 << 15  # 32 KiB per SSH_FXP_WRITE when the server states no limit
+
+    # Uploads at least this large check the server's free space first
+    # (statvfs@openssh.com), rather than finding out when the disk fills
+    # up part way and leaves a truncated file behind.
+    _SPACE_CHECK_MIN = 16 << 20
 
     def _open_dl_sftp(self):
         """Open a dedicated SFTP channel with large window for fast transfers."""
@@ -122,7 +381,7 @@ class SftpClient:
             max_packet_size=self._DL_MAX_PKT,
         )
         chan.invoke_subsystem("sftp")
-        return paramiko.SFTPClient(chan)
+        return _SFTPClient(chan)
 
     @contextlib.contextmanager
     def dl_channel(self):
@@ -152,7 +411,7 @@ class SftpClient:
         """Download a single file using tuned prefetch settings."""
         Path(local_path).parent.mkdir(parents=True, exist_ok=True)
         with dl_sftp.open(remote_path, "rb") as fr:
-            fr.MAX_REQUEST_SIZE = self._DL_REQ_SIZE
+            fr.MAX_REQUEST_SIZE = self._read_size
             fr.prefetch(file_size)
             with open(local_path, "wb", buffering=self._DL_CHUNK) as fl:
                 received = 0
@@ -276,10 +535,69 @@ class SftpClient:
             if not overwrite and self._exists_unlocked(remote_path):
                 name = remote_path.rsplit("/", 1)[-1]
                 raise FileExistsError(f"'{name}' already exists on the server")
-            if progress_cb:
-                self._sftp.put(local_path, remote_path, callback=progress_cb)
-            else:
-                self._sftp.put(local_path, remote_path)
+            parent = remote_path.rstrip("/").rsplit("/", 1)[0] or "/"
+            self._check_space_unlocked(parent, os.path.getsize(local_path))
+            # A single upload is usually a save from the editor: make sure it
+            # is on the server's disk, not just in its page cache, before we
+            # report it done.
+            self._put_unlocked(local_path, remote_path, progress_cb, fsync=True)
+
+    def _put_unlocked(self, local_path: str, remote_path: str, progress_cb=None,
+                      fsync: bool = False):
+        """SFTPClient.put with writes sized to what the server accepts.
+
+        put() reads the local file 32 KiB at a time, so its writes never get
+        bigger than that however much the server would take in one request.
+        """
+        size = os.path.getsize(local_path)
+        chunk = self._write_size
+        with open(local_path, "rb") as fl, self._sftp.open(remote_path, "wb") as fr:
+            fr.MAX_REQUEST_SIZE = chunk
+            fr.set_pipelined(True)
+            sent = 0
+            while True:
+                data = fl.read(chunk)
+                if not data:
+                    break
+                fr.write(data)
+                sent += len(data)
+                if progress_cb:
+                    progress_cb(sent, size)
+            if fsync and "fsync@openssh.com" in self._sftp.extensions:
+                fr.flush()
+                self._sftp._request(CMD_EXTENDED, "fsync@openssh.com", fr.handle)
+        remote_size = self._sftp.stat(remote_path).st_size
+        if remote_size != size:
+            raise OSError(f"size mismatch in put!  {remote_size} != {size}")
+
+    def _check_space_unlocked(self, remote_dir: str, size: int):
+        """Raise ENOSPC if the server says `size` bytes won't fit in `remote_dir`."""
+        if size < self._SPACE_CHECK_MIN or "statvfs@openssh.com" not in self._sftp.extensions:
+            return
+        try:
+            vfs = self._sftp.statvfs(remote_dir)
+        except (OSError, SFTPError):
+            return  # no answer is not a reason to refuse the upload
+        free = vfs[1] * vfs[4]  # f_frsize * f_bavail
+        if free < size:
+            raise OSError(
+                errno.ENOSPC,
+                f"Not enough space on the server: {size} bytes needed, {free} free",
+            )
+
+    def free_space(self, path: str) -> int | None:
+        """Bytes available to us on the filesystem holding `path`, or None
+        when the server can't say."""
+        with self._lock:
+            if not self._sftp:
+                raise RuntimeError("Not connected")
+            if "statvfs@openssh.com" not in self._sftp.extensions:
+                return None
+            try:
+                vfs = self._sftp.statvfs(path)
+            except (OSError, SFTPError):
+                return None
+        return vfs[1] * vfs[4]
 
     def stat(self, path: str):
         """Stat a remote path."""
@@ -288,6 +606,47 @@ class SftpClient:
                 raise RuntimeError("Not connected")
             return self._sftp.stat(path)
 
+    def stat_many(self, paths) -> list:
+        """Stat remote paths with pipelined requests: one round trip for
+        the lot, not one per path.
+
+        One entry per path, in order: its SFTPAttributes, or the OSError the
+        server answered with.
+        """
+        paths = list(paths)
+        if not paths:
+            return []
+        with self._lock:
+            if not self._sftp:
+                raise RuntimeError("Not connected")
+            replies = self._sftp.batch(
+                [(CMD_STAT, self._sftp._adjust_cwd(path)) for path in paths],
+                self._BATCH_WINDOW,
+            )
+        return [
+            reply if isinstance(reply, OSError)
+            else paramiko.SFTPAttributes._from_msg(reply[1])
+            for reply in replies
+        ]
+
+    def read_ranges(self, path: str, ranges) -> list[bytes]:
+        """Read (offset, length) byte ranges of a remote file.
+
+        Everything happens under one open handle, so asking for the head of
+        a file and what was appended to it costs one open/close instead of
+        two.  A range running past the end comes back short, not padded.
+        """
+        with self._lock:
+            if not self._sftp:
+                raise RuntimeError("Not connected")
+            out = []
+            with self._sftp.open(path, "rb") as fr:
+                fr.MAX_REQUEST_SIZE = self._read_size
+                for offset, length in ranges:
+                    fr.seek(offset)
+                    out.append(fr.read(length) if length > 0 else b"")
+            return out
+
     def mkdir(self, path: str):
         """Create a remote directory."""
         with self._lock:
@@ -295,15 +654,65 @@ class SftpClient:
                 raise RuntimeError("Not connected")
             self._sftp.mkdir(path)
 
-    def rename(self, old_path: str, new_path: str):
-        """Rename a remote file or directory."""
+    def rename(self, old_path: str, new_path: str, overwrite: bool = False):
+        """Rename a remote file or directory.
+
+        Plain SFTP rename refuses to replace anything on most servers and
+        silently replaces on others, which is why it is normally preceded
+        by an existence check.  OpenSSH can do better either way: its plain
+        rename never replaces, so the check only needs to happen after a
+        failure, and posix-rename replaces a file in a single request.
+        """
         with self._lock:
             if not self._sftp:
                 raise RuntimeError("Not connected")
-            if self._exists_unlocked(new_path):
-                name = new_path.rsplit("/", 1)[-1]
-                raise FileExistsError(f"'{name}' already exists at the destination")
-            self._sftp.rename(old_path, new_path)
+            if overwrite and self._has_extension("posix-rename@openssh.com"):
+                try:
+                    self._sftp.posix_rename(old_path, new_path)
+                    return
+                except OSError:
+                    pass  # e.g. the target is a non-empty directory
+            if overwrite:
+                try:
+                    target = self._sftp.lstat(new_path)
+                except FileNotFoundError:
+                    target = None
+                if target is not None:
+                    errors = {}
+                    entries = self._walk_unlocked(
+                        [(new_path, stat.S_ISDIR(target.st_mode), 0)], errors)
+                    self._remove_entries_unlocked(entries, errors)
+                    if errors:
+                        raise errors[0]
+            elif not self._rename_never_replaces:
+                if self._exists_unlocked(new_path):
+                    raise self._exists_error(new_path)
+            try:
+                self._sftp.rename(old_path, new_path)
+            except OSError:
+                if not overwrite and self._exists_unlocked(new_path):
+                    raise self._exists_error(new_path) from None
+                raise
+
+    @property
+    def _rename_never_replaces(self) -> bool:
+        # Only OpenSSH advertises these, and its sftp-server implements
+        # SSH_FXP_RENAME as link()+unlink(), or a stat check where links
+        # aren't possible, so an existing target is always an error.
+        return (self._has_extension("posix-rename@openssh.com")
+                or self._has_extension("hardlink@openssh.com"))
+
+    def hardlink(self, src: str, dst: str):
+        """Create a hard link `dst` to `src` (hardlink@openssh.com)."""
+        with self._lock:
+            if not self._sftp:
+                raise RuntimeError("Not connected")
+            if not self._has_extension("hardlink@openssh.com"):
+                raise OSError(errno.ENOTSUP, "The server does not support hard links")
+            self._sftp._request(
+                CMD_EXTENDED, "hardlink@openssh.com",
+                self._sftp._adjust_cwd(src), self._sftp._adjust_cwd(dst),
+            )
 
     def chmod(self, path: str, mode: int):
         """Change permissions of a remote file or directory."""
@@ -335,23 +744,310 @@ class SftpClient:
 
     def _rmdir_recursive_unlocked(self, path: str):
         """Internal recursive delete without re-acquiring the lock."""
-        for attr in self._sftp.listdir_attr(path):
-            child = f"{path.rstrip('/')}/{attr.filename}"
-            if stat.S_ISDIR(attr.st_mode):
-                self._rmdir_recursive_unlocked(child)
-            else:
-                self._sftp.remove(child)
-        self._sftp.rmdir(path)
+        errors = {}
+        self._remove_entries_unlocked(self._walk_unlocked([(path, True, 0)], errors), errors)
+        if errors:
+            raise errors[0]
+
+    # ── Batch metadata operations ─────────────────────────────────────
+    #
+    # Deleting, moving or chmod-ing a selection is all small requests whose
+    # cost is the round trip, not the work.  These keep up to _BATCH_WINDOW
+    # of them on the wire at once and report failures per item instead of
+    # stopping at the first one, so a single unwritable file doesn't leave
+    # the rest of the selection untouched.
+    #
+    # Each takes a list and returns [(path, error)] for the items that
+    # failed; everything else succeeded.
+
+    # Requests in flight at once.  Each is a few dozen bytes, so the window
+    # only has to cover the round trip; 64 keeps a slow link busy without
+    # flooding a small server's request queue.
+    _BATCH_WINDOW = 64
+
+    # Paths per `rm -rf`, to stay far below the remote shell's ARG_MAX.
+    _EXEC_RM_PATHS = 256
+
+    def remove_many(self, items, use_exec: bool = True) -> list:
+        """Delete files and directory trees, given as (path, is_dir) pairs.
+
+        With `use_exec`, a single `rm -rf` over the SSH exec channel is tried
+        first: it removes any number of trees in one round trip, where SFTP
+        needs a listing per directory and a request per entry.
+        """
+        items = list(items)
+        missing_ok = False
+        if use_exec and self.can_exec:
+            if self._exec_remove([path for path, _ in items]):
+                return []
+            # rm failed part way; whatever it got to is already gone.
+            missing_ok = True
+        with self._lock:
+            if not self._sftp:
+                raise RuntimeError("Not connected")
+            errors = {}
+            entries = self._walk_unlocked(
+                [(path, is_dir, i) for i, (path, is_dir) in enumerate(items)], errors
+            )
+            self._remove_entries_unlocked(entries, errors)
+        return self._failures([path for path, _ in items], errors, missing_ok)
+
+    def rename_many(self, moves, overwrite: bool = False, use_exec: bool = True) -> list:
+        """Move (src, dst) pairs.
+
+        Existing destinations are failures unless `overwrite`, in which case
+        they are replaced: files in one posix-rename where the server has it,
+        anything else by deleting it first.
+        """
+        moves = [(src, dst) for src, dst in moves if src != dst]
+        with self._lock:
+            if not self._sftp:
+                raise RuntimeError("Not connected")
+            errors = {}
+            posix = self._has_extension("posix-rename@openssh.com")
+            replace = set()
+            occupied = []
+            if overwrite or not self._rename_never_replaces:
+                # One LSTAT per destination, all in flight together, replaces
+                # a stat-then-rename round trip pair per item.
+                for i, reply in enumerate(self._lstat_many_unlocked([dst for _, dst in moves])):
+                    if reply is None:
+                        continue
+                    if isinstance(reply, OSError):
+                        errors[i] = reply
+                    elif not overwrite:
+                        errors[i] = self._exists_error(moves[i][1])
+                    elif posix and not stat.S_ISDIR(reply.st_mode):
+                        replace.add(i)
+                    else:
+                        occupied.append((moves[i][1], stat.S_ISDIR(reply.st_mode), i))
+        # Occupied destinations go first: in one `rm -rf` where the shell
+        # allows, outside the lock, and over SFTP otherwise.
+        if occupied and use_exec and self._exec_remove([dst for dst, _, _ in occupied]):
+            occupied = []
+        with self._lock:
+            if not self._sftp:
+                raise RuntimeError("Not connected")
+            sftp = self._sftp
+            if occupied:
+                self._remove_entries_unlocked(self._walk_unlocked(occupied, errors), errors)
+            todo = [i for i in range(len(moves)) if i not in errors]
+            self._batch_unlocked(
+                [(CMD_EXTENDED, "posix-rename@openssh.com", sftp._adjust_cwd(moves[i][0]),
+                  sftp._adjust_cwd(moves[i][1])) if i in replace
+                 else (CMD_RENAME, sftp._adjust_cwd(moves[i][0]), sftp._adjust_cwd(moves[i][1]))
+                 for i in todo],
+                todo, errors,
+            )
+            if not overwrite and self._rename_never_replaces:
+                # Nothing was looked up beforehand; tell "already exists"
+                # apart from other refusals now, for the failures only.
+                failed = [i for i in todo if i in errors]
+                looked_up = self._lstat_many_unlocked([moves[i][1] for i in failed])
+                for i, reply in zip(failed, looked_up):
+                    if isinstance(reply, paramiko.SFTPAttributes):
+                        errors[i] = self._exists_error(moves[i][1])
+        return self._failures([src for src, _ in moves], errors)
+
+    def _lstat_many_unlocked(self, paths) -> list:
+        """Pipelined lstat: SFTPAttributes, None if missing, or the OSError."""
+        if not paths:
+            return []
+        replies = self._sftp.batch(
+            [(CMD_LSTAT, self._sftp._adjust_cwd(path)) for path in paths],
+            self._BATCH_WINDOW,
+        )
+        return [
+            None if isinstance(reply, FileNotFoundError)
+            else reply if isinstance(reply, OSError)
+            else paramiko.SFTPAttributes._from_msg(reply[1])
+            for reply in replies
+        ]
+
+    @staticmethod
+    def _exists_error(path: str) -> FileExistsError:
+        name = path.rsplit("/", 1)[-1]
+        return FileExistsError(f"'{name}' already exists at the destination")
+
+    def chmod_many(self, items, mode: int, recursive: bool = False) -> list:
+        """Set `mode` on (path, is_dir) pairs, and with `recursive` on
+        everything below the directories among them.
+
+        Like `chmod -R`, symlinks found inside a tree are left alone.
+        Contents are changed before their directory, so taking away a
+        directory's execute bit doesn't lock the walk out of it half way.
+        """
+        items = list(items)
+        with self._lock:
+            if not self._sftp:
+                raise RuntimeError("Not connected")
+            errors = {}
+            entries = [(0, path, "dir" if is_dir else "file", i)
+                       for i, (path, is_dir) in enumerate(items)]
+            if recursive:
+                entries = self._walk_unlocked(
+                    [(path, is_dir, i) for i, (path, is_dir) in enumerate(items)], errors
+                )
+            attr = paramiko.SFTPAttributes()
+            attr.st_mode = mode
+            for level in self._by_depth(entries, deepest_first=True):
+                level = [e for e in level if e[0] == 0 or e[2] != "link"]
+                self._batch_unlocked(
+                    [(CMD_SETSTAT, self._sftp._adjust_cwd(path), attr)
+                     for _, path, _, _ in level],
+                    [owner for _, _, _, owner in level], errors,
+                )
+        return self._failures([path for path, _ in items], errors)
+
+    def mkdir_many(self, paths) -> list:
+        """Create directories; parents are created before their children."""
+        paths = list(paths)
+        with self._lock:
+            if not self._sftp:
+                raise RuntimeError("Not connected")
+            errors = {}
+            self._mkdirs_unlocked(paths, errors)
+        return self._failures(paths, errors)
+
+    def _mkdirs_unlocked(self, paths, errors: dict):
+        attr = paramiko.SFTPAttributes()
+        attr.st_mode = 0o777
+        entries = [(path.rstrip("/").count("/"), path, "dir", i)
+                   for i, path in enumerate(paths)]
+        for level in self._by_depth(entries):
+            self._batch_unlocked(
+                [(CMD_MKDIR, self._sftp._adjust_cwd(path), attr)
+                 for _, path, _, _ in level],
+                [owner for _, _, _, owner in level], errors,
+            )
+
+    def _walk_unlocked(self, items, errors: dict) -> list:
+        """Expand (path, is_dir, owner) items to every entry beneath them.
+
+        Returns (depth, path, kind, owner) tuples, kind being "dir", "file"
+        or "link"; depth 0 are the items themselves.  Directory listings are
+        still one at a time: each is an open/read/close exchange of its own.
+        """
+        entries = []
+        stack = [(0, path, "dir" if is_dir else "file", owner)
+                 for path, is_dir, owner in items]
+        while stack:
+            depth, path, kind, owner = stack.pop()
+            entries.append((depth, path, kind, owner))
+            if kind != "dir":
+                continue
+            try:
+                attrs = self._sftp.listdir_attr(path)
+            except OSError as e:
+                errors.setdefault(owner, e)
+                continue
+            for attr in attrs:
+                mode = attr.st_mode or 0
+                kind = ("dir" if stat.S_ISDIR(mode)
+                        else "link" if stat.S_ISLNK(mode) else "file")
+                stack.append((depth + 1, f"{path.rstrip('/')}/{attr.filename}", kind, owner))
+        return entries
+
+    def _remove_entries_unlocked(self, entries, errors: dict):
+        """Delete walked entries: every file at once, then the directories
+        one level at a time from the bottom up."""
+        files = [e for e in entries if e[2] != "dir"]
+        self._batch_unlocked(
+            [(CMD_REMOVE, self._sftp._adjust_cwd(path)) for _, path, _, _ in files],
+            [owner for _, _, _, owner in files], errors,
+        )
+        dirs = [e for e in entries if e[2] == "dir"]
+        for level in self._by_depth(dirs, deepest_first=True):
+            self._batch_unlocked(
+                [(CMD_RMDIR, self._sftp._adjust_cwd(path)) for _, path, _, _ in level],
+                [owner for _, _, _, owner in level], errors,
+            )
+
+    def _batch_unlocked(self, requests, owners, errors: dict):
+        """Pipeline `requests`, recording the first failure per owner."""
+        if not requests:
+            return
+        for owner, reply in zip(owners, self._sftp.batch(requests, self._BATCH_WINDOW)):
+            if isinstance(reply, OSError):
+                errors.setdefault(owner, reply)
+
+    def _exec_transport(self):
+        """The transport to run a shell command on, or None if there is no
+        shell for it.
+
+        The command itself runs without the lock, as in exec_command(): a
+        `cp -a` or `rm -rf` of a big tree can take many minutes, and the
+        listings, polls and saves on this connection go on meanwhile.
+        """
+        if not self.can_exec:
+            return None
+        with self._lock:
+            transport = self._transport
+        if transport is None or not transport.is_active():
+            return None
+        return transport
+
+    def _exec_remove(self, paths) -> bool:
+        """Delete `paths` with `rm -rf`. True only if every one is gone.
+        Call without the lock."""
+        if not paths:
+            return False
+        # Relative paths would resolve against the shell's cwd rather than
+        # the SFTP session's, and "/" is never something we mean to delete.
+        if any(not p.startswith("/") or not p.strip("/") for p in paths):
+            return False
+        transport = self._exec_transport()
+        if transport is None:
+            return False
+        for start in range(0, len(paths), self._EXEC_RM_PATHS):
+            chunk = paths[start:start + self._EXEC_RM_PATHS]
+            cmd = "rm -rf -- " + " ".join(shlex.quote(p) for p in chunk)
+            try:
+                code, _, _ = self._exec_on_transport(transport, cmd, timeout=3600)
+            except (paramiko.SSHException, OSError):
+                return False
+            if code != 0:
+                return False
+        return True
+
+    @staticmethod
+    def _by_depth(entries, deepest_first: bool = False):
+        """Group (depth, ...) tuples into lists of equal depth."""
+        levels = {}
+        for entry in entries:
+            levels.setdefault(entry[0], []).append(entry)
+        for depth in sorted(levels, reverse=deepest_first):
+            yield levels[depth]
+
+    @staticmethod
+    def _failures(paths, errors: dict, missing_ok: bool = False) -> list:
+        return [
+            (paths[i], e) for i, e in sorted(errors.items())
+            if not (missing_ok and isinstance(e, FileNotFoundError))
+        ]
 
     def copy_remote(self, src: str, dst: str):
-        """Copy a remote file by reading and writing via the SFTP channel."""
+        """Copy a remote file by the cheapest means the server offers.
+
+        Routing the bytes through this process is the last resort: a
+        duplicated 2 GB backup would otherwise cost 2 GB down and 2 GB back
+        up.  copy-data (OpenSSH 9.0+) and `cp` both copy on the server and
+        send nothing but the request.
+        """
         with self._lock:
             if not self._sftp:
                 raise RuntimeError("Not connected")
             if self._exists_unlocked(dst):
                 name = dst.rsplit("/", 1)[-1]
                 raise FileExistsError(f"'{name}' already exists at the destination")
-            self._copy_file_unlocked(src, dst)
+            if self._try_copy_data_unlocked(src, dst):
+                return
+        if self._exec_copy(src, dst):
+            return
+        with self._lock:
+            if not self._sftp:
+                raise RuntimeError("Not connected")
+            self._stream_copy_unlocked(src, dst)
 
     def copy_remote_recursive(self, src: str, dst: str):
         """Recursively copy a remote file or directory."""
@@ -361,16 +1057,94 @@ class SftpClient:
             if self._exists_unlocked(dst):
                 name = dst.rsplit("/", 1)[-1]
                 raise FileExistsError(f"'{name}' already exists at the destination")
+        # One `cp -a` copies a whole tree in a single round trip; walking
+        # it over SFTP costs a listdir per directory and a copy per file.
+        if self._exec_copy(src, dst):
+            return
+        with self._lock:
+            if not self._sftp:
+                raise RuntimeError("Not connected")
             self._copy_recursive_unlocked(src, dst)
 
+    # Client-side copy: reads kept in flight at once, and the size of each.
+    # Bounds memory to _COPY_WINDOW * _COPY_CHUNK however large the file is.
+    _COPY_CHUNK = 1 << 20
+    _COPY_WINDOW = 8
+
     def _copy_file_unlocked(self, src: str, dst: str):
+        """Copy one file without a shell: copy-data if the server has it,
+        through this client if not."""
+        if not self._try_copy_data_unlocked(src, dst):
+            self._stream_copy_unlocked(src, dst)
+
+    def _try_copy_data_unlocked(self, src: str, dst: str) -> bool:
+        """Copy via copy-data where advertised; False if not done."""
+        if "copy-data" not in self._sftp.extensions:
+            return False
+        try:
+            self._copy_data_unlocked(src, dst)
+            return True
+        except OSError:
+            # Advertised but refused for this pair (a handle the server
+            # won't copy between, say).  A real error, such as a missing
+            # source, fails again in the fallback and is reported from there.
+            return False
+
+    def _copy_data_unlocked(self, src: str, dst: str):
+        """Copy via the copy-data extension: the server moves the bytes."""
         with self._sftp.open(src, "rb") as fin:
             with self._sftp.open(dst, "wb") as fout:
-                while True:
-                    chunk = fin.read(65536)
-                    if not chunk:
-                        break
-                    fout.write(chunk)
+                # read-offset 0, read-length 0 (= to EOF), write-offset 0
+                self._sftp._request(
+                    CMD_EXTENDED, "copy-data",
+                    fin.handle, int64(0), int64(0), fout.handle, int64(0),
+                )
+
+    def _exec_copy(self, src: str, dst: str) -> bool:
+        """Copy with `cp -a` on the server. False when there is no shell for it.
+
+        Call without the lock.  A cp that runs and fails (permissions, disk
+        full) raises: falling back would only fail the same way, more slowly.
+        """
+        transport = self._exec_transport()
+        if transport is None:
+            return False
+        cmd = f"cp -a -- {shlex.quote(src)} {shlex.quote(dst)}"
+        try:
+            code, _out, err = self._exec_on_transport(transport, cmd, timeout=3600)
+        except (paramiko.SSHException, OSError):
+            return False
+        if code == 127:  # command not found: a restricted shell
+            return False
+        if code != 0:
+            raise OSError(err.strip() or f"cp exited with status {code}")
+        return True
+
+    def _stream_copy_unlocked(self, src: str, dst: str):
+        """Copy through this client, keeping a bounded window of reads in flight.
+
+        A read-then-write loop pays a full round trip per chunk.  readv()
+        issues a window of reads at once and the pipelined writer doesn't
+        wait for each write's ack, so both directions stay busy while only
+        one window's worth of data is ever held in memory.
+        """
+        size = self._sftp.stat(src).st_size or 0
+        with self._sftp.open(src, "rb") as fin:
+            fin.MAX_REQUEST_SIZE = self._read_size
+            with self._sftp.open(dst, "wb") as fout:
+                fout.MAX_REQUEST_SIZE = self._write_size
+                fout.set_pipelined(True)
+                offset = 0
+                while offset < size:
+                    chunks = []
+                    while offset < size and len(chunks) < self._COPY_WINDOW:
+                        n = min(self._COPY_CHUNK, size - offset)
+                        chunks.append((offset, n))
+                        offset += n
+                    for data in fin.readv(chunks):
+                        if not data:
+                            return  # source shrank under us
+                        fout.write(data)
 
     def _copy_recursive_unlocked(self, src: str, dst: str):
         src_stat = self._sftp.stat(src)
@@ -405,17 +1179,23 @@ class SftpClient:
             self._upload_directory_unlocked(local_dir, remote_dir)
 
     def _upload_directory_unlocked(self, local_dir: str, remote_dir: str):
-        try:
-            self._sftp.mkdir(remote_dir)
-        except OSError:
-            pass  # directory may already exist
-        for entry in os.listdir(local_dir):
-            local_path = os.path.join(local_dir, entry)
-            remote_path = f"{remote_dir.rstrip('/')}/{entry}"
-            if os.path.isdir(local_path):
-                self._upload_directory_unlocked(local_path, remote_path)
-            else:
-                self._sftp.put(local_path, remote_path)
+        # Create the whole tree up front, a level per batch, instead of a
+        # mkdir round trip ahead of each directory's files.
+        remote_root = remote_dir.rstrip("/")
+        dirs = [remote_dir]
+        files = []
+        for root, subdirs, names in os.walk(local_dir, followlinks=True):
+            rel = os.path.relpath(root, local_dir)
+            base = remote_root if rel == "." else f"{remote_root}/{rel.replace(os.sep, '/')}"
+            dirs.extend(f"{base}/{name}" for name in subdirs)
+            files.extend((os.path.join(root, name), f"{base}/{name}") for name in names)
+        self._check_space_unlocked(
+            remote_root.rsplit("/", 1)[0] or "/",
+            sum(os.path.getsize(local_path) for local_path, _ in files),
+        )
+        self._mkdirs_unlocked(dirs, {})  # directories may already exist
+        for local_path, remote_path in files:
+            self._put_unlocked(local_path, remote_path)
 
     def _exists_unlocked(self, path: str) -> bool:
         """Check if a remote path exists (must be called with lock held)."""
@@ -437,6 +1217,34 @@ class SftpClient:
                 raise RuntimeError("Not connected")
             transport = self._transport
 
+        return self._exec_on_transport(transport, command, timeout)
+
+    def open_exec_stream(self, command: str):
+        """Start a long-running command and return its channel, unread.
+
+        For commands that keep printing for as long as they run (a watcher
+        like inotifywait), read line by line through channel.makefile().
+        The command runs on a pty, so stderr comes interleaved with stdout
+        there, lines end in CRLF, and closing the channel hangs the pty up:
+        the command gets SIGHUP.  Without one sshd only closes its pipes,
+        and a command blocked on anything else keeps running on the server.
+        """
+        with self._lock:
+            if not self._transport or not self._transport.is_active():
+                raise RuntimeError("Not connected")
+            transport = self._transport
+        channel = transport.open_session()
+        try:
+            channel.get_pty()
+            channel.exec_command(command)  # nosec B601
+        except Exception:
+            channel.close()
+            raise
+        return channel
+
+    @staticmethod
+    def _exec_on_transport(transport, command: str, timeout: float) -> tuple[int, str, str]:
+        """exec_command without the lock, for callers that already hold it."""
         channel = transport.open_session()
         try:
             channel.settimeout(timeout)
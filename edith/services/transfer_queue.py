@@ -9,6 +9,8 @@ from collections import deque
 
 from gi.repository import GLib, GObject
 
+from edith.services.main_dispatch import call_latest, call_soon
+
 
 class TransferAborted(Exception):
     """Raised inside a progress callback to abort the active transfer."""
@@ -119,7 +121,7 @@ class TransferQueue(GObject.Object):
                     self._worker_running = False
                     self._active_job_id = None
                     self._active_channel = None
-                    GLib.idle_add(self._cb_idle)
+                    call_soon(self._cb_idle)
                     return
                 job_id, label, task, on_success, on_error = self._queue.popleft()
                 pending = len(self._queue)
@@ -127,29 +129,29 @@ class TransferQueue(GObject.Object):
                 self._active_channel = None
                 self._cancel_event.clear()
 
-            GLib.idle_add(self._cb_started, label, job_id, pending)
-            progress_cb = self._make_progress_cb(label, pending)
+            call_soon(self._cb_started, label, job_id, pending)
+            progress_cb = self._make_progress_cb(label, job_id, pending)
 
             try:
                 result = task(progress_cb, self._cancel_event, self._set_channel)
-                GLib.idle_add(self._cb_done, label)
+                call_soon(self._cb_done, label)
                 if on_success:
-                    GLib.idle_add(on_success, result)
+                    call_soon(on_success, result)
             except TransferAborted:
-                GLib.idle_add(self._cb_failed, label, "Aborted")
+                call_soon(self._cb_failed, label, "Aborted")
                 if on_error:
-                    GLib.idle_add(on_error, TransferAborted())
+                    call_soon(on_error, TransferAborted())
             except Exception as exc:
                 if self._cancel_event.is_set():
                     # Channel was force-closed — treat as abort, not error
-                    GLib.idle_add(self._cb_failed, label, "Aborted")
+                    call_soon(self._cb_failed, label, "Aborted")
                     if on_error:
-                        GLib.idle_add(on_error, TransferAborted())
+                        call_soon(on_error, TransferAborted())
                 else:
                     traceback.print_exc()
-                    GLib.idle_add(self._cb_failed, label, str(exc))
+                    call_soon(self._cb_failed, label, str(exc))
                     if on_error:
-                        GLib.idle_add(on_error, exc)
+                        call_soon(on_error, exc)
             finally:
                 with self._lock:
                     self._active_channel = None
@@ -159,7 +161,7 @@ class TransferQueue(GObject.Object):
         with self._lock:
             self._active_channel = channel
 
-    def _make_progress_cb(self, label: str, pending: int):
+    def _make_progress_cb(self, label: str, job_id: int, pending: int):
         """Return a progress callback that checks for cancellation and throttles."""
         cancel = self._cancel_event
         last_pct = [-1]
@@ -174,11 +176,13 @@ class TransferQueue(GObject.Object):
                 return
             last_pct[0] = pct
             fraction = min(done / total, 1.0)
-            GLib.idle_add(self._cb_progress, label, fraction, pending)
+            # Only the latest fraction is worth showing; one not shown yet
+            # is overwritten rather than queued behind.
+            call_latest((self, job_id), self._cb_progress, label, fraction, pending)
 
         return cb
 
-    # ── idle_add targets (main thread) ────────────────────────────────────────
+    # ── call_soon targets (main thread) ───────────────────────────────────────
 
     def _cb_idle(self):
         self.emit("idle")
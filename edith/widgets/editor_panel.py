@@ -3,13 +3,17 @@
 
 import gi
 import os
+import time
 
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 
-from gi.repository import Adw, Gdk, Gio, Gtk, GObject
+from gi.repository import Adw, Gdk, Gio, GLib, Gtk, GObject
 
 from edith.models.open_file import OpenFile
+from edith.services.preferences import current as current_preferences
+from edith.services.process_memory import rss as own_rss, tree_rss, web_process_rss
+from edith.widgets.editor_pool import EditorPool
 from edith.widgets.image_viewer import ImageViewer, is_image_file
 from edith.widgets.monaco_editor import MonacoEditor
 from edith.i18n import _
@@ -18,6 +22,22 @@ from edith.i18n import _
 class EditorPanel(Gtk.Box):
     """Tabbed editor panel using Adw.TabView."""
 
+    # Tabs not looked at for this many minutes give up their WebView
+    # (config key editor_hibernate_after_min; 0 never).  Only tabs without
+    # unsaved changes: hibernating loses undo history.
+    _HIBERNATE_AFTER_MIN = 30
+    # Above this much resident memory (MiB, Edith and its web processes;
+    # config key editor_memory_budget_mb, 0 for none), the least recently
+    # used tabs hibernate until it fits, unsaved ones last.
+    _MEMORY_BUDGET_MB = 2048
+    _HIBERNATE_CHECK_S = 60
+
+    # The budget is for the whole process tree, every window's tabs
+    # together, so one check for all panels; each realized panel is in
+    # _panels while it is on screen.
+    _panels = []
+    _check_id = None
+
     __gsignals__ = {
         "page-changed":      (GObject.SignalFlags.RUN_FIRST, None, ()),
         "line-ending-ready": (GObject.SignalFlags.RUN_FIRST, None, (str,)),
@@ -33,7 +53,10 @@ class EditorPanel(Gtk.Box):
         # Tab bar
         self._tab_view = Adw.TabView()
         self._tab_view.connect("close-page", self._on_close_page)
-        self._tab_view.connect("notify::selected-page", lambda *_: self.emit("page-changed"))
+        self._tab_view.connect("notify::selected-page", self._on_selected_page_changed)
+        self._selected_editor = None
+        self.connect("realize", self._on_realize)
+        self.connect("unrealize", self._on_unrealize)
 
         # Tab context menu
         self._setup_tab_menu()
@@ -51,6 +74,7 @@ class EditorPanel(Gtk.Box):
         section1.append(_("Show in Sidebar"), "tab.show-in-sidebar")
         section1.append(_("Pin"), "tab.pin")
         section1.append(_("Copy Path"), "tab.copy-path")
+        section1.append(_("Follow"), "tab.follow")
         menu.append_section(None, section1)
 
         section2 = Gio.Menu()
@@ -75,6 +99,11 @@ class EditorPanel(Gtk.Box):
         copy_path_action.connect("activate", self._on_copy_path)
         group.add_action(copy_path_action)
 
+        self._follow_action = Gio.SimpleAction.new_stateful(
+            "follow", None, GLib.Variant.new_boolean(False))
+        self._follow_action.connect("activate", self._on_follow)
+        group.add_action(self._follow_action)
+
         self._close_others_action = Gio.SimpleAction.new("close-others", None)
         self._close_others_action.connect("activate", self._on_close_others)
         group.add_action(self._close_others_action)
@@ -93,6 +122,11 @@ class EditorPanel(Gtk.Box):
         pos = tab_view.get_page_position(page) if page else 0
         self._close_others_action.set_enabled(page is not None and n > 1)
         self._close_to_right_action.set_enabled(page is not None and pos < n - 1)
+        widget = page.get_child() if page else None
+        is_editor = isinstance(widget, MonacoEditor)
+        self._follow_action.set_enabled(is_editor and self._window is not None)
+        self._follow_action.set_state(GLib.Variant.new_boolean(
+            is_editor and widget.is_following()))
 
     def _on_copy_path(self, action, param):
         page = self._menu_page
@@ -115,6 +149,20 @@ class EditorPanel(Gtk.Box):
         if open_file and self._window:
             self._window.pin_path(open_file.remote_path, is_dir=False)
 
+    def _on_follow(self, action, param):
+        page = self._menu_page
+        if not page or not self._window:
+            return
+
+        widget = page.get_child()
+        if not isinstance(widget, MonacoEditor):
+            return
+        remote_path = widget.open_file.remote_path
+        if self._window.is_following(remote_path):
+            self._window.unfollow_file(remote_path)
+        else:
+            self._window.follow_file(remote_path)
+
     def _on_show_in_sidebar(self, action, param):
         page = self._menu_page
         if not page:
@@ -152,13 +200,19 @@ class EditorPanel(Gtk.Box):
     def set_window(self, window):
         self._window = window
 
-    def open_file(self, remote_path: str, local_path: str):
-        """Open a file in a new (or existing) editor tab."""
+    def open_file(self, remote_path: str, local_path: str, server_id: str | None = None,
+                  peek_size: int | None = None):
+        """Open a file in a new (or existing) editor tab.
+
+        peek_size: the local copy is a preview of a remote file this big
+            (see edith.services.file_peek).
+        """
         if remote_path in self._tabs:
             self.focus_tab(remote_path)
             return
 
-        open_file = OpenFile(remote_path=remote_path, local_path=local_path)
+        open_file = OpenFile(remote_path=remote_path, local_path=local_path,
+                             server_id=server_id, peek_size=peek_size)
 
         if is_image_file(remote_path):
             widget = ImageViewer(open_file)
@@ -166,6 +220,7 @@ class EditorPanel(Gtk.Box):
             widget = MonacoEditor(open_file)
             widget.connect("modified-changed", self._on_modified_changed)
             widget.connect("line-ending-detected", self._on_editor_line_ending)
+            widget.connect("load-full-requested", self._on_load_full_requested)
 
         page = self._tab_view.append(widget)
         filename = os.path.basename(remote_path)
@@ -175,6 +230,10 @@ class EditorPanel(Gtk.Box):
         self._tabs[remote_path] = page
         self._tab_view.set_selected_page(page)
 
+    def _on_load_full_requested(self, editor):
+        if self._window:
+            self._window.load_full_file(editor.open_file.remote_path)
+
     def find_tab(self, remote_path: str):
         """Return remote_path if tab exists, else None."""
         if remote_path in self._tabs:
@@ -196,6 +255,10 @@ class EditorPanel(Gtk.Box):
         editor = page.get_child()
         if not isinstance(editor, MonacoEditor):
             return
+        if editor.is_following() or editor.is_peek():
+            # The buffer is a trimmed tail or a preview of the file, not
+            # something to write back over it.
+            return
 
         def on_done():
             if self._window:
@@ -213,14 +276,24 @@ class EditorPanel(Gtk.Box):
             self._tab_view.close_page(page)
 
     def close_all(self):
-        """Close all tabs."""
+        """Close all tabs, unsaved changes and their journals included."""
         paths = list(self._tabs.keys())
         for path in paths:
             page = self._tabs.get(path)
             if page:
+                widget = page.get_child()
+                if isinstance(widget, MonacoEditor):
+                    widget.discard_journal()
                 self._tab_view.close_page_finish(page, True)
         self._tabs.clear()
 
+    def discard_journals(self, unsaved: bool = False):
+        """The app is exiting: forget the journals of the open tabs, only
+        those without unsaved changes unless `unsaved`."""
+        for editor in self._editors():
+            if unsaved or not editor.open_file.is_modified:
+                editor.discard_journal(now=True)
+
     def _record_close(self, page):
         widget = page.get_child()
         open_file = getattr(widget, "open_file", None)
@@ -250,6 +323,9 @@ class EditorPanel(Gtk.Box):
                 return True  # Inhibit default close, we handle it
 
             self._tabs.pop(remote_path, None)
+            widget.discard_journal()
+            if widget.is_following() and self._window:
+                self._window.unfollow_file(remote_path)
         else:
             open_file = getattr(widget, "open_file", None)
             if open_file:
@@ -284,6 +360,7 @@ class EditorPanel(Gtk.Box):
                         editor.open_file.remote_path,
                         editor.open_file.local_path,
                     )
+                editor.discard_journal()
                 self._tabs.pop(editor.open_file.remote_path, None)
                 self._record_close(page)
                 self._tab_view.close_page_finish(page, True)
@@ -292,12 +369,108 @@ class EditorPanel(Gtk.Box):
             return
 
         if response != "cancel":
+            editor.discard_journal()
             self._tabs.pop(editor.open_file.remote_path, None)
             self._record_close(page)
             self._tab_view.close_page_finish(page, True)
         else:
             self._tab_view.close_page_finish(page, False)
 
+    # --- Hibernation ---
+
+    def _on_selected_page_changed(self, tab_view, pspec):
+        page = tab_view.get_selected_page()
+        widget = page.get_child() if page else None
+        previous = self._selected_editor
+        if previous is not None and previous is not widget:
+            previous.last_active = time.monotonic()
+        if isinstance(widget, MonacoEditor):
+            widget.last_active = None
+            widget.wake()
+            self._selected_editor = widget
+        else:
+            self._selected_editor = None
+        self.emit("page-changed")
+
+    def _editors(self):
+        for i in range(self._tab_view.get_n_pages()):
+            widget = self._tab_view.get_nth_page(i).get_child()
+            if isinstance(widget, MonacoEditor):
+                yield widget
+
+    @staticmethod
+    def _int_preference(key, default):
+        try:
+            return max(0, int(current_preferences().get(key, default)))
+        except (TypeError, ValueError):
+            return default
+
+    def _on_realize(self, _widget):
+        cls = EditorPanel
+        cls._panels.append(self)
+        if cls._check_id is None:
+            cls._check_id = GLib.timeout_add_seconds(cls._HIBERNATE_CHECK_S,
+                                                     cls._check_hibernation)
+
+    def _on_unrealize(self, _widget):
+        cls = EditorPanel
+        if self in cls._panels:
+            cls._panels.remove(self)
+        if not cls._panels and cls._check_id is not None:
+            GLib.source_remove(cls._check_id)
+            cls._check_id = None
+
+    @classmethod
+    def _check_hibernation(cls):
+        editors = [e for panel in cls._panels for e in panel._editors()]
+        candidates = [e for e in editors
+                      if e.last_active is not None and e.can_hibernate()]
+        if not candidates:
+            return True
+
+        idle_min = cls._int_preference("editor_hibernate_after_min",
+                                       cls._HIBERNATE_AFTER_MIN)
+        now = time.monotonic()
+        if idle_min:
+            for editor in candidates:
+                if (not editor.open_file.is_modified
+                        and now - editor.last_active >= idle_min * 60):
+                    editor.hibernate()
+
+        budget_mb = cls._int_preference("editor_memory_budget_mb",
+                                        cls._MEMORY_BUDGET_MB)
+        rss = tree_rss() if budget_mb else None
+        if rss is not None and rss > budget_mb * 1024 * 1024:
+            cls._hibernate_to_budget(editors, candidates, rss, budget_mb * 1024 * 1024)
+        return True
+
+    @staticmethod
+    def _hibernate_to_budget(editors, candidates, rss, budget):
+        """Hibernate enough of `candidates`, out of all windows' `editors`,
+        to bring `rss` under `budget`."""
+        live = [e for e in editors if not e.is_hibernated()]
+        remaining = [e for e in candidates if e.can_hibernate()]
+        if not live or not remaining:
+            return
+        # Freed memory only shows once the web processes have exited, so
+        # the number to hibernate is estimated from what a tab costs on
+        # average rather than measured tab by tab.  A tab gives back its
+        # web process and nothing else: not this process, not WebKit's
+        # network process.  Failing a count of web processes, what the
+        # tree holds beyond this process is shared out among the tabs and
+        # the pooled spares.
+        web = web_process_rss()
+        if web:
+            per_tab = sum(web) / len(web)
+        else:
+            per_tab = (rss - own_rss()) / (len(live) + len(EditorPool.get()))
+        if per_tab <= 0:
+            return
+        count = min(len(remaining), int((rss - budget) // per_tab) + 1)
+        remaining.sort(key=lambda e: (e.open_file.is_modified, e.last_active))
+        for editor in remaining[:count]:
+            editor.hibernate()
+
     def _on_modified_changed(self, editor, modified):
         remote_path = editor.open_file.remote_path
         page = self._tabs.get(remote_path)
@@ -308,63 +481,12 @@ class EditorPanel(Gtk.Box):
             else:
                 page.set_title(filename)
 
-    def apply_syntax_scheme(self, scheme_id: str):
-        """Apply a style scheme to all open editor tabs."""
-        for i in range(self._tab_view.get_n_pages()):
-            page = self._tab_view.get_nth_page(i)
-            editor = page.get_child()
-            if isinstance(editor, MonacoEditor):
-                editor.apply_scheme(scheme_id)
-
-    def apply_font(self, font_family: str, font_size: int):
-        """Apply a font to all open editor tabs."""
-        for i in range(self._tab_view.get_n_pages()):
-            page = self._tab_view.get_nth_page(i)
-            editor = page.get_child()
-            if isinstance(editor, MonacoEditor):
-                editor.apply_font(font_family, font_size)
-
     def _on_editor_line_ending(self, editor, eol):
         """Forward line-ending detection to the window, but only for current tab."""
         page = self._tab_view.get_selected_page()
         if page and page.get_child() is editor:
             self.emit("line-ending-ready", eol)
 
-    def apply_indent(self, insert_spaces: bool, tab_size: int):
-        """Apply indent settings to all open editor tabs."""
-        for i in range(self._tab_view.get_n_pages()):
-            page = self._tab_view.get_nth_page(i)
-            editor = page.get_child()
-            if isinstance(editor, MonacoEditor):
-                editor.set_indent(insert_spaces, tab_size)
-
-    def apply_editor_settings(self, settings: dict):
-        """Apply global editor settings to all open tabs."""
-        # Build a single Monaco options dict to avoid multiple JS roundtrips
-        opts = {}
-        if "minimap" in settings:
-            opts["minimap"] = {"enabled": settings["minimap"]}
-        if "renderWhitespace" in settings:
-            opts["renderWhitespace"] = settings["renderWhitespace"]
-        if "stickyScroll" in settings:
-            opts["stickyScroll"] = {"enabled": settings["stickyScroll"]}
-        if "fontLigatures" in settings:
-            opts["fontLigatures"] = settings["fontLigatures"]
-        if "lineNumbers" in settings:
-            opts["lineNumbers"] = settings["lineNumbers"]
-        # Merge custom overrides on top
-        if "customOptions" in settings:
-            opts.update(settings["customOptions"])
-
-        if not opts:
-            return
-
-        for i in range(self._tab_view.get_n_pages()):
-            page = self._tab_view.get_nth_page(i)
-            editor = page.get_child()
-            if isinstance(editor, MonacoEditor):
-                editor.apply_custom_options(opts)
-
     def set_current_line_ending(self, eol: str):
         """Change the line ending of the currently active tab."""
         editor = self.get_current_editor()
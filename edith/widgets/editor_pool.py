@@ -0,0 +1,159 @@
+# SPDX-FileCopyrightText: 2025 Kreuder <mk@singular.de>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Editor WebViews loaded ahead of time, so a new tab doesn't wait for Monaco.
+
+Most of the delay between clicking a file and seeing it is not the
+download: it is starting a web process, loading editor.html, and parsing
+the Monaco AMD bundle before bridge.js reports "ready".  None of that
+depends on the file, so a couple of WebViews are put through it in the
+background, and a new MonacoEditor takes one that is already waiting
+instead of starting from nothing.
+
+The pool fills shortly after startup and refills a moment after each
+take, so that building the next spare doesn't compete with painting the
+tab that just took one.  Config key editor_webview_pool sets how many
+spares are kept (0 turns the pool off); each is a web process of its own.
+"""
+
+import json
+import logging
+from pathlib import Path
+
+import gi
+
+gi.require_version("WebKit", "6.0")
+
+from gi.repository import GLib, WebKit
+
+from edith.services.config import ConfigService
+
+log = logging.getLogger(__name__)
+
+_POOL_SIZE = 2
+# Delay before building a spare: after startup, after a take, and between
+# spares, so the main loop is never busy with more than one at a time.
+_REFILL_DELAY_MS = 1500
+
+_EDITOR_HTML = Path(__file__).parent.parent / "data" / "monaco" / "editor.html"
+
+
+def create_webview() -> WebKit.WebView:
+    """A WebView set up for the editor page, with the "edith" message
+    handler registered but nothing loaded yet."""
+    webview = WebKit.WebView()
+    webview.set_vexpand(True)
+    webview.set_hexpand(True)
+
+    settings = webview.get_settings()
+    settings.set_allow_file_access_from_file_urls(True)
+    settings.set_allow_universal_access_from_file_urls(True)
+    settings.set_javascript_can_access_clipboard(True)
+    # Some GPU driver / WebKit combinations trigger a Skia bug where
+    # GrResourceCache corrupts texture state → SIGILL crash.  Default to
+    # hardware-accelerated rendering (much faster); users who hit the crash
+    # can set editor_hardware_acceleration to false in config.
+    if not ConfigService.get_preference("editor_hardware_acceleration", True):
+        settings.set_hardware_acceleration_policy(
+            WebKit.HardwareAccelerationPolicy.NEVER
+        )
+
+    webview.get_user_content_manager().register_script_message_handler("edith")
+    return webview
+
+
+def load_editor(webview: WebKit.WebView):
+    webview.load_uri(_EDITOR_HTML.as_uri())
+
+
+class _Spare:
+    """A pooled WebView and whether its page has reported "ready"."""
+
+    def __init__(self, webview):
+        self.webview = webview
+        self.ready = False
+        self.handlers = []
+
+
+class EditorPool:
+    """Spare editor WebViews, shared by every window of the process."""
+
+    _instance = None
+
+    @classmethod
+    def get(cls) -> "EditorPool":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self._spares = []
+        self._refill_id = None
+
+    def __len__(self) -> int:
+        """Spares waiting, ready or not; each holds a web process."""
+        return len(self._spares)
+
+    @staticmethod
+    def _target() -> int:
+        try:
+            return max(0, int(ConfigService.get_preference("editor_webview_pool", _POOL_SIZE)))
+        except (TypeError, ValueError):
+            return _POOL_SIZE
+
+    def prefill(self):
+        """Start building spares in the background."""
+        self._schedule_refill()
+
+    def take(self):
+        """(webview, ready) for a spare, or None if there is none.
+
+        A spare that has finished loading is preferred; one still loading
+        is handed over as is, and its "ready" arrives at the new owner.
+        """
+        if not self._spares:
+            self._schedule_refill()
+            return None
+        spare = next((s for s in self._spares if s.ready), self._spares[0])
+        self._spares.remove(spare)
+        for obj, handler_id in spare.handlers:
+            obj.disconnect(handler_id)
+        self._schedule_refill()
+        return spare.webview, spare.ready
+
+    def _schedule_refill(self):
+        if self._refill_id is None and len(self._spares) < self._target():
+            self._refill_id = GLib.timeout_add(_REFILL_DELAY_MS, self._refill)
+
+    def _refill(self):
+        self._refill_id = None
+        if len(self._spares) >= self._target():
+            return GLib.SOURCE_REMOVE
+
+        spare = _Spare(create_webview())
+        ucm = spare.webview.get_user_content_manager()
+        spare.handlers = [
+            (ucm, ucm.connect("script-message-received::edith", self._on_message, spare)),
+            (spare.webview, spare.webview.connect(
+                "web-process-terminated", self._on_terminated, spare)),
+        ]
+        self._spares.append(spare)
+        load_editor(spare.webview)
+        self._schedule_refill()
+        return GLib.SOURCE_REMOVE
+
+    def _on_message(self, ucm, js_result, spare):
+        try:
+            msg = json.loads(js_result.to_string())
+        except ValueError:
+            return
+        if msg.get("type") == "ready":
+            spare.ready = True
+
+    def _on_terminated(self, webview, reason, spare):
+        log.warning("spare editor web process terminated (%s)", reason)
+        if spare in self._spares:
+            self._spares.remove(spare)
+            for obj, handler_id in spare.handlers:
+                obj.disconnect(handler_id)
+        self._schedule_refill()
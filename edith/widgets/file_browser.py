@@ -12,7 +12,7 @@ gi.require_version("Adw", "1")
 from gi.repository import Adw, Gio, GLib, Gtk, GObject, Gdk, Pango
 
 from edith.models.remote_file import RemoteFileInfo, RemoteFileItem
-from edith.services.config import ConfigService
+from edith.services.preferences import Preferences, current as current_preferences
 # Imported at module scope, not lazily inside the handlers: a drag or drop must
 # never be the thing that triggers a first-time import (see build-aux/
 # compile-bytecode.py — an uncached import here stalls the UI for seconds).
@@ -54,8 +54,7 @@ def _decode_drag_payload(value):
 
 
 def _get_tools_dir() -> Path:
-    from edith.services.config import ConfigService
-    custom = ConfigService.get_preference("tools_folder")
+    custom = current_preferences().get("tools_folder")
     if custom:
         return Path(custom)
     return DEFAULT_TOOLS_DIR
@@ -83,6 +82,9 @@ class FileBrowser(Gtk.Box):
         self._items: list[RemoteFileItem] = []
         self._context_item: RemoteFileItem | None = None
         self._cur_dir_writable: bool = False
+        self._dir_mtime = None  # of the directory shown, when it was listed
+        self._dir_check_in_flight = False
+        self._listing_task = None  # the listing in flight (async_worker.Task)
 
         # ── Path bar ────────────────────────────────────────────────────
         self._path_bar = Gtk.Box(
@@ -173,7 +175,7 @@ class FileBrowser(Gtk.Box):
 
         # Column view — created before its sorter is retrieved
         self._column_view = Gtk.ColumnView(
-            single_click_activate=ConfigService.get_preference("single_click_open", False),
+            single_click_activate=current_preferences().single_click_open,
             show_row_separators=False,
             show_column_separators=False,
             css_classes=["file-list", "data-table"],
@@ -181,6 +183,7 @@ class FileBrowser(Gtk.Box):
             hexpand=True,
         )
         self._column_view.connect("activate", self._on_cv_activated)
+        Preferences.get().watch(self, self._on_navigation_preference, "single_click_open")
 
         # Use the ColumnView's own sorter directly so column-header clicks work.
         # Dirs-first is baked into each column's custom sorter (see _setup_columns).
@@ -197,11 +200,11 @@ class FileBrowser(Gtk.Box):
         self._setup_columns()
 
         # ── Stack: column view ↔ status label ───────────────────────────
-        sw = Gtk.ScrolledWindow(vexpand=True, hscrollbar_policy=Gtk.PolicyType.AUTOMATIC)
-        sw.set_child(self._column_view)
+        self._scrolled = Gtk.ScrolledWindow(vexpand=True, hscrollbar_policy=Gtk.PolicyType.AUTOMATIC)
+        self._scrolled.set_child(self._column_view)
 
         self._stack = Gtk.Stack(vexpand=True)
-        self._stack.add_named(sw, "list")
+        self._stack.add_named(self._scrolled, "list")
 
         self._status_label = Gtk.Label(
             label="",
@@ -908,6 +911,7 @@ class FileBrowser(Gtk.Box):
             lambda: client.create_file(full_path),
             lambda _: self.load_directory(self._current_path),
             lambda e: self._show_op_error(str(e)),
+            key=client,
         )
 
     def _on_new_folder(self, action, param):
@@ -926,6 +930,7 @@ class FileBrowser(Gtk.Box):
             lambda: client.mkdir(full_path),
             lambda _: self.load_directory(self._current_path),
             lambda e: self._show_op_error(str(e)),
+            key=client,
         )
 
     def _on_rename(self, action, param):
@@ -948,25 +953,39 @@ class FileBrowser(Gtk.Box):
             lambda: client.rename(old_path, new_path),
             lambda _: self.load_directory(self._current_path),
             lambda e: self._show_op_error(str(e)),
+            key=client,
         )
 
     def _on_chmod(self, action, param):
-        fi = self._get_context_file_info()
-        if not fi:
+        infos = self._get_context_file_infos()
+        if not infos:
             return
-        dialog = ChmodDialog(fi.permissions)
-        dialog.connect("applied", self._do_chmod, fi)
+        dialog = ChmodDialog(infos[0].permissions,
+                             offer_recursive=any(fi.is_dir for fi in infos))
+        dialog.connect("applied", self._do_chmod_many, infos)
         dialog.present(self.get_root())
 
     def _do_chmod(self, dialog, mode, fi):
+        self._do_chmod_many(dialog, mode, [fi])
+
+    def _do_chmod_many(self, dialog, mode, infos):
         if not self._window or not self._window.sftp_client:
             return
         client = self._window.sftp_client
+        items = [(fi.path, fi.is_dir) for fi in infos]
+        recursive = isinstance(dialog, ChmodDialog) and dialog.recursive
+        n = len(items)
         from edith.services.async_worker import run_async
         run_async(
-            lambda: client.chmod(fi.path, mode),
-            lambda _: self.load_directory(self._current_path),
+            lambda: client.chmod_many(items, mode, recursive=recursive),
+            lambda failures: self._show_batch_result(
+                failures,
+                ngettext("Changed permissions of {n} item",
+                         "Changed permissions of {n} items", n).format(n=n)
+                if n > 1 else None,
+            ),
             lambda e: self._show_op_error(str(e)),
+            key=client,
         )
 
     def _on_info(self, action, param):
@@ -1021,17 +1040,12 @@ class FileBrowser(Gtk.Box):
         name = fi.name
         from edith.services.async_worker import run_async
 
-        def on_deleted(_result):
-            self.load_directory(self._current_path)
-            if self._window:
-                self._window.show_toast(_("Deleted \u201c{name}\u201d").format(name=name), "success")
+        def on_deleted(failures):
+            self._show_batch_result(
+                failures, _("Deleted \u201c{name}\u201d").format(name=name))
 
-        if fi.is_dir:
-            run_async(lambda: client.rmdir_recursive(fi.path), on_deleted,
-                      lambda e: self._show_op_error(str(e)))
-        else:
-            run_async(lambda: client.remove(fi.path), on_deleted,
-                      lambda e: self._show_op_error(str(e)))
+        run_async(lambda: client.remove_many([(fi.path, fi.is_dir)]), on_deleted,
+                  lambda e: self._show_op_error(str(e)), key=client)
 
     def _on_duplicate(self, action, param):
         infos = self._get_context_file_infos()
@@ -1063,7 +1077,7 @@ class FileBrowser(Gtk.Box):
 
         run_async(do_dups,
                   lambda _: self.load_directory(self._current_path),
-                  lambda e: self._show_op_error(str(e)))
+                  lambda e: self._show_op_error(str(e)), key=client)
 
     def _on_copy_path(self, action, param):
         infos = self._get_context_file_infos()
@@ -1112,7 +1126,7 @@ class FileBrowser(Gtk.Box):
                 self._window.show_toast(_("Moved \u201c{name}\u201d to \u201c{dest}\u201d").format(name=name, dest=dest_name), "success")
 
         run_async(lambda: client.rename(src, dst), on_moved,
-                  lambda e: self._show_op_error(str(e)))
+                  lambda e: self._show_op_error(str(e)), key=client)
 
     def _on_copy_to(self, action, param):
         infos = self._get_context_file_infos()
@@ -1149,11 +1163,11 @@ class FileBrowser(Gtk.Box):
         if fi.is_dir:
             run_async(lambda: client.copy_remote_recursive(src, dst),
                       lambda _: self.load_directory(self._current_path),
-                      lambda e: self._show_op_error(str(e)))
+                      lambda e: self._show_op_error(str(e)), key=client)
         else:
             run_async(lambda: client.copy_remote(src, dst),
                       lambda _: self.load_directory(self._current_path),
-                      lambda e: self._show_op_error(str(e)))
+                      lambda e: self._show_op_error(str(e)), key=client)
 
     def _on_pin(self, action, param):
         fi = self._get_context_file_info()
@@ -1311,6 +1325,10 @@ class FileBrowser(Gtk.Box):
     def can_go_forward(self) -> bool:
         return self._history_pos < len(self._history) - 1
 
+    @property
+    def current_path(self) -> str:
+        return self._current_path
+
     def go_back(self):
         if self.can_go_back:
             self._history_pos -= 1
@@ -1384,8 +1402,28 @@ class FileBrowser(Gtk.Box):
         self._spinner.set_visible(True)
         self._spinner.set_spinning(True)
 
+        def on_success(files):
+            self._spinner.set_visible(False)
+            self._spinner.set_spinning(False)
+            self._populate(files)
+
+        def on_error(error):
+            self._spinner.set_visible(False)
+            self._spinner.set_spinning(False)
+            self._show_listing_error(str(error))
+
+        self._list_directory(path, on_success, on_error)
+
+    def _list_directory(self, path: str, on_success, on_error):
+        """List `path` on a worker; on_success gets the sorted entries.
+
+        Only the latest listing reports back: one still in flight is
+        cancelled, so a directory navigated away from never replaces the
+        one navigated to.
+        """
+        if self._listing_task:
+            self._listing_task.cancel()
         client = self._window.sftp_client
-        from edith.services.async_worker import run_async
         show_hidden = self._show_hidden
 
         def do_list():
@@ -1398,26 +1436,27 @@ class FileBrowser(Gtk.Box):
             files.sort(key=lambda f: (not f.is_dir, f.name.lower()))
             # Check if current directory is writable (for archive feature)
             dir_writable = False
+            dir_mtime = None
             try:
                 st = client.stat(path)
                 dir_writable = bool(st.st_mode & 0o222)
+                dir_mtime = st.st_mtime
             except OSError:
                 pass
-            return files, dir_writable
+            return files, dir_writable, dir_mtime
 
-        def on_success(result):
-            files, dir_writable = result
+        def on_listed(result):
+            self._listing_task = None
+            files, dir_writable, dir_mtime = result
             self._cur_dir_writable = dir_writable
-            self._spinner.set_visible(False)
-            self._spinner.set_spinning(False)
-            self._populate(files)
+            self._dir_mtime = dir_mtime
+            on_success(files)
 
-        def on_error(error):
-            self._spinner.set_visible(False)
-            self._spinner.set_spinning(False)
-            self._show_listing_error(str(error))
+        def on_failed(error):
+            self._listing_task = None
+            on_error(error)
 
-        run_async(do_list, on_success, on_error)
+        self._listing_task = _run_async(do_list, on_listed, on_failed, key=client)
 
     def _populate(self, files: list[RemoteFileInfo]):
         self._items.clear()
@@ -1462,6 +1501,28 @@ class FileBrowser(Gtk.Box):
         self._status_label.add_css_class("error")
         self._stack.set_visible_child_name("status")
 
+    def _show_batch_result(self, failures, done_message):
+        """Reload and report a batch operation: `done_message` (if any) when
+        every item went through, otherwise what failed and why."""
+        self.load_directory(self._current_path)
+        if not self._window:
+            return
+        if not failures:
+            if done_message:
+                self._window.show_toast(done_message, "success")
+            return
+        path, error = failures[0]
+        name = path.rstrip("/").rsplit("/", 1)[-1]
+        if len(failures) == 1:
+            message = _("Failed on \u201c{name}\u201d: {error}").format(name=name, error=error)
+        else:
+            n = len(failures)
+            message = ngettext(
+                "{n} item failed, first \u201c{name}\u201d: {error}",
+                "{n} items failed, first \u201c{name}\u201d: {error}", n,
+            ).format(n=n, name=name, error=error)
+        self._window.show_toast(message, "error", timeout=5)
+
     def _show_op_error(self, message: str):
         if self._window:
             self._window.show_toast(_("Error: {message}").format(message=message), "error")
@@ -1469,15 +1530,111 @@ class FileBrowser(Gtk.Box):
             self._show_listing_error(message)
 
     def refresh_path(self, path: str):
-        """Reload the listing if `path` is the directory currently shown."""
+        """Bring the listing up to date if `path` is the directory currently
+        shown, keeping selection and scroll position (see update_listing)."""
         if path and path == self._current_path:
-            self.load_directory(self._current_path, add_to_history=False)
+            self.update_listing()
 
-    def apply_navigation_settings(self):
-        """Re-read the single/double click preference and apply it live."""
-        self._column_view.set_single_click_activate(
-            ConfigService.get_preference("single_click_open", False)
-        )
+    def update_listing(self):
+        """List the directory shown again and apply only what changed.
+
+        A file written by a deploy or another user shows up without the
+        list being rebuilt under the user: rows that didn't change stay
+        the same objects, so selection, focus and scroll position stay
+        where they were.
+        """
+        if not self._window or not self._window.sftp_client:
+            return
+        # A listing already on its way is at least as fresh.
+        if self._listing_task:
+            return
+
+        def on_success(files):
+            self._apply_listing(files)
+
+        def on_error(error):
+            self._show_listing_error(str(error))
+
+        self._list_directory(self._current_path, on_success, on_error)
+
+    def poll_directory(self, on_done=None):
+        """Update the listing if the directory's mtime moved since it was
+        listed: one stat when nothing happened.
+
+        Creating, deleting or renaming an entry moves a directory's mtime;
+        rewriting a file inside it does not, so sizes and dates of files
+        changed in place wait for the next update.  on_done(changed) is
+        called when the check is done.
+        """
+        if (not self._window or not self._window.sftp_client
+                or self._dir_check_in_flight or self._dir_mtime is None):
+            return
+        client = self._window.sftp_client
+        path, known = self._current_path, self._dir_mtime
+        self._dir_check_in_flight = True
+
+        def on_success(mtime):
+            self._dir_check_in_flight = False
+            changed = path == self._current_path and mtime != known
+            if changed:
+                self.update_listing()
+            if on_done:
+                on_done(changed)
+
+        def on_error(_error):
+            self._dir_check_in_flight = False
+            if on_done:
+                on_done(False)
+
+        _run_async(lambda: client.stat(path).st_mtime, on_success, on_error, key=client)
+
+    def _apply_listing(self, files: list[RemoteFileInfo]):
+        """Turn the store into `files` with as few changes as it takes."""
+        if self._stack.get_visible_child_name() != "list" or not files:
+            # Nothing shown worth keeping (an error, "Empty directory").
+            self._populate(files)
+            return
+
+        bitset = self._selection.get_selection()
+        selected = {self._filter_model.get_item(bitset.get_nth(i)).file_info.name
+                    for i in range(bitset.get_size())}
+        vadjustment = self._scrolled.get_vadjustment()
+        scroll = vadjustment.get_value()
+
+        new = {fi.name: fi for fi in files}
+        changed = False
+        for i in range(self._store.get_n_items() - 1, -1, -1):
+            item = self._store.get_item(i)
+            if item.file_info.is_parent_dir:
+                continue
+            fi = new.pop(item.file_info.name, None)
+            if fi is None:
+                self._store.remove(i)
+                changed = True
+            elif fi != item.file_info:
+                self._store.splice(i, 1, [RemoteFileItem(fi)])
+                changed = True
+        added = [RemoteFileItem(fi) for fi in files if fi.name in new]
+        if added:
+            self._store.splice(self._store.get_n_items(), 0, added)
+            changed = True
+        if not changed:
+            return
+
+        self._items = [self._store.get_item(i) for i in range(self._store.get_n_items())
+                       if not self._store.get_item(i).file_info.is_parent_dir]
+        if self._context_item is not None and self._context_item not in self._items:
+            self._context_item = None
+        # Replaced rows come back unselected; select them again by name.
+        if selected:
+            for i in range(self._filter_model.get_n_items()):
+                item = self._filter_model.get_item(i)
+                if item.file_info.name in selected and not self._selection.is_selected(i):
+                    self._selection.select_item(i, False)
+        vadjustment.set_value(scroll)
+
+    def _on_navigation_preference(self, key):
+        self._column_view.set_single_click_activate(current_preferences().single_click_open)
 
     def _on_cv_activated(self, column_view, position):
         item = self._filter_model.get_item(position)
@@ -1546,19 +1703,12 @@ class FileBrowser(Gtk.Box):
         items = [(fi.path, fi.is_dir) for fi in infos]
         n = len(items)
 
-        def do_delete():
-            for path, is_dir in items:
-                if is_dir:
-                    client.rmdir_recursive(path)
-                else:
-                    client.remove(path)
+        def on_bulk_deleted(failures):
+            self._show_batch_result(
+                failures, ngettext("Deleted {n} item", "Deleted {n} items", n).format(n=n))
 
-        def on_bulk_deleted(_):
-            self.load_directory(self._current_path)
-            if self._window:
-                self._window.show_toast(ngettext("Deleted {n} item", "Deleted {n} items", n).format(n=n), "success")
-
-        run_async(do_delete, on_bulk_deleted, lambda e: self._show_op_error(str(e)))
+        run_async(lambda: client.remove_many(items), on_bulk_deleted,
+                  lambda e: self._show_op_error(str(e)), key=client)
 
     def _do_bulk_move_to(self, dialog, dest_dir, infos):
         if not self._window or not self._window.sftp_client:
@@ -1569,19 +1719,14 @@ class FileBrowser(Gtk.Box):
         n = len(moves)
         dest_label = dest_dir.rstrip("/").rsplit("/", 1)[-1] or dest_dir
 
-        def do_moves():
-            for src, dst in moves:
-                if src != dst:
-                    client.rename(src, dst)
-
-        def on_bulk_moved(_):
-            self.load_directory(self._current_path)
-            if self._window:
-                self._window.show_toast(
-                    f"Moved {n} item{'s' if n != 1 else ''} to \u201c{dest_label}\u201d", "success"
-                )
+        def on_bulk_moved(failures):
+            self._show_batch_result(
+                failures,
+                f"Moved {n} item{'s' if n != 1 else ''} to \u201c{dest_label}\u201d",
+            )
 
-        run_async(do_moves, on_bulk_moved, lambda e: self._show_op_error(str(e)))
+        run_async(lambda: client.rename_many(moves), on_bulk_moved,
+                  lambda e: self._show_op_error(str(e)), key=client)
 
     def _on_bulk_download_folder(self, dialog, result, infos):
         try:
@@ -1619,7 +1764,7 @@ class FileBrowser(Gtk.Box):
                     f"Copied {n} item{'s' if n != 1 else ''} to \u201c{dest_label}\u201d", "success"
                 )
 
-        run_async(do_copies, on_bulk_copied, lambda e: self._show_op_error(str(e)))
+        run_async(do_copies, on_bulk_copied, lambda e: self._show_op_error(str(e)), key=client)
 
     # ──────────────────────────────────────────────────────────────────────
     # Upload Tool
@@ -1695,7 +1840,7 @@ class FileBrowser(Gtk.Box):
             if conflict_paths:
                 self._ask_overwrite(conflict_paths, existing, dest_dir)
 
-        run_async(check_conflicts, on_checked, lambda e: self._show_op_error(str(e)))
+        run_async(check_conflicts, on_checked, lambda e: self._show_op_error(str(e)), key=client)
 
     def _ask_overwrite(self, conflict_paths, existing_names, dest_dir):
         n = len(existing_names)
@@ -1859,7 +2004,7 @@ class FileBrowser(Gtk.Box):
             launcher = Gtk.FileLauncher.new(Gio.File.new_for_path(local_path))
             launcher.launch(self.get_root(), None, self._on_launch_finish)
 
-        run_async(do_download, on_done, lambda e: self._show_op_error(str(e)))
+        run_async(do_download, on_done, lambda e: self._show_op_error(str(e)), key=client)
 
     def _on_launch_finish(self, launcher, result):
         try:
@@ -2020,7 +2165,7 @@ class FileBrowser(Gtk.Box):
                 self._run_moves(free, dest_stripped, dest_label, overwrite=False)
             self._ask_move_overwrite(clashing, existing, dest_stripped, dest_label)
 
-        _run_async(check_conflicts, on_checked, lambda e: self._show_op_error(str(e)))
+        _run_async(check_conflicts, on_checked, lambda e: self._show_op_error(str(e)), key=client)
 
     def _ask_move_overwrite(self, clashing, existing_names, dest_stripped, dest_label):
         n = len(existing_names)
@@ -2059,33 +2204,21 @@ class FileBrowser(Gtk.Box):
     def _run_moves(self, valid, dest_stripped, dest_label, overwrite=False):
         client = self._window.sftp_client
 
-        def do_moves():
-            for sp in valid:
-                name = sp.rstrip("/").rsplit("/", 1)[-1]
-                target = f"{dest_stripped}/{name}"
-                if overwrite:
-                    # rename() fails outright if the target exists, so the old
-                    # entry has to go first.
-                    try:
-                        if client.is_dir(target):
-                            client.rmdir_recursive(target)
-                        else:
-                            client.remove(target)
-                    except OSError:
-                        pass
-                client.rename(sp, target)
+        # With overwrite, rename_many() clears each occupied target first;
+        # SFTP rename fails outright if the target exists.
+        moves = [(sp, f"{dest_stripped}/{sp.rstrip('/').rsplit('/', 1)[-1]}") for sp in valid]
 
         n = len(valid)
-        def on_done(_result):
-            self.load_directory(self._current_path)
-            if self._window:
-                if n == 1:
-                    name = valid[0].rstrip("/").rsplit("/", 1)[-1]
-                    self._window.show_toast(_("Moved \u201c{name}\u201d to \u201c{dest}\u201d").format(name=name, dest=dest_label), "success")
-                else:
-                    self._window.show_toast(ngettext("Moved {n} item to \u201c{dest}\u201d", "Moved {n} items to \u201c{dest}\u201d", n).format(n=n, dest=dest_label), "success")
+        def on_done(failures):
+            if n == 1:
+                name = valid[0].rstrip("/").rsplit("/", 1)[-1]
+                done = _("Moved \u201c{name}\u201d to \u201c{dest}\u201d").format(name=name, dest=dest_label)
+            else:
+                done = ngettext("Moved {n} item to \u201c{dest}\u201d", "Moved {n} items to \u201c{dest}\u201d", n).format(n=n, dest=dest_label)
+            self._show_batch_result(failures, done)
 
-        _run_async(do_moves, on_done, lambda e: self._show_op_error(str(e)))
+        _run_async(lambda: client.rename_many(moves, overwrite=overwrite), on_done,
+                   lambda e: self._show_op_error(str(e)), key=client)
 
     def _perform_cross_server_drop(self, source_win, src_paths, dest_stripped):
         """Copy files between two different servers.
@@ -2158,7 +2291,7 @@ class FileBrowser(Gtk.Box):
                     clashing, existing, dest_label, transfer
                 )
 
-        _run_async(check_conflicts, on_checked, lambda e: self._show_op_error(str(e)))
+        _run_async(check_conflicts, on_checked, lambda e: self._show_op_error(str(e)), key=dst_client)
 
     def _ask_cross_server_overwrite(self, clashing, existing_names, dest_label, transfer):
         n = len(existing_names)
@@ -162,16 +162,23 @@ class ChmodDialog(Adw.Dialog):
         "applied": (GObject.SignalFlags.RUN_FIRST, None, (int,)),
     }
 
-    def __init__(self, current_mode: int):
+    def __init__(self, current_mode: int, offer_recursive: bool = False):
         super().__init__(
-            title=_("Change Permissions"), content_width=360, content_height=340
+            title=_("Change Permissions"), content_width=360,
+            content_height=380 if offer_recursive else 340,
         )
 
         self._mode = current_mode & 0o777
         self._checks = {}
-        self._build_ui()
+        self._recursive_check = None
+        self._build_ui(offer_recursive)
 
-    def _build_ui(self):
+    @property
+    def recursive(self) -> bool:
+        """Whether the mode should also go to everything inside folders."""
+        return self._recursive_check is not None and self._recursive_check.get_active()
+
+    def _build_ui(self, offer_recursive: bool):
         toolbar_view = Adw.ToolbarView()
 
         header = Adw.HeaderBar(
@@ -236,6 +243,13 @@ class ChmodDialog(Adw.Dialog):
         )
         box.append(self._octal_label)
 
+        if offer_recursive:
+            self._recursive_check = Gtk.CheckButton(
+                label=_("Apply to enclosed files and folders"),
+                halign=Gtk.Align.CENTER,
+            )
+            box.append(self._recursive_check)
+
         clamp.set_child(box)
         toolbar_view.set_content(clamp)
         self.set_child(toolbar_view)
@@ -9,13 +9,19 @@ gi.require_version("Adw", "1")
 from gi.repository import Gtk
 
 from edith.models.server import FolderInfo
+from edith.models.server_store import GroupItem
 from edith.i18n import _
 
 
 class FolderRow(Gtk.Box):
-    """A folder/group nav row in the server sidebar."""
+    """A folder/group nav row in the server sidebar.
 
-    def __init__(self, folder_info: FolderInfo):
+    Also shows the All Servers and Without Group rows (folder_info None),
+    and is reused for any of them by the sidebar's list view; see
+    show_group().
+    """
+
+    def __init__(self, folder_info: FolderInfo | None = None):
         super().__init__(
             orientation=Gtk.Orientation.HORIZONTAL,
             spacing=8,
@@ -32,7 +38,7 @@ class FolderRow(Gtk.Box):
 
         # Name label
         self._name_label = Gtk.Label(
-            label=folder_info.name,
+            label=folder_info.name if folder_info else "",
             xalign=0,
             hexpand=True,
             css_classes=["heading"],
@@ -50,6 +56,13 @@ class FolderRow(Gtk.Box):
     def set_count(self, n: int):
         self._count_label.set_label(str(n))
 
+    def show_group(self, item: GroupItem):
+        """Show the sidebar row of `item`."""
+        self.folder_info = item.folder_info
+        self._folder_icon.set_from_icon_name(item.icon_name)
+        self._name_label.set_label(item.title)
+        self.set_count(item.count)
+
     def update_name(self, name: str):
         self.folder_info.name = name
         self._name_label.set_label(name)
@@ -1,42 +1,136 @@
 # SPDX-FileCopyrightText: 2025 Kreuder <mk@singular.de>
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import contextlib
 import gi
 import json
 import logging
+import os
+import time
 
 gi.require_version("Gtk", "4.0")
-gi.require_version("WebKit", "6.0")
 
-from pathlib import Path
-
-from gi.repository import Adw, Gtk, GObject, WebKit
+from gi.repository import Adw, GLib, Gtk, GObject
 
 from edith.models.open_file import OpenFile
 from edith.monaco_languages import EXT_TO_MONACO, get_language_name
-from edith.services.config import ConfigService
+from edith.services.async_worker import run_async
+from edith.services.edit_journal import EditJournal, write_atomic
+from edith.services.preferences import Preferences, current as current_preferences
+from edith.widgets.editor_pool import EditorPool, create_webview, load_editor
+from edith.services.freeze_watchdog import record
 from edith.i18n import _
 
 log = logging.getLogger(__name__)
 
 
+class _BridgeTraffic:
+    """Messages across the JS bridge per second, for all editors together.
+
+    Counted both ways and at two levels: updates (each cursor move, each
+    setter call) and the crossings they were batched into (a postMessage
+    decoded here, an evaluate_javascript call).  The difference between the
+    two is what batching saves.  Each second with traffic is logged at
+    debug level; one past _FLOOD_PER_S updates goes to the diagnostic log,
+    since a main loop handling that many is a main loop about to stutter.
+    """
+
+    _FLOOD_PER_S = 500
+
+    def __init__(self):
+        self._second = int(time.monotonic())
+        self._counts = [0, 0, 0, 0]
+        # The last complete second with traffic.
+        self.last = {}
+
+    def count(self, to_python: bool, updates: int, crossings: int = 1):
+        now = int(time.monotonic())
+        if now != self._second:
+            self._roll()
+            self._second = now
+        offset = 0 if to_python else 2
+        self._counts[offset] += updates
+        self._counts[offset + 1] += crossings
+
+    def _roll(self):
+        if not any(self._counts):
+            return
+        js_updates, js_posts, py_updates, py_calls = self._counts
+        self._counts = [0, 0, 0, 0]
+        self.last = {
+            "js_updates": js_updates, "js_posts": js_posts,
+            "py_updates": py_updates, "py_calls": py_calls,
+        }
+        summary = (f"js->py {js_updates} updates in {js_posts} messages, "
+                   f"py->js {py_updates} updates in {py_calls} calls")
+        log.debug("bridge traffic/s: %s", summary)
+        if js_updates + py_updates > self._FLOOD_PER_S:
+            record(f"bridge traffic above {self._FLOOD_PER_S}/s: {summary}")
+
+
+_traffic = _BridgeTraffic()
+
+
 class MonacoEditor(Gtk.Box):
     """Single editor tab backed by Monaco running in a WebKitGTK WebView."""
 
+    # Files from this size up (in MiB; config key editor_large_file_mb) open
+    # in large-file mode: streamed into the editor in pieces with the
+    # expensive features off, and read-only if editor_large_file_read_only
+    # is set.  Below it, the whole file goes over in the init() call.
+    _LARGE_FILE_MB = 8
+    # Characters per piece.  Big enough that the per-call overhead doesn't
+    # dominate, small enough that no single script stalls the web process.
+    _LARGE_FILE_CHUNK = 1 << 20
+    # Lines kept while following a remote log (config key
+    # log_follow_max_lines, 0 for no limit); older ones are dropped as new
+    # ones arrive, so a tab left following overnight stays the same size.
+    _FOLLOW_MAX_LINES = 10000
+
+    # Messages that carry the whole buffer.  Decoding one costs as much as
+    # the buffer is big, so they are recognised by prefix (postMessage
+    # always puts "type" first) and parsed and written on a worker.
+    _BULK_MESSAGES = ('{"type":"save-content"', '{"type":"journal')
+    # Main-loop time for handing a save off above which it is written to
+    # the diagnostic log, next to the freeze dumps it would otherwise become.
+    _SAVE_MAIN_LOOP_WARN_MS = 50
+    # Setters where only the newest call counts: an earlier one still
+    # waiting to be sent is dropped when another comes, e.g. every step of
+    # dragging the font size in Preferences.  Not setCustomOptions, which
+    # only ever adds options, nor anything that edits the buffer.
+    _LATEST_WINS = (
+        "EdithBridge.setTheme(", "EdithBridge.setFont(", "EdithBridge.setIndent(",
+        "EdithBridge.setLanguage(", "EdithBridge.setMinimap(",
+        "EdithBridge.setRenderWhitespace(", "EdithBridge.setStickyScroll(",
+        "EdithBridge.setFontLigatures(", "EdithBridge.setLineNumbers(",
+    )
+
     __gsignals__ = {
         "modified-changed":    (GObject.SignalFlags.RUN_FIRST, None, (bool,)),
         "save-requested":      (GObject.SignalFlags.RUN_FIRST, None, ()),
         "line-ending-detected":(GObject.SignalFlags.RUN_FIRST, None, (str,)),
         "cursor-changed":      (GObject.SignalFlags.RUN_FIRST, None, (int, int)),
         "wrap-changed":        (GObject.SignalFlags.RUN_FIRST, None, (bool,)),
+        # Milliseconds from the tab opening to the file first on screen, and
+        # whether the WebView came from the pool.
+        "first-paint":         (GObject.SignalFlags.RUN_FIRST, None, (float, bool)),
+        # A preview tab's "Load Full File" button was pressed.
+        "load-full-requested": (GObject.SignalFlags.RUN_FIRST, None, ()),
     }
 
     def __init__(self, open_file: OpenFile):
         super().__init__(orientation=Gtk.Orientation.VERTICAL)
 
         self.open_file = open_file
+        self._opened_at = time.monotonic()
         self._ready = False
+        self._pooled = False
+        self._pooled_ready = False
         self._pending_js = []
+        # Calls for the editor gathered during one main-loop iteration and
+        # sent as one evaluate_javascript (see _eval_js).
+        self._js_batch = []
+        self._js_flush_id = None
         self._language_id = None
         self._line_ending = "lf"
         self._word_wrap = True
@@ -44,40 +138,92 @@ class MonacoEditor(Gtk.Box):
         self._cursor_col = 1
         self._pending_save_callback = None
         self._is_svg = open_file.filename.lower().endswith(".svg")
-        # Most recent unsaved editor text, refreshed by the JS side every ~2s
-        # while the buffer is dirty.  Used to rebuild the tab if the WebKit
-        # render process dies (which otherwise loses both edits and history).
-        self._content_snapshot = None
+        # Every change the editor makes, logged to disk so that unsaved text
+        # survives the WebKit render process dying (which otherwise loses
+        # both edits and history) or the app being killed.
+        self._journal = EditJournal(open_file.server_id, open_file.remote_path)
+        # Text the editor is being initialised with other than the local
+        # file, held until it has become the journal base.
+        self._journal_seed = None
+        # Saves and journal writes waiting for, or in, the file-writing
+        # worker.  One at a time and in arrival order, so the journal never
+        # sees a change before the save it came after.
+        self._io_queue = []
+        self._io_busy = False
+        self._save_requested_at = None
+        # Large-file mode: the open file being streamed, and when it started.
+        self._large_file = False
+        self._large_reader = None
+        self._large_started = 0.0
+        # Tailing the remote file (see begin_follow).
+        self._following = False
+        # Hibernation (see hibernate): no WebView while the tab sits unused.
+        self._hibernated = False
+        self._hibernating = False
+        self._waking = False
+        self._wake_js = []
+        self._view_state = None
+        self._webview_handlers = []
+        self._overlay = None
+        # When the tab was last the selected one, for picking what to
+        # hibernate.  None while it is selected.
+        self.last_active = time.monotonic()
+        # Unsaved text left by a killed session is only looked for once.
+        self._journal_checked = False
 
         self._build_ui()
         self._load_file_and_init()
+        if self._pooled_ready:
+            self._on_editor_ready()
+        # Settings changed in Preferences (or the status bar) arrive here
+        # directly; init() takes care of what was set before.
+        Preferences.get().watch(
+            self, self._on_preference_changed,
+            "syntax_scheme", "editor_font", "editor_font_size",
+            "editor_insert_spaces", "editor_tab_size", "editor_minimap",
+            "editor_render_whitespace", "editor_sticky_scroll",
+            "editor_font_ligatures", "editor_line_numbers", "editor_overrides",
+        )
 
     # ------------------------------------------------------------------ #
     #  UI                                                                  #
     # ------------------------------------------------------------------ #
 
     def _build_ui(self):
-        self._webview = WebKit.WebView()
-        self._webview.set_vexpand(True)
-        self._webview.set_hexpand(True)
-
-        settings = self._webview.get_settings()
-        settings.set_allow_file_access_from_file_urls(True)
-        settings.set_allow_universal_access_from_file_urls(True)
-        settings.set_javascript_can_access_clipboard(True)
-        # Some GPU driver / WebKit combinations trigger a Skia bug where
-        # GrResourceCache corrupts texture state → SIGILL crash.  Default to
-        # hardware-accelerated rendering (much faster); users who hit the crash
-        # can set editor_hardware_acceleration to false in config.
-        if not ConfigService.get_preference("editor_hardware_acceleration", True):
-            settings.set_hardware_acceleration_policy(
-                WebKit.HardwareAccelerationPolicy.NEVER
-            )
+        self._pooled_ready = self._create_webview()
+        self._peek_banner = None
+        if self.is_peek():
+            self._peek_banner = Adw.Banner(
+                button_label=_("Load Full File"), revealed=True)
+            self._peek_banner.connect(
+                "button-clicked", lambda _banner: self.emit("load-full-requested"))
+            self._update_peek_banner()
+            self.append(self._peek_banner)
+        if self._is_svg:
+            self._build_svg_split_ui()
+        else:
+            self.append(self._webview)
+
+    def _create_webview(self) -> bool:
+        """Set up self._webview; True if Monaco in it is already ready.
+
+        Takes a WebView that has already loaded Monaco if the pool has one;
+        its "ready" may have come and gone, in which case the caller
+        replays it once the init script is queued.
+        """
+        pooled = EditorPool.get().take()
+        if pooled is not None:
+            self._webview, ready = pooled
+            self._pooled = True
+        else:
+            self._webview, ready = create_webview(), False
 
         ucm = self._webview.get_user_content_manager()
-        ucm.register_script_message_handler("edith")
-        ucm.connect("script-message-received::edith", self._on_script_message)
-        self._webview.connect("web-process-terminated", self._on_web_process_terminated)
+        self._webview_handlers = [
+            (ucm, ucm.connect("script-message-received::edith", self._on_script_message)),
+            (self._webview, self._webview.connect(
+                "web-process-terminated", self._on_web_process_terminated)),
+        ]
 
         # Intercept dead-key events before GTK's IM can swallow them.
         # The grave/backtick key is mapped as dead_grave on many keyboard
@@ -87,13 +233,9 @@ class MonacoEditor(Gtk.Box):
         dead_key_ctrl.connect("key-pressed", self._on_webview_key_capture)
         self._webview.add_controller(dead_key_ctrl)
 
-        monaco_dir = Path(__file__).parent.parent / "data" / "monaco"
-        self._webview.load_uri((monaco_dir / "editor.html").as_uri())
-
-        if self._is_svg:
-            self._build_svg_split_ui()
-        else:
-            self.append(self._webview)
+        if pooled is None:
+            load_editor(self._webview)
+        return ready
 
     def _build_svg_split_ui(self):
         """For SVG files: editor + collapsible preview panel side by side."""
@@ -110,6 +252,7 @@ class MonacoEditor(Gtk.Box):
 
         overlay = Gtk.Overlay()
         overlay.set_child(self._webview)
+        self._overlay = overlay
         overlay.add_overlay(self._preview_btn)
         overlay.set_vexpand(True)
         overlay.set_hexpand(True)
@@ -198,33 +341,110 @@ class MonacoEditor(Gtk.Box):
         return False
 
     def _eval_js(self, script):
+        if self._hibernated:
+            # Nothing to run it in.  Settings are applied afresh on wake;
+            # anything that has to happen to the buffer wakes it first.
+            return
+        _traffic.count(False, 1, 0)
+        if self._waking:
+            # Runs after the init script, which isn't queued yet.
+            self._queue_js(self._wake_js, script)
+            return
         if not self._ready:
-            self._pending_js.append(script)
+            self._queue_js(self._pending_js, script)
             return
+        # Each evaluate_javascript is a round trip to the web process, and
+        # a preferences change or a status refresh makes several calls in a
+        # row; they are sent together at the end of the main-loop iteration.
+        self._queue_js(self._js_batch, script)
+        if self._js_flush_id is None:
+            self._js_flush_id = GLib.idle_add(
+                self._on_js_idle, priority=GLib.PRIORITY_HIGH_IDLE)
+
+    def _queue_js(self, queue, script):
+        if script.startswith(self._LATEST_WINS):
+            prefix = script[:script.index("(") + 1]
+            queue[:] = [s for s in queue if not s.startswith(prefix)]
+        queue.append(script)
+
+    def _on_js_idle(self):
+        self._js_flush_id = None
+        self._flush_js()
+        return GLib.SOURCE_REMOVE
+
+    def _flush_js(self):
+        """Send the batched calls now, e.g. before a call made directly on
+        the WebView that must not overtake them."""
+        if self._js_flush_id is not None:
+            GLib.source_remove(self._js_flush_id)
+            self._js_flush_id = None
+        batch, self._js_batch = self._js_batch, []
+        if not batch or self._webview is None:
+            return
+        if len(batch) == 1:
+            script = batch[0]
+        else:
+            # Each on its own, as separate calls would be: one that throws
+            # doesn't stop the rest.
+            script = "\n".join(
+                f"try {{ {s}; }} catch (e) {{ console.error(e); }}" for s in batch)
+        _traffic.count(False, 0, 1)
         self._webview.evaluate_javascript(script, -1, None, None, None, None, None)
 
+    def _drop_js(self):
+        """Forget every call not yet sent; the page they were for is gone."""
+        self._pending_js = []
+        self._js_batch = []
+        if self._js_flush_id is not None:
+            GLib.source_remove(self._js_flush_id)
+            self._js_flush_id = None
+
     def _on_script_message(self, ucm, js_result):
+        # Before to_string(): copying a whole buffer out of JavaScriptCore
+        # is most of what a save costs the main loop.
+        entered = time.monotonic()
+        raw = js_result.to_string()
+        if raw.startswith(self._BULK_MESSAGES):
+            _traffic.count(True, 1)
+            self._on_bulk_message(raw, entered)
+            return
         try:
-            msg = json.loads(js_result.to_string())
+            msg = json.loads(raw)
         except Exception:
             return
 
         msg_type = msg.get("type")
         data = msg.get("data", {})
+        if msg_type == "batch":
+            # State updates collected by the editor over a frame, newest per
+            # type; see postState() in bridge.js.
+            messages = data.get("messages", [])
+            _traffic.count(True, data.get("events", len(messages)))
+            for message in messages:
+                self._dispatch_message(message.get("type"), message.get("data", {}))
+            return
+        _traffic.count(True, 1)
+        self._dispatch_message(msg_type, data)
 
+    def _dispatch_message(self, msg_type, data):
         if msg_type == "ready":
-            self._ready = True
-            for script in self._pending_js:
-                self._webview.evaluate_javascript(
-                    script, -1, None, None, None, None, None
-                )
-            self._pending_js = []
+            self._on_editor_ready()
+
+        elif msg_type == "first-paint":
+            self._on_first_paint()
+
+        elif msg_type == "view-state":
+            self._finish_hibernate(data.get("viewState"))
+
+        elif msg_type == "large-file-loaded":
+            self._on_large_file_loaded(data)
 
         elif msg_type == "init-complete":
             self._line_ending = data.get("lineEnding", "lf")
             self._word_wrap = data.get("wordWrap", True)
             self.emit("line-ending-detected", self._line_ending)
             self.emit("wrap-changed", self._word_wrap)
+            self._start_journal(data)
 
         elif msg_type == "cursor-changed":
             self._cursor_line = data.get("line", 1)
@@ -236,35 +456,18 @@ class MonacoEditor(Gtk.Box):
             self.emit("wrap-changed", self._word_wrap)
 
         elif msg_type == "history-reset":
-            # The undo stack was thrown away.  "init" is expected (fresh tab);
-            # anything else means there is still a path that destroys history,
-            # so log it loudly enough to be seen without EDITH_DEBUG.
+            # The undo stack was thrown away.  "init" (fresh tab) and
+            # "follow" (tail mode started) are expected; anything else means
+            # there is still a path that destroys history, so log it loudly
+            # enough to be seen without EDITH_DEBUG.
             reason = data.get("reason", "unknown")
             log.log(
-                logging.INFO if reason == "init" else logging.WARNING,
+                logging.INFO if reason in ("init", "follow") else logging.WARNING,
                 "undo history reset (%s) for %s",
                 reason,
                 self.open_file.filename,
             )
 
-        elif msg_type == "content-snapshot":
-            self._content_snapshot = data.get("content", "")
-
-        elif msg_type == "save-content":
-            content = data.get("content", "")
-            try:
-                with open(self.open_file.local_path, "w") as f:
-                    f.write(content)
-            except OSError:
-                pass
-            self._content_snapshot = None
-            self._eval_js("EdithBridge.markClean()")
-            self._refresh_svg_preview()
-            cb = self._pending_save_callback
-            self._pending_save_callback = None
-            if cb:
-                cb()
-
         elif msg_type == "modified-changed":
             modified = data.get("modified", False)
             self.open_file.is_modified = modified
@@ -276,13 +479,36 @@ class MonacoEditor(Gtk.Box):
         elif msg_type == "close-requested":
             self.activate_action("win.close-tab", None)
 
+    def _on_editor_ready(self):
+        self._ready = True
+        # Everything that waited for Monaco goes in one call.
+        for script in self._pending_js:
+            self._queue_js(self._js_batch, script)
+        self._pending_js = []
+        self._flush_js()
+        if self._large_reader is not None:
+            self._send_large_chunk()
+
+    def _on_first_paint(self):
+        if self._opened_at is None:
+            return  # a rebuild after a crash, not the tab opening
+        elapsed_ms = (time.monotonic() - self._opened_at) * 1000
+        self._opened_at = None
+        log.info(
+            "%s painted %.0f ms after its tab opened (%s editor)",
+            self.open_file.filename, elapsed_ms,
+            "pooled" if self._pooled else "fresh",
+        )
+        self.emit("first-paint", elapsed_ms, self._pooled)
+
     def _on_web_process_terminated(self, webview, reason):
         """WebKit renderer crashed — rebuild the editor.
 
-        Undo history cannot survive this, but unsaved text can: the last
-        snapshot from the JS side is restored instead of the stale file on
-        disk.  Either way the user is told, rather than silently finding a
-        dead Ctrl+Z later on.
+        Undo history cannot survive this, but unsaved text can: the
+        journal is replayed (once every write queued before the crash has
+        landed) and restored instead of the stale file on disk.  Either way
+        the user is told, rather than silently finding a dead Ctrl+Z later
+        on.
         """
         log.warning(
             "WebKit render process terminated (%s) for %s",
@@ -290,14 +516,22 @@ class MonacoEditor(Gtk.Box):
             self.open_file.filename,
         )
         self._ready = False
-        self._pending_js = []
+        self._drop_js()
         self._pending_save_callback = None
+        self._close_large_reader()
+
+        was_modified = self.open_file.is_modified
+        journal = self._journal
+        self._queue_io(
+            journal.unsaved_text,
+            lambda text: self._rebuild_after_crash(text if was_modified else None),
+            lambda error: self._rebuild_after_crash(None),
+        )
 
-        recovered = self._content_snapshot
-        # queues init JS into _pending_js, using the snapshot if we have one
+    def _rebuild_after_crash(self, recovered):
+        # queues init JS into _pending_js, using the journal text if we have it
         self._load_file_and_init(content_override=recovered)
-        monaco_dir = Path(__file__).parent.parent / "data" / "monaco"
-        self._webview.load_uri((monaco_dir / "editor.html").as_uri())
+        load_editor(self._webview)
 
         if recovered is not None:
             msg = _(
@@ -316,13 +550,171 @@ class MonacoEditor(Gtk.Box):
         if root is not None and hasattr(root, "show_toast"):
             root.show_toast(message, kind, timeout)
 
+    # ------------------------------------------------------------------ #
+    #  Saving & the recovery journal                                       #
+    # ------------------------------------------------------------------ #
+
+    def _queue_io(self, task, on_done=None, on_error=None):
+        """Run `task` on a worker after every file write queued before it."""
+        self._io_queue.append((task, on_done, on_error))
+        self._run_next_io()
+
+    def _run_next_io(self):
+        if self._io_busy or not self._io_queue:
+            return
+        task, on_done, on_error = self._io_queue.pop(0)
+        self._io_busy = True
+
+        def finish(callback, value):
+            self._io_busy = False
+            if callback:
+                callback(value)
+            self._run_next_io()
+
+        run_async(task, lambda result: finish(on_done, result),
+                  lambda error: finish(on_error, error))
+
+    def _on_bulk_message(self, raw: str, entered: float):
+        if raw.startswith('{"type":"save-content"'):
+            self._queue_save(raw, entered)
+            return
+        journal = self._journal
+
+        def write():
+            msg = json.loads(raw)
+            data = msg.get("data", {})
+            if msg.get("type") == "journal-base":
+                journal.set_base(data.get("content", ""), data.get("v", 0),
+                                 data.get("clean", True))
+            else:
+                journal.append(data)
+
+        self._queue_io(write)
+
+    def _queue_save(self, raw: str, entered: float):
+        """Hand the save-content message `raw` to a worker; `entered` is
+        when the message handler was entered, before the string was
+        fetched."""
+        job = {"callback": self._pending_save_callback,
+               "requested": self._save_requested_at, "received": entered}
+        self._pending_save_callback = None
+        self._save_requested_at = None
+        local_path = self.open_file.local_path
+        journal = self._journal
+
+        def write():
+            started = time.monotonic()
+            data = json.loads(raw).get("data", {})
+            content = data.get("content", "")
+            write_atomic(local_path, content)
+            # What was just saved is the journal's new base; the changes
+            # leading up to it are not needed any more.
+            with contextlib.suppress(OSError):
+                journal.set_base(content, data.get("versionId", 0))
+            return data.get("version"), (time.monotonic() - started) * 1000
+
+        self._queue_io(
+            write,
+            lambda result: self._on_saved(job, *result),
+            lambda error: self._on_save_failed(error),
+        )
+        # Everything the main loop spends on a save, from entering the
+        # message handler: fetching the string from JavaScriptCore and
+        # handing it over.  The parse and write are not.
+        job["main_ms"] = (time.monotonic() - entered) * 1000
+
+    def _on_saved(self, job, version, write_ms):
+        # Clean as of the version that was written: anything typed while
+        # it was on its way to disk still counts as unsaved.
+        self._eval_js("EdithBridge.markClean({})".format(json.dumps(version)))
+        self._refresh_svg_preview()
+        self._log_save_timing(job, write_ms)
+        if job["callback"]:
+            job["callback"]()
+
+    def _on_save_failed(self, error):
+        # Not uploading: the local file is whatever it was before, and
+        # sending that to the server would be a save the user didn't make.
+        self._notify(_("Could not save “{filename}”: {error}").format(
+            filename=self.open_file.filename, error=error))
+
+    def _log_save_timing(self, job, write_ms):
+        requested = job.get("requested")
+        fetch_ms = (job["received"] - requested) * 1000 if requested else 0.0
+        main_ms = job["main_ms"]
+        log.info(
+            "saved %s: %.0f ms fetching from the editor, %.1f ms on the main "
+            "loop, %.0f ms writing",
+            self.open_file.filename, fetch_ms, main_ms, write_ms,
+        )
+        if main_ms >= self._SAVE_MAIN_LOOP_WARN_MS:
+            record(
+                f"slow save: {self.open_file.filename} held the main loop "
+                f"for {main_ms:.0f} ms (write {write_ms:.0f} ms on a worker)"
+            )
+
+    def _start_journal(self, data):
+        """Make the text the editor was just initialised with the journal
+        base, from our own copy if it matches, from the editor's if not."""
+        seed, self._journal_seed = self._journal_seed, None
+        if self._large_file or self.is_peek():
+            return
+        journal = self._journal
+        local_path = self.open_file.local_path
+        eol = "\r\n" if data.get("lineEnding") == "crlf" else "\n"
+        length = data.get("length", -1)
+        version = data.get("versionId", 0)
+
+        def check():
+            text = seed
+            if text is None:
+                with open(local_path, "r", errors="replace") as f:
+                    text = f.read()
+            return journal.set_base_if_matches(text, eol, length, version)
+
+        def on_checked(matched):
+            if not matched:
+                self._eval_js("EdithBridge.journalBase()")
+
+        self._queue_io(check, on_checked,
+                       lambda error: self._eval_js("EdithBridge.journalBase()"))
+
+    def discard_journal(self, now: bool = False):
+        """Forget the recovery journal: the tab is being closed on purpose.
+
+        now: right away, on this thread, rather than after the queued
+            writes; for when the process is about to end.
+        """
+        if self.is_peek():
+            return  # never had one; what is there belongs to a full open
+        if now:
+            self._journal.discard()
+        else:
+            self._queue_io(self._journal.discard)
+
     # ------------------------------------------------------------------ #
     #  File loading & init                                                 #
     # ------------------------------------------------------------------ #
 
     def _load_file_and_init(self, content_override=None):
+        if (content_override is None and not self._journal_checked
+                and not self._is_large_file() and not self.is_peek()):
+            # Unsaved text left by a session that was killed: looked for on
+            # the I/O queue, and the editor initialised once that is known.
+            self._journal_checked = True
+            self._queue_io(self._journal.unsaved_text, self._init_after_journal_check,
+                           lambda error: self._load_file_and_init())
+            return
+        self._journal_checked = True
+        self._journal_seed = content_override
+        # Set again by _start_large_load() if this is still a large file.
+        self._large_file = False
         if content_override is not None:
             content = content_override
+        elif self._is_large_file():
+            self._eval_js(self._init_script(None))
+            self._start_large_load()
+            return
         else:
             try:
                 with open(self.open_file.local_path, "r", errors="replace") as f:
@@ -330,50 +722,182 @@ class MonacoEditor(Gtk.Box):
             except Exception as e:
                 content = f"Error loading file: {e}"
 
+        self._eval_js(self._init_script(content))
+        if self.is_peek():
+            self._eval_js("EdithBridge.setReadOnly(true)")
+
+        # Restored crash content differs from what's on disk — keep the tab
+        # flagged dirty so the user can still save it.
+        if content_override is not None:
+            self._eval_js("EdithBridge.markDirty()")
+
+    def _init_after_journal_check(self, unsaved):
+        if unsaved is not None:
+            log.info("restoring unsaved changes to %s from the journal",
+                     self.open_file.filename)
+            GLib.idle_add(self._notify_journal_restored)
+        self._load_file_and_init(content_override=unsaved)
+
+    def _notify_journal_restored(self):
+        self._notify(_(
+            "Unsaved changes to “{filename}” from an earlier session were "
+            "restored. Save to keep them, or close the tab without saving "
+            "to discard them."
+        ).format(filename=self.open_file.filename), "info", 10)
+        return GLib.SOURCE_REMOVE
+
+    def _init_script(self, content):
+        """The EdithBridge.init() call; content None leaves the model as is."""
         lang_id = self._detect_language()
         self._language_id = lang_id
 
         theme_id = self._resolve_theme()
-        font_family = ConfigService.get_preference("editor_font", "")
-        font_size = ConfigService.get_preference("editor_font_size", 0)
+        prefs = current_preferences()
 
         settings = {
-            "insertSpaces": ConfigService.get_preference("editor_insert_spaces", True),
-            "tabSize":      ConfigService.get_preference("editor_tab_size", 4),
-            "minimap":      ConfigService.get_preference("editor_minimap", False),
-            "renderWhitespace": ConfigService.get_preference(
-                "editor_render_whitespace", "selection"
-            ),
-            "stickyScroll": ConfigService.get_preference("editor_sticky_scroll", False),
-            "fontLigatures": ConfigService.get_preference("editor_font_ligatures", False),
-            "lineNumbers":  ConfigService.get_preference("editor_line_numbers", "on"),
+            "insertSpaces": prefs.editor_insert_spaces,
+            "tabSize":      prefs.editor_tab_size,
+            "minimap":      prefs.editor_minimap,
+            "renderWhitespace": prefs.editor_render_whitespace,
+            "stickyScroll": prefs.editor_sticky_scroll,
+            "fontLigatures": prefs.editor_font_ligatures,
+            "lineNumbers":  prefs.editor_line_numbers,
         }
 
-        custom_options = ConfigService.get_preference("editor_overrides", {})
+        return "EdithBridge.init({}, {}, {}, {}, {}, true, {}, {})".format(
+            json.dumps(content),
+            json.dumps(lang_id or "plaintext"),
+            json.dumps(theme_id),
+            json.dumps(prefs.editor_font),
+            json.dumps(prefs.editor_font_size or 14),
+            json.dumps(settings),
+            json.dumps(prefs.editor_overrides, default=dict),
+        )
+
+    def _on_preference_changed(self, key):
+        """Apply a changed setting; key None for all of them."""
+        prefs = current_preferences()
+        if key in (None, "syntax_scheme"):
+            self.apply_scheme(self._resolve_theme())
+        if key in (None, "editor_font", "editor_font_size"):
+            self.apply_font(prefs.editor_font, prefs.editor_font_size or 14)
+        if key in (None, "editor_insert_spaces", "editor_tab_size"):
+            self.set_indent(prefs.editor_insert_spaces, prefs.editor_tab_size)
+        if key in (None, "editor_minimap"):
+            self.set_minimap(prefs.editor_minimap)
+        if key in (None, "editor_render_whitespace"):
+            self.set_render_whitespace(prefs.editor_render_whitespace)
+        if key in (None, "editor_sticky_scroll"):
+            self.set_sticky_scroll(prefs.editor_sticky_scroll)
+        if key in (None, "editor_font_ligatures"):
+            self.set_font_ligatures(prefs.editor_font_ligatures)
+        if key in (None, "editor_line_numbers"):
+            self.set_line_numbers(prefs.editor_line_numbers)
+        if key in (None, "editor_overrides"):
+            self.apply_custom_options(prefs.editor_overrides)
 
-        self._eval_js(
-            "EdithBridge.init({}, {}, {}, {}, {}, true, {}, {})".format(
-                json.dumps(content),
-                json.dumps(lang_id or "plaintext"),
-                json.dumps(theme_id),
-                json.dumps(font_family or ""),
-                json.dumps(font_size or 14),
-                json.dumps(settings),
-                json.dumps(custom_options),
+    # ------------------------------------------------------------------ #
+    #  Large-file mode                                                     #
+    # ------------------------------------------------------------------ #
+
+    def _is_large_file(self) -> bool:
+        threshold = current_preferences().get("editor_large_file_mb", self._LARGE_FILE_MB)
+        try:
+            return os.path.getsize(self.open_file.local_path) >= threshold * (1 << 20)
+        except (OSError, TypeError):
+            return False
+
+    def _start_large_load(self):
+        """Stream the file into the editor a piece at a time.
+
+        Each piece is sent only once WebKit has finished the previous one,
+        so neither process ever holds more than a piece in flight and the
+        main loop keeps running between them.
+        """
+        self._close_large_reader()
+        try:
+            self._large_reader = open(self.open_file.local_path, "r", errors="replace")
+        except OSError as e:
+            self._eval_js(
+                "EdithBridge.setContent({})".format(json.dumps(f"Error loading file: {e}"))
             )
+            return
+        self._large_file = True
+        self._large_started = time.monotonic()
+        read_only = current_preferences().get("editor_large_file_read_only", False)
+        self._eval_js(f"EdithBridge.largeFileBegin({'true' if read_only else 'false'})")
+        if self._ready:
+            self._send_large_chunk()
+        # else: the "ready" handler starts the stream
+
+    def _send_large_chunk(self):
+        reader = self._large_reader
+        if reader is None:
+            return
+        try:
+            chunk = reader.read(self._LARGE_FILE_CHUNK)
+        except OSError:
+            chunk = ""
+        # Sent directly, for the completion callback; largeFileBegin() and
+        # anything else queued must get there first.
+        self._flush_js()
+        _traffic.count(False, 1)
+        if not chunk:
+            self._close_large_reader()
+            self._webview.evaluate_javascript(
+                "EdithBridge.largeFileEnd()", -1, None, None, None, None, None
+            )
+            return
+        self._webview.evaluate_javascript(
+            f"EdithBridge.largeFileAppend({json.dumps(chunk)})",
+            -1, None, None, None, self._on_large_chunk_done, reader,
         )
 
-        # Restored crash content differs from what's on disk — keep the tab
-        # flagged dirty so the user can still save it.
-        if content_override is not None:
-            self._eval_js("EdithBridge.markDirty()")
+    def _on_large_chunk_done(self, webview, result, reader):
+        try:
+            webview.evaluate_javascript_finish(result)
+        except GLib.Error as e:
+            log.warning("large-file chunk failed for %s: %s",
+                        self.open_file.filename, e.message)
+        # A crash or reload since this chunk went out has replaced the reader.
+        if reader is self._large_reader:
+            self._send_large_chunk()
+
+    def _close_large_reader(self):
+        if self._large_reader is not None:
+            try:
+                self._large_reader.close()
+            except OSError:
+                pass
+            self._large_reader = None
+
+    def _on_large_file_loaded(self, data):
+        elapsed = time.monotonic() - self._large_started
+        lines = data.get("lines", 0)
+        log.info(
+            "large file %s: %d lines loaded in %.2fs (editor side %d ms)",
+            self.open_file.filename, lines, elapsed, data.get("ms", 0),
+        )
+        if data.get("highlighted", True):
+            msg = _("Large file: {lines} lines loaded in {seconds:.1f} s").format(
+                lines=lines, seconds=elapsed)
+        else:
+            msg = _(
+                "Large file: {lines} lines loaded in {seconds:.1f} s, "
+                "without syntax highlighting"
+            ).format(lines=lines, seconds=elapsed)
+        self._notify(msg, "info", 4)
+
+    def is_large_file(self) -> bool:
+        """Whether this tab was opened in large-file mode."""
+        return self._large_file
 
     def _detect_language(self):
         filename = self.open_file.filename
         ext = filename.rsplit(".", 1)[-1] if "." in filename else ""
 
         if ext:
-            assoc = ConfigService.get_preference("syntax_associations", {})
+            assoc = current_preferences().get("syntax_associations", {})
             if ext in assoc:
                 return assoc[ext]
             if ext in EXT_TO_MONACO:
@@ -392,7 +916,7 @@ class MonacoEditor(Gtk.Box):
     def _resolve_theme(self):
         from edith.monaco_languages import resolve_theme
 
-        return resolve_theme(ConfigService.get_preference("syntax_scheme", ""))
+        return resolve_theme(current_preferences().syntax_scheme)
 
     def _on_preview_toggled(self, btn):
         visible = btn.get_active()
@@ -443,10 +967,12 @@ class MonacoEditor(Gtk.Box):
 
     def save_to_disk(self, on_done=None):
         """Async save: ask Monaco for content (formatting first if configured),
-        write to disk on callback, then call on_done."""
+        write it to disk on a worker, then call on_done on the main loop.
+        on_done is not called if the write fails."""
+        self.wake()
         self._pending_save_callback = on_done
-        format_on_save = ConfigService.get_preference("editor_format_on_save", False)
-        flag = "true" if format_on_save else "false"
+        self._save_requested_at = time.monotonic()
+        flag = "true" if current_preferences().editor_format_on_save else "false"
         self._eval_js(f"EdithBridge.savePrepare({flag})")
 
     def apply_scheme(self, scheme_id: str):
@@ -492,7 +1018,7 @@ class MonacoEditor(Gtk.Box):
         self._eval_js(f"EdithBridge.setLineNumbers({json.dumps(mode)})")
 
     def apply_custom_options(self, opts: dict):
-        self._eval_js(f"EdithBridge.setCustomOptions({json.dumps(opts)})")
+        self._eval_js(f"EdithBridge.setCustomOptions({json.dumps(opts, default=dict)})")
 
     def undo(self):
         self._eval_js("EdithBridge.undo()")
@@ -520,6 +1046,18 @@ class MonacoEditor(Gtk.Box):
 
     def reload_from_disk(self):
         """Re-read the local file and replace editor content."""
+        if self._hibernated:
+            # Waking reads the file anyway; all that is left to do is to
+            # forget the unsaved text it would otherwise be replaced with.
+            if self.open_file.is_modified:
+                self._queue_io(self._journal.discard)
+                self.open_file.is_modified = False
+                self.emit("modified-changed", False)
+            return
+        if self._large_file:
+            # Streamed again rather than sent whole; undo history goes with it.
+            self._start_large_load()
+            return
         try:
             with open(self.open_file.local_path, "r", errors="replace") as f:
                 content = f.read()
@@ -528,3 +1066,158 @@ class MonacoEditor(Gtk.Box):
         self._eval_js(
             "EdithBridge.setContent({})".format(json.dumps(content))
         )
+
+    # ------------------------------------------------------------------ #
+    #  Preview of a large file                                             #
+    # ------------------------------------------------------------------ #
+
+    def is_peek(self) -> bool:
+        """Whether the tab shows only the head and tail of the file."""
+        return self.open_file.peek_size is not None
+
+    def _update_peek_banner(self):
+        if self._peek_banner is not None and self.is_peek():
+            self._peek_banner.set_title(_(
+                "Preview: only the start and end of this {size} file are shown"
+            ).format(size=GLib.format_size(self.open_file.peek_size)))
+
+    def set_peek_size(self, size: int):
+        """The preview was fetched again, from a file now `size` bytes long."""
+        self.open_file.peek_size = size
+        self._update_peek_banner()
+
+    def end_peek(self):
+        """The whole file is now the local copy: show all of it, editable."""
+        if not self.is_peek():
+            return
+        self.open_file.peek_size = None
+        if self._peek_banner is not None:
+            self.remove(self._peek_banner)
+            self._peek_banner = None
+        if self._hibernated:
+            return  # waking loads the file as it is now
+        self._eval_js("EdithBridge.setReadOnly(false)")
+        # Through init rather than setContent: a big file has to be
+        # streamed, and there is no history worth keeping.
+        self._load_file_and_init()
+
+    # ------------------------------------------------------------------ #
+    #  Follow mode                                                         #
+    # ------------------------------------------------------------------ #
+    def begin_follow(self):
+        """Make the buffer a read-only tail of the remote file.
+
+        Not journalled meanwhile: a read-only tail has nothing unsaved to
+        recover, and logging it would cost as much as the log grows.
+        """
+        self._following = True
+        self._eval_js("EdithBridge.followBegin()")
+        self.discard_journal()
+
+    def follow_append(self, text: str):
+        """Append what the remote file gained since the last poll."""
+        self._eval_js("EdithBridge.followAppend({}, {})".format(
+            json.dumps(text), self._follow_max_lines()))
+
+    def follow_reset(self, text: str):
+        """Replace the buffer after the file was truncated or rotated."""
+        self._eval_js("EdithBridge.followReset({}, {})".format(
+            json.dumps(text), self._follow_max_lines()))
+
+    def end_follow(self):
+        self._following = False
+        self._eval_js("EdithBridge.followEnd()")
+        if not self.is_peek():
+            # Editable again: journal from what the buffer holds now.
+            self._eval_js("EdithBridge.journalBase()")
+
+    def is_following(self) -> bool:
+        return self._following
+
+    def _follow_max_lines(self) -> int:
+        try:
+            return max(0, int(current_preferences().get(
+                "log_follow_max_lines", self._FOLLOW_MAX_LINES)))
+        except (TypeError, ValueError):
+            return self._FOLLOW_MAX_LINES
+
+    # ------------------------------------------------------------------ #
+    #  Hibernation                                                         #
+    # ------------------------------------------------------------------ #
+
+    def can_hibernate(self) -> bool:
+        return (not self._hibernated and not self._hibernating and self._ready
+                and not self._following and self._large_reader is None)
+
+    def is_hibernated(self) -> bool:
+        return self._hibernated
+
+    def hibernate(self):
+        """Give up the WebView (and its web process) until the tab is
+        needed again.
+
+        The editor is asked for its view state first, and flushes its
+        journal on the way, so waking can put back unsaved text, cursor,
+        selections and scroll position.  Undo history does not survive:
+        Monaco has no way to hand it out.
+        """
+        if not self.can_hibernate():
+            return
+        self._hibernating = True
+        self._eval_js("EdithBridge.hibernateState()")
+
+    def _finish_hibernate(self, view_state):
+        if not self._hibernating:
+            return
+        self._hibernating = False
+        if self.last_active is None:
+            return  # selected again while the state was on its way
+        self._view_state = view_state
+        for obj, handler_id in self._webview_handlers:
+            obj.disconnect(handler_id)
+        self._webview_handlers = []
+        if self._overlay is not None:
+            self._overlay.set_child(None)
+        else:
+            self.remove(self._webview)
+        # Dropping the last reference finalizes the WebView, which ends its
+        # web process and returns that memory.
+        self._webview = None
+        self._ready = False
+        self._drop_js()
+        self._hibernated = True
+        log.info("hibernated %s", self.open_file.filename)
+
+    def wake(self):
+        """Bring a hibernated tab back: a WebView (from the pool if there
+        is one), the file or its unsaved text, and the view state."""
+        if not self._hibernated:
+            return
+        self._hibernated = False
+        self._waking = True
+        ready = self._create_webview()
+        if self._overlay is not None:
+            self._overlay.set_child(self._webview)
+        else:
+            self.append(self._webview)
+
+        def rebuild(unsaved):
+            self._waking = False
+            self._load_file_and_init(content_override=unsaved)
+            if self._view_state is not None:
+                self._eval_js("EdithBridge.restoreViewState({})".format(
+                    json.dumps(self._view_state)))
+                self._view_state = None
+            for script in self._wake_js:
+                self._queue_js(self._pending_js, script)
+            self._wake_js = []
+            if ready:
+                self._on_editor_ready()
+            log.info("woke %s", self.open_file.filename)
+
+        if self.open_file.is_modified:
+            # After the journal writes still queued from before hibernating.
+            self._queue_io(self._journal.unsaved_text, rebuild,
+                           lambda error: rebuild(None))
+        else:
+            rebuild(None)
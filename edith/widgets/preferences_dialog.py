@@ -545,9 +545,8 @@ class PreferencesDialog(Adw.PreferencesDialog):
         dialog.present(self)
 
     def _on_scheme_changed(self, dialog, scheme_id):
+        # Open editors follow the preference themselves.
         self._theme_row.set_subtitle(self._theme_summary())
-        if self._window:
-            self._window.apply_syntax_scheme(scheme_id)
 
     def _on_font_activated(self, row):
         from edith.widgets.font_chooser_dialog import FontChooserDialog
@@ -557,8 +556,6 @@ class PreferencesDialog(Adw.PreferencesDialog):
 
     def _on_font_changed(self, dialog, font_family, font_size):
         self._font_row.set_subtitle(self._font_summary())
-        if self._window:
-            self._window.apply_editor_font(font_family, font_size)
 
     def _on_associations_activated(self, row):
         from edith.widgets.syntax_associations_dialog import SyntaxAssociationsDialog
@@ -590,8 +587,6 @@ class PreferencesDialog(Adw.PreferencesDialog):
         self._apply_editor_settings()
 
     def _apply_editor_settings(self):
-        if self._window:
-            self._window.apply_editor_settings()
         self.emit("editor-settings-changed")
 
     def _on_language_changed(self, row, pspec):
@@ -677,8 +672,6 @@ class PreferencesDialog(Adw.PreferencesDialog):
         ConfigService.set_preference(
             "single_click_open", self._click_row.get_selected() == 1
         )
-        if self._window:
-            self._window.apply_navigation_settings()
         self.emit("navigation-changed")
 
     def _on_window_size_changed(self, row, pspec):
@@ -9,6 +9,7 @@ gi.require_version("Adw", "1")
 from gi.repository import Adw, Gio, Gtk, GObject, Gdk
 
 from edith.models.server import FolderInfo
+from edith.models.server_store import UNGROUPED, GroupItem
 from edith.services.config import ConfigService
 from edith.widgets.folder_row import FolderRow
 from edith.widgets.file_dialogs import NameDialog
@@ -29,8 +30,10 @@ class ServerList(Gtk.Box):
 
         self._servers = []
         self._folders = []
-        self._row_keys = {}   # Gtk.ListBoxRow → group key str
-        self._folder_rows = {}
+        self._items = []       # GroupItems, as in self._store
+        self._items_by_key = {}
+        self._shown_key = None  # group-selected last emitted for
+        self._selecting = False
 
         # Scrolled list
         sw = Gtk.ScrolledWindow(
@@ -38,14 +41,24 @@ class ServerList(Gtk.Box):
             hscrollbar_policy=Gtk.PolicyType.NEVER,
         )
 
-        self._list_box = Gtk.ListBox(
-            selection_mode=Gtk.SelectionMode.SINGLE,
+        self._store = Gio.ListStore(item_type=GroupItem)
+        self._selection = Gtk.SingleSelection(
+            model=self._store, autoselect=False, can_unselect=True,
+        )
+        self._selection.connect("notify::selected-item", self._on_selected_item)
+
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", self._on_row_setup)
+        factory.connect("bind", self._on_row_bind)
+
+        self._list_view = Gtk.ListView(
+            model=self._selection,
+            factory=factory,
             css_classes=["navigation-sidebar"],
         )
-        self._list_box.connect("row-activated", self._on_row_activated)
-        self._list_box.connect("row-selected", self._on_row_selected)
+        self._list_view.connect("activate", self._on_row_activated)
 
-        sw.set_child(self._list_box)
+        sw.set_child(self._list_view)
         self.append(sw)
 
         self._setup_context_menus()
@@ -64,7 +77,7 @@ class ServerList(Gtk.Box):
         folder_menu.append(_("Delete Group"), "folder.delete-folder")
 
         self._folder_menu = Gtk.PopoverMenu(menu_model=folder_menu, has_arrow=False)
-        self._folder_menu.set_parent(self._list_box)
+        self._folder_menu.set_parent(self._list_view)
 
         folder_group = Gio.SimpleActionGroup()
 
@@ -80,14 +93,14 @@ class ServerList(Gtk.Box):
         delete_folder_action.connect("activate", self._on_folder_delete)
         folder_group.add_action(delete_folder_action)
 
-        self._list_box.insert_action_group("folder", folder_group)
+        self._list_view.insert_action_group("folder", folder_group)
 
         # --- Empty area context menu ---
         empty_menu = Gio.Menu()
         empty_menu.append(_("New Server Group\u2026"), "area.new-folder")
 
         self._empty_menu = Gtk.PopoverMenu(menu_model=empty_menu, has_arrow=False)
-        self._empty_menu.set_parent(self._list_box)
+        self._empty_menu.set_parent(self._list_view)
 
         area_group = Gio.SimpleActionGroup()
 
@@ -95,17 +108,26 @@ class ServerList(Gtk.Box):
         new_folder_action.connect("activate", lambda *_: self.show_new_folder_dialog())
         area_group.add_action(new_folder_action)
 
-        self._list_box.insert_action_group("area", area_group)
+        self._list_view.insert_action_group("area", area_group)
 
-        # Right-click gesture
+        # Right-click: CAPTURE-phase on the list view, ahead of the rows
         gesture = Gtk.GestureClick(button=Gdk.BUTTON_SECONDARY)
+        gesture.set_propagation_phase(Gtk.PropagationPhase.CAPTURE)
         gesture.connect("pressed", self._on_right_click)
-        self._list_box.add_controller(gesture)
+        self._list_view.add_controller(gesture)
+
+        self._context_folder = None
 
-        self._context_row = None
+    def _row_at(self, x: float, y: float) -> FolderRow | None:
+        widget = self._list_view.pick(x, y, Gtk.PickFlags.DEFAULT)
+        while widget is not None and widget is not self._list_view:
+            if isinstance(widget, FolderRow):
+                return widget
+            widget = widget.get_parent()
+        return None
 
     def _on_right_click(self, gesture, n_press, x, y):
-        row = self._list_box.get_row_at_y(int(y))
+        row = self._row_at(x, y)
         rect = Gdk.Rectangle()
         rect.x = int(x)
         rect.y = int(y)
@@ -117,10 +139,9 @@ class ServerList(Gtk.Box):
             self._empty_menu.popup()
             return
 
-        self._context_row = row
-        child = row.get_child()
+        self._context_folder = row.folder_info
 
-        if isinstance(child, FolderRow):
+        if row.folder_info is not None:
             self._folder_menu.set_pointing_to(rect)
             self._folder_menu.popup()
         # Special rows (All Servers, Without Group): no context menu
@@ -130,19 +151,13 @@ class ServerList(Gtk.Box):
     # ------------------------------------------------------------------
 
     def _on_folder_add_server(self, action, param):
-        if not self._context_row:
-            return
-        child = self._context_row.get_child()
-        if isinstance(child, FolderRow):
-            self.emit("add-server-to-folder", child.folder_info.id)
+        if self._context_folder:
+            self.emit("add-server-to-folder", self._context_folder.id)
 
     def _on_folder_rename(self, action, param):
-        if not self._context_row:
+        folder = self._context_folder
+        if not folder:
             return
-        child = self._context_row.get_child()
-        if not isinstance(child, FolderRow):
-            return
-        folder = child.folder_info
         win = self.get_root()
         dialog = NameDialog("Rename Group", "Group name", folder.name)
         dialog.connect("submitted", self._on_folder_rename_submitted, folder)
@@ -152,16 +167,13 @@ class ServerList(Gtk.Box):
         current_key = self._get_selected_key()
         folder.name = new_name
         self._folders = ConfigService.update_folder(folder)
-        self._rebuild_list()
+        self._sync()
         self.select_group(current_key or "__all__")
 
     def _on_folder_delete(self, action, param):
-        if not self._context_row:
-            return
-        child = self._context_row.get_child()
-        if not isinstance(child, FolderRow):
+        folder = self._context_folder
+        if not folder:
             return
-        folder = child.folder_info
         win = self.get_root()
         dlg = Adw.AlertDialog(
             heading=_("Delete Group?"),
@@ -183,7 +195,7 @@ class ServerList(Gtk.Box):
             ConfigService.save_servers(self._servers)
             self._folders = ConfigService.delete_folder(folder.id)
             self._servers = ConfigService.load_servers()
-            self._rebuild_list()
+            self._sync()
             # If the deleted folder was selected, fall back to All Servers
             if current_key == folder.id:
                 self.select_group("__all__")
@@ -204,7 +216,7 @@ class ServerList(Gtk.Box):
         current_key = self._get_selected_key()
         folder = FolderInfo(name=name)
         self._folders = ConfigService.add_folder(folder)
-        self._rebuild_list()
+        self._sync()
         self.select_group(current_key or "__all__")
 
     # ------------------------------------------------------------------
@@ -214,18 +226,11 @@ class ServerList(Gtk.Box):
     def load_servers(self):
         self._servers = ConfigService.load_servers()
         self._folders = ConfigService.load_folders()
-        self._rebuild_list()
-
-    def _rebuild_list(self):
-        # Remove all rows
-        while True:
-            row = self._list_box.get_row_at_index(0)
-            if row is None:
-                break
-            self._list_box.remove(row)
-        self._row_keys.clear()
-        self._folder_rows.clear()
+        self._sync()
 
+    def _sync(self):
+        """Bring the rows up to date with self._servers and self._folders,
+        changing only the rows that changed."""
         # Compute per-folder and ungrouped counts
         folder_ids = {f.id for f in self._folders}
         folder_counts = {f.id: 0 for f in self._folders}
@@ -236,71 +241,98 @@ class ServerList(Gtk.Box):
             else:
                 ungrouped_count += 1
 
-        # "All Servers" row
-        all_widget = self._make_nav_row("edith-server-symbolic", "All Servers", len(self._servers))
-        self._list_box.append(all_widget)
-        lbr = all_widget.get_parent()
-        if lbr:
-            self._row_keys[lbr] = "__all__"
-
+        wanted = [("__all__", "edith-server-symbolic", "All Servers", len(self._servers), None)]
         # "Without Group" row — only when ungrouped servers exist
         if ungrouped_count > 0:
-            ug_widget = self._make_nav_row("edith-folder-striped-symbolic", "Without Group", ungrouped_count)
-            self._list_box.append(ug_widget)
-            lbr = ug_widget.get_parent()
-            if lbr:
-                self._row_keys[lbr] = "__ungrouped__"
-
-        # One FolderRow per folder, in config order (user-defined via drag-and-drop)
+            wanted.append((UNGROUPED, "edith-folder-striped-symbolic", "Without Group",
+                           ungrouped_count, None))
+        # One row per folder, in config order (user-defined via drag-and-drop)
         for folder in self._folders:
-            folder_row = FolderRow(folder)
-            folder_row.set_count(folder_counts.get(folder.id, 0))
-            self._list_box.append(folder_row)
-            lbr = folder_row.get_parent()
-            if lbr:
-                self._row_keys[lbr] = folder.id
-                self._setup_folder_dnd(lbr, folder)
-            self._folder_rows[folder.id] = folder_row
+            wanted.append((folder.id, "edith-folder-symbolic", folder.name,
+                           folder_counts.get(folder.id, 0), folder))
+
+        items, changed = [], set()
+        for key, icon_name, title, count, folder in wanted:
+            item = self._items_by_key.get(key) or GroupItem(key)
+            if item.update(icon_name, title, count, folder):
+                changed.add(key)
+            items.append(item)
+        self._items_by_key = {item.key: item for item in items}
+
+        # One splice over the rows between the first and the last that
+        # differ; rows of the same group keep their item, so the selection
+        # stays where it was.
+        old = self._items
+        start = 0
+        while (start < min(len(old), len(items)) and old[start] is items[start]
+               and items[start].key not in changed):
+            start += 1
+        end = 0
+        while (end < min(len(old), len(items)) - start and old[-1 - end] is items[-1 - end]
+               and items[-1 - end].key not in changed):
+            end += 1
+        if start + end < max(len(old), len(items)):
+            self._store.splice(start, len(old) - start - end, items[start:len(items) - end])
+        self._items = items
+
+    def _on_row_setup(self, factory, list_item):
+        row = FolderRow()
+        self._setup_folder_dnd(row)
+        list_item.set_child(row)
+
+    def _on_row_bind(self, factory, list_item):
+        list_item.get_child().show_group(list_item.get_item())
 
     # ------------------------------------------------------------------
     # Folder drag-and-drop reordering
     # ------------------------------------------------------------------
 
-    def _setup_folder_dnd(self, list_box_row, folder: "FolderInfo"):
-        """Attach DragSource and DropTarget to a folder's ListBoxRow for reordering."""
+    def _setup_folder_dnd(self, row: FolderRow):
+        """Attach DragSource and DropTarget to a sidebar row for reordering.
+
+        The row is reused for other groups as the list scrolls and changes,
+        so which folder it is gets looked up when a drag starts or lands;
+        the All Servers and Without Group rows neither drag nor take drops.
+        """
 
         # Drag source
         drag = Gtk.DragSource(actions=Gdk.DragAction.MOVE)
 
         def on_drag_prepare(d, x, y):
+            if row.folder_info is None:
+                return None
             return Gdk.ContentProvider.new_for_value(
-                GObject.Value(GObject.TYPE_STRING, folder.id)
+                GObject.Value(GObject.TYPE_STRING, row.folder_info.id)
             )
 
         def on_drag_begin(d, gdk_drag):
             drag_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
             drag_box.append(Gtk.Image(icon_name="edith-folder-symbolic", pixel_size=16))
-            drag_box.append(Gtk.Label(label=folder.name))
+            drag_box.append(Gtk.Label(label=row.folder_info.name))
             Gtk.DragIcon.get_for_drag(gdk_drag).set_child(drag_box)
 
         drag.connect("prepare", on_drag_prepare)
         drag.connect("drag-begin", on_drag_begin)
-        list_box_row.add_controller(drag)
+        row.add_controller(drag)
 
         # Drop target
         drop = Gtk.DropTarget.new(GObject.TYPE_STRING, Gdk.DragAction.MOVE)
 
         def on_drop_enter(d, x, y):
-            list_box_row.add_css_class("drop-target")
+            if row.folder_info is None:
+                return Gdk.DragAction(0)
+            row.add_css_class("drop-target")
             return Gdk.DragAction.MOVE
 
         def on_drop_leave(d):
-            list_box_row.remove_css_class("drop-target")
+            row.remove_css_class("drop-target")
 
         def on_drop(d, value, x, y):
-            list_box_row.remove_css_class("drop-target")
+            row.remove_css_class("drop-target")
+            if row.folder_info is None:
+                return False
             source_id = value
-            target_id = folder.id
+            target_id = row.folder_info.id
             if source_id == target_id:
                 return False
             # Reorder: move source to target's position
@@ -312,61 +344,41 @@ class ServerList(Gtk.Box):
             ordered_ids.insert(target_idx, source_id)
             current_key = self._get_selected_key()
             self._folders = ConfigService.reorder_folders(ordered_ids)
-            self._rebuild_list()
+            self._sync()
             self.select_group(current_key or "__all__")
             return True
 
         drop.connect("enter", on_drop_enter)
         drop.connect("leave", on_drop_leave)
         drop.connect("drop", on_drop)
-        list_box_row.add_controller(drop)
-
-    def _make_nav_row(self, icon_name: str, label: str, count: int) -> "Gtk.Box":
-        box = Gtk.Box(
-            orientation=Gtk.Orientation.HORIZONTAL,
-            spacing=8,
-            margin_start=8,
-            margin_end=8,
-            margin_top=8,
-            margin_bottom=8,
-        )
-        icon = Gtk.Image(icon_name=icon_name)
-        box.append(icon)
-        name_label = Gtk.Label(
-            label=label,
-            xalign=0,
-            hexpand=True,
-            css_classes=["heading"],
-        )
-        box.append(name_label)
-        count_label = Gtk.Label(
-            label=str(count),
-            css_classes=["dim-label", "caption"],
-            valign=Gtk.Align.CENTER,
-        )
-        box.append(count_label)
-        return box
+        row.add_controller(drop)
 
     # ------------------------------------------------------------------
     # Row activation / selection
     # ------------------------------------------------------------------
 
-    def _on_row_activated(self, list_box, row):
-        key = self._row_keys.get(row)
-        if key is not None:
-            self.emit("group-selected", key)
+    def _on_row_activated(self, list_view, position):
+        item = self._store.get_item(position)
+        if item is not None:
+            self._shown_key = item.key
+            self.emit("group-selected", item.key)
 
-    def _on_row_selected(self, list_box, row):
-        self.emit("selection-changed", row is not None)
+    def _on_selected_item(self, selection, pspec):
+        item = selection.get_selected_item()
+        self.emit("selection-changed", item is not None)
+        # A click selects without activating; show the group all the same.
+        if item is not None and not self._selecting and item.key != self._shown_key:
+            self._shown_key = item.key
+            self.emit("group-selected", item.key)
 
     # ------------------------------------------------------------------
     # Programmatic selection
     # ------------------------------------------------------------------
 
     def _get_selected_key(self) -> str | None:
-        row = self._list_box.get_selected_row()
-        if row:
-            return self._row_keys.get(row)
+        item = self._selection.get_selected_item()
+        if item:
+            return item.key
         return None
 
     def get_selected_key(self) -> str | None:
@@ -375,15 +387,15 @@ class ServerList(Gtk.Box):
 
     def select_group(self, key: str):
         """Programmatically select a group row by key and emit group-selected."""
-        for lbr, k in self._row_keys.items():
-            if k == key:
-                self._list_box.select_row(lbr)
-                self.emit("group-selected", key)
-                return
+        if not self._items:
+            return
         # Fallback: select first row
-        first = self._list_box.get_row_at_index(0)
-        if first:
-            self._list_box.select_row(first)
-            k = self._row_keys.get(first)
-            if k:
-                self.emit("group-selected", k)
+        position = next((i for i, item in enumerate(self._items) if item.key == key), 0)
+        self._selecting = True
+        try:
+            self._selection.set_selected(position)
+        finally:
+            self._selecting = False
+        key = self._items[position].key
+        self._shown_key = key
+        self.emit("group-selected", key)
@@ -11,7 +11,10 @@ from dataclasses import replace
 from gi.repository import Adw, Gio, GLib, Gtk, GObject, Gdk, Graphene
 
 from edith.models.server import ServerInfo
+from edith.models.server_store import ServerItem, ServerStore
 from edith.services.config import ConfigService
+from edith.services.preferences import Preferences, current as current_preferences
+from edith.services.server_index import ServerIndex
 from edith.services import credential_store
 from edith.widgets.server_row import ServerRow
 from edith.widgets.server_edit_dialog import ServerEditDialog
@@ -34,9 +37,8 @@ class ServerPanel(Gtk.Box):
         self._servers = []
         self._folders = []
         self._search_query = ""
-        self._list_boxes = []        # all active per-group ListBoxes
-        self._active_list_box = None # the one that holds the current selection
-        self._selection_updating = False
+        self._sectioned = False
+        Preferences.get().watch(self, self._on_navigation_preference, "single_click_open")
 
         # Search bar
         self._search_entry = Gtk.SearchEntry(placeholder_text=_("Search servers\u2026"))
@@ -50,22 +52,75 @@ class ServerPanel(Gtk.Box):
         self._search_bar.connect("notify::search-mode-enabled", self._on_search_mode_changed)
         self.append(self._search_bar)
 
-        # Scrolled window → Clamp → content box (holds labels + per-group ListBoxes)
+        # ── List model chain ─────────────────────────────────────────────
+        # store → filter (group) → sort (section, pinned, name) → selection.
+        # See edith.models.server_store.
+        self._store = ServerStore()
+
+        self._group_filter = Gtk.StringFilter.new(
+            Gtk.PropertyExpression.new(ServerItem, None, "group"))
+        self._group_filter.set_match_mode(Gtk.StringFilterMatchMode.EXACT)
+        self._group_filter.set_ignore_case(False)
+        self._filter_model = Gtk.FilterListModel(
+            model=self._store.model, filter=self._group_filter)
+
+        # Pinned first, then by name, within each group
+        pinned_sorter = Gtk.NumericSorter.new(
+            Gtk.PropertyExpression.new(ServerItem, None, "pinned"))
+        pinned_sorter.set_sort_order(Gtk.SortType.DESCENDING)
+        name_sorter = Gtk.StringSorter.new(
+            Gtk.PropertyExpression.new(ServerItem, None, "name"))
+        sorter = Gtk.MultiSorter()
+        sorter.append(pinned_sorter)
+        sorter.append(name_sorter)
+        self._section_sorter = Gtk.NumericSorter.new(
+            Gtk.PropertyExpression.new(ServerItem, None, "section"))
+        self._sort_model = Gtk.SortListModel(model=self._filter_model, sorter=sorter)
+        self._sort_model.connect("items-changed", self._on_visible_changed)
+
+        self._selection = Gtk.SingleSelection(
+            model=self._sort_model, autoselect=False, can_unselect=True,
+        )
+        self._selection.connect("notify::selected-item", self._on_selected_item)
+
+        # While searching, the list view shows the matches instead, best
+        # first; see edith.services.server_index.
+        self._index = ServerIndex()
+        self._results = Gio.ListStore(item_type=ServerItem)
+        self._results.connect("items-changed", self._on_visible_changed)
+        self._search_selection = Gtk.SingleSelection(
+            model=self._results, autoselect=False, can_unselect=True,
+        )
+        self._search_selection.connect("notify::selected-item", self._on_selected_item)
+
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", self._on_row_setup)
+        factory.connect("bind", self._on_row_bind)
+
+        # Group headings in All Servers, when there are folders
+        self._header_factory = Gtk.SignalListItemFactory()
+        self._header_factory.connect("setup", self._on_header_setup)
+        self._header_factory.connect("bind", self._on_header_bind)
+
+        self._list_view = Gtk.ListView(
+            model=self._selection,
+            factory=factory,
+            single_click_activate=current_preferences().single_click_open,
+            show_separators=True,
+            css_classes=["server-list"],
+        )
+        self._list_view.connect("activate", self._on_row_activated)
+
+        # Scrolled window → ClampScrollable → list view.  A plain Clamp would
+        # hide the scrolling from the list view, and it would make a row for
+        # every server instead of just the ones on screen.
         self._sw = Gtk.ScrolledWindow(
             vexpand=True,
             hscrollbar_policy=Gtk.PolicyType.NEVER,
         )
 
-        self._content_box = Gtk.Box(
-            orientation=Gtk.Orientation.VERTICAL,
-            margin_start=12,
-            margin_end=12,
-            margin_top=12,
-            margin_bottom=12,
-        )
-
-        _clamp = Adw.Clamp(maximum_size=640, tightening_threshold=400)
-        _clamp.set_child(self._content_box)
+        _clamp = Adw.ClampScrollable(maximum_size=640, tightening_threshold=400)
+        _clamp.set_child(self._list_view)
         self._sw.set_child(_clamp)
         self.append(self._sw)
 
@@ -81,6 +136,33 @@ class ServerPanel(Gtk.Box):
 
         self._setup_context_menu()
 
+        # ── CSS ──────────────────────────────────────────────────────────
+        # Rows as cards under their group heading, like the boxed lists
+        # these used to be.
+        _css = Gtk.CssProvider()
+        _css.load_from_string("""
+            listview.server-list {
+                background: none;
+                padding: 12px;
+            }
+            listview.server-list > row {
+                background-color: @card_bg_color;
+                padding: 0;
+            }
+            listview.server-list > row:selected {
+                background-color: alpha(@accent_bg_color, 0.25);
+            }
+            listview.server-list > header {
+                background: none;
+                padding: 0;
+            }
+        """)
+        Gtk.StyleContext.add_provider_for_display(
+            Gdk.Display.get_default(),
+            _css,
+            Gtk.STYLE_PROVIDER_PRIORITY_USER,
+        )
+
     # ------------------------------------------------------------------
     # Search
     # ------------------------------------------------------------------
@@ -93,20 +175,42 @@ class ServerPanel(Gtk.Box):
 
     def _on_search_changed(self, entry):
         self._search_query = entry.get_text().strip().lower()
-        self._rebuild_list()
+        self._update_search()
 
     def _on_search_stop(self, entry):
         self._search_bar.set_search_mode(False)
 
     def _on_search_mode_changed(self, bar, pspec):
-        if not self._search_bar.get_search_mode():
+        if self._search_bar.get_search_mode():
+            # Connecting updates when a server was last used; search
+            # ranks by it.
+            self._index.set_last_used(ConfigService.get_last_used())
+        else:
             self._search_entry.set_text("")
             self._search_query = ""
-            self._rebuild_list()
-
-    def _server_matches(self, server) -> bool:
-        haystack = f"{server.display_name} {server.host} {server.username}".lower()
-        return self._search_query in haystack
+            self._update_search()
+
+    def _update_search(self):
+        """Show the matches of the query in the current group, or the
+        group itself when there is no query."""
+        if not self._search_query:
+            if self._list_view.get_model() is not self._selection:
+                self._list_view.set_model(self._selection)
+                self._list_view.set_header_factory(
+                    self._header_factory if self._sectioned else None)
+                self._results.remove_all()
+                self.emit("selection-changed", self.get_selected_server() is not None)
+            self._on_visible_changed()
+            return
+        key = self._current_group_key
+        ids = self._index.search(self._search_query, None if key == "__all__" else key)
+        items = [self._store.get(server_id) for server_id in ids]
+        self._results.splice(0, self._results.get_n_items(), items)
+        if self._list_view.get_model() is not self._search_selection:
+            self._list_view.set_header_factory(None)
+            self._list_view.set_model(self._search_selection)
+        self.emit("selection-changed", self.get_selected_server() is not None)
+        self._on_visible_changed()
 
     # ------------------------------------------------------------------
     # Context menu
@@ -162,29 +266,37 @@ class ServerPanel(Gtk.Box):
         toggle_pin_action.connect("activate", self._on_context_toggle_pin)
         server_group.add_action(toggle_pin_action)
 
-        # Action group on self — reachable from any child ListBox up the hierarchy
+        # Action group on self — reachable from the list view up the hierarchy
         self.insert_action_group("server", server_group)
 
-        self._context_row = None
-
-    def _on_right_click(self, gesture, n_press, x, y, list_box):
-        row = list_box.get_row_at_y(int(y))
-        if row is None:
-            return
-
-        child = row.get_child()
-        if not isinstance(child, ServerRow):
+        # Right-click: CAPTURE-phase on the list view, ahead of the rows
+        gesture = Gtk.GestureClick(button=Gdk.BUTTON_SECONDARY)
+        gesture.set_propagation_phase(Gtk.PropagationPhase.CAPTURE)
+        gesture.connect("pressed", self._on_right_click)
+        self._list_view.add_controller(gesture)
+
+        self._context_server = None
+
+    def _on_right_click(self, gesture, n_press, x, y):
+        # Walk from the deepest picked widget up to the row it is part of
+        widget = self._list_view.pick(x, y, Gtk.PickFlags.DEFAULT)
+        while widget is not None and not isinstance(widget, ServerRow):
+            if widget is self._list_view:
+                return
+            widget = widget.get_parent()
+        if widget is None or widget.server_info is None:
             return
 
-        self._context_row = row
-        self._populate_move_submenu(child.server_info.folder_id)
-        protocol = getattr(child.server_info, "protocol", "sftp")
+        server_info = widget.server_info
+        self._context_server = server_info
+        self._populate_move_submenu(server_info.folder_id)
+        protocol = getattr(server_info, "protocol", "sftp")
         self._change_password_action.set_enabled(
-            protocol in ("ftp", "ftps") or child.server_info.auth_method != "key"
+            protocol in ("ftp", "ftps") or server_info.auth_method != "key"
         )
 
         # Update pin label dynamically (pin section is at flat index 3)
-        pin_label = (_("Unpin") if ConfigService.is_server_pinned(child.server_info.id)
+        pin_label = (_("Unpin") if ConfigService.is_server_pinned(server_info.id)
                      else _("Pin"))
         pin_section = Gio.Menu()
         pin_section.append(pin_label, "server.toggle-pin")
@@ -196,7 +308,7 @@ class ServerPanel(Gtk.Box):
         pt = Graphene.Point()
         pt.x = float(x)
         pt.y = float(y)
-        ok, out_pt = list_box.compute_point(self, pt)
+        ok, out_pt = self._list_view.compute_point(self, pt)
         if ok:
             tx, ty = int(out_pt.x), int(out_pt.y)
         else:
@@ -220,30 +332,21 @@ class ServerPanel(Gtk.Box):
     # ------------------------------------------------------------------
 
     def _on_context_connect(self, action, param):
-        if self._context_row:
-            child = self._context_row.get_child()
-            if isinstance(child, ServerRow):
-                self.emit("server-activated", child.server_info)
+        if self._context_server:
+            self.emit("server-activated", self._context_server)
 
     def _on_context_edit(self, action, param):
-        if self._context_row:
-            child = self._context_row.get_child()
-            if isinstance(child, ServerRow):
-                self._show_edit_dialog(child.server_info)
+        if self._context_server:
+            self._show_edit_dialog(self._context_server)
 
     def _on_context_delete(self, action, param):
-        if self._context_row:
-            child = self._context_row.get_child()
-            if isinstance(child, ServerRow):
-                self._confirm_delete(child.server_info)
+        if self._context_server:
+            self._confirm_delete(self._context_server)
 
     def _on_context_duplicate(self, action, param):
-        if not self._context_row:
+        original = self._context_server
+        if not original:
             return
-        child = self._context_row.get_child()
-        if not isinstance(child, ServerRow):
-            return
-        original = child.server_info
         # Empty id triggers a fresh uuid in ServerInfo.__post_init__.
         base_name = original.name or original.display_name
         clone = replace(original, id="", name=f"{base_name} Copy")
@@ -274,26 +377,20 @@ class ServerPanel(Gtk.Box):
             self._move_submenu.append_item(item)
 
     def _on_context_move_to_group(self, action, param):
-        if self._context_row:
-            child = self._context_row.get_child()
-            if isinstance(child, ServerRow):
-                child.server_info.folder_id = param.get_string()
-                ConfigService.update_server(child.server_info)
-                self.reload()
-                self.emit("servers-changed")
+        if self._context_server:
+            server = replace(self._context_server, folder_id=param.get_string())
+            ConfigService.update_server(server)
+            self.reload()
+            self.emit("servers-changed")
 
     def _on_context_change_password(self, action, param):
-        if self._context_row:
-            child = self._context_row.get_child()
-            if isinstance(child, ServerRow):
-                self._show_change_password_dialog(child.server_info)
+        if self._context_server:
+            self._show_change_password_dialog(self._context_server)
 
     def _on_context_toggle_pin(self, action, param):
-        if self._context_row:
-            child = self._context_row.get_child()
-            if isinstance(child, ServerRow):
-                ConfigService.toggle_server_pin(child.server_info.id)
-                self._rebuild_list()
+        if self._context_server:
+            ConfigService.toggle_server_pin(self._context_server.id)
+            self._sync()
 
     def _show_change_password_dialog(self, server_info):
         dialog = Adw.Dialog(
@@ -386,199 +483,94 @@ class ServerPanel(Gtk.Box):
     # ------------------------------------------------------------------
 
     def show_group(self, group_key: str, folders: list, servers: list):
-        """Filter and rebuild the server list for the given group key."""
+        """Show the servers of the given group key, from these lists."""
         self._current_group_key = group_key
         self._folders = folders
         self._servers = servers
-        self._rebuild_list()
+        self._sync()
 
     def reload(self):
         """Reload from ConfigService and re-render the current group."""
         self._folders = ConfigService.load_folders()
         self._servers = ConfigService.load_servers()
-        self._rebuild_list()
+        self._sync()
 
     def get_selected_server(self) -> ServerInfo | None:
-        if self._active_list_box:
-            row = self._active_list_box.get_selected_row()
-            if row:
-                child = row.get_child()
-                if isinstance(child, ServerRow):
-                    return child.server_info
+        item = self._list_view.get_model().get_selected_item()
+        if item is not None:
+            return item.server_info
         return None
 
     # ------------------------------------------------------------------
-    # List building
+    # Model updates
     # ------------------------------------------------------------------
 
-    def _clear_content(self):
-        child = self._content_box.get_first_child()
-        while child:
-            nxt = child.get_next_sibling()
-            self._content_box.remove(child)
-            child = nxt
-        self._list_boxes.clear()
-        self._active_list_box = None
-
-    def apply_navigation_settings(self):
-        """Re-read the single/double click preference and apply it live."""
-        single = ConfigService.get_preference("single_click_open", False)
-        for lb in self._list_boxes:
-            lb.set_activate_on_single_click(single)
-
-    def _make_list_box(self) -> Gtk.ListBox:
-        """Create a per-group ListBox with boxed-list style."""
-        lb = Gtk.ListBox(
-            selection_mode=Gtk.SelectionMode.SINGLE,
-            activate_on_single_click=ConfigService.get_preference("single_click_open", False),
-            css_classes=["boxed-list"],
-        )
-        lb.connect("row-activated", self._on_row_activated)
-        lb.connect("row-selected", self._on_row_selected)
-        gesture = Gtk.GestureClick(button=Gdk.BUTTON_SECONDARY)
-        gesture.connect("pressed", self._on_right_click, lb)
-        lb.add_controller(gesture)
-        return lb
-
-    def _partition_pinned(self, servers: list) -> tuple:
-        """Split servers into (pinned, unpinned) preserving order within each."""
-        pinned_ids = set(ConfigService.get_pinned_servers())
-        pinned, unpinned = [], []
-        for s in servers:
-            if s.id in pinned_ids:
-                pinned.append(s)
-            else:
-                unpinned.append(s)
-        return pinned, unpinned
-
-    def _make_server_row(self, server: ServerInfo, pinned: bool) -> ServerRow:
-        row = ServerRow(server, pinned=pinned)
-        if pinned:
-            row.connect("unpin-requested", self._on_unpin_requested)
-        return row
+    def _sync(self):
+        """Apply self._servers, self._folders and the current group to the
+        model, as deltas; see ServerStore.sync()."""
+        self._store.sync(self._servers, self._folders,
+                         ConfigService.get_pinned_servers(), "Without Group")
+        self._index.sync(self._servers, self._folders)
+
+        key = self._current_group_key
+        self._group_filter.set_search("" if key == "__all__" else key)
+
+        # All Servers is grouped by folder when folders exist
+        sectioned = key == "__all__" and bool(self._folders)
+        if sectioned != self._sectioned:
+            self._sectioned = sectioned
+            self._sort_model.set_section_sorter(self._section_sorter if sectioned else None)
+            if self._list_view.get_model() is self._selection:
+                self._list_view.set_header_factory(self._header_factory if sectioned else None)
+        self._update_search()
+
+    def _on_visible_changed(self, *_args):
+        has_servers = self._list_view.get_model().get_n_items() > 0
+        self._sw.set_visible(has_servers)
+        self._empty_page.set_visible(not has_servers)
+
+    def _on_navigation_preference(self, key):
+        self._list_view.set_single_click_activate(current_preferences().single_click_open)
 
     def _on_unpin_requested(self, server_row):
         ConfigService.toggle_server_pin(server_row.server_info.id)
-        self._rebuild_list()
+        self._sync()
+
+    # ------------------------------------------------------------------
+    # Rows and group headings
+    # ------------------------------------------------------------------
 
-    def _add_section(self, title: str, servers: list, is_first: bool = False):
-        """Append a group header label followed by a boxed-list for its servers."""
-        label = Gtk.Label(
-            label=title,
+    def _on_row_setup(self, factory, list_item):
+        row = ServerRow()
+        row.connect("unpin-requested", self._on_unpin_requested)
+        list_item.set_child(row)
+
+    def _on_row_bind(self, factory, list_item):
+        item = list_item.get_item()
+        list_item.get_child().update_from(item.server_info, item.pinned)
+
+    def _on_header_setup(self, factory, list_header):
+        list_header.set_child(Gtk.Label(
             xalign=0,
             css_classes=["heading"],
-            margin_top=0 if is_first else 20,
             margin_bottom=6,
-        )
-        self._content_box.append(label)
-        lb = self._make_list_box()
-        pinned, unpinned = self._partition_pinned(servers)
-        for s in pinned:
-            lb.append(self._make_server_row(s, True))
-        for s in unpinned:
-            lb.append(self._make_server_row(s, False))
-        self._content_box.append(lb)
-        self._list_boxes.append(lb)
-
-    def _add_flat_list(self, servers: list):
-        """Append a boxed-list without a header (used for single-group views)."""
-        lb = self._make_list_box()
-        pinned, unpinned = self._partition_pinned(servers)
-        for s in pinned:
-            lb.append(self._make_server_row(s, True))
-        for s in unpinned:
-            lb.append(self._make_server_row(s, False))
-        self._content_box.append(lb)
-        self._list_boxes.append(lb)
-
-    def _rebuild_list(self):
-        self._clear_content()
-
-        folder_ids = {f.id for f in self._folders}
-        server_count = 0
-
-        if self._current_group_key == "__all__":
-            server_count = self._rebuild_all_servers(folder_ids)
-        elif self._current_group_key == "__ungrouped__":
-            visible = [s for s in self._servers if not s.folder_id or s.folder_id not in folder_ids]
-            if self._search_query:
-                visible = [s for s in visible if self._server_matches(s)]
-            visible.sort(key=lambda s: s.display_name.lower())
-            if visible:
-                self._add_flat_list(visible)
-            server_count = len(visible)
-        else:
-            visible = [s for s in self._servers if s.folder_id == self._current_group_key]
-            if self._search_query:
-                visible = [s for s in visible if self._server_matches(s)]
-            visible.sort(key=lambda s: s.display_name.lower())
-            if visible:
-                self._add_flat_list(visible)
-            server_count = len(visible)
-
-        self._sw.set_visible(server_count > 0)
-        self._empty_page.set_visible(server_count == 0)
-
-    def _rebuild_all_servers(self, folder_ids: set) -> int:
-        """Populate content for 'All Servers', grouped by folder when folders exist."""
-        if not self._folders:
-            visible = list(self._servers)
-            if self._search_query:
-                visible = [s for s in visible if self._server_matches(s)]
-            visible.sort(key=lambda s: s.display_name.lower())
-            if visible:
-                self._add_flat_list(visible)
-            return len(visible)
-
-        folder_groups = {f.id: [] for f in self._folders}
-        ungrouped = []
-        for s in self._servers:
-            if s.folder_id and s.folder_id in folder_ids:
-                folder_groups[s.folder_id].append(s)
-            else:
-                ungrouped.append(s)
-
-        if self._search_query:
-            for fid in folder_groups:
-                folder_groups[fid] = [s for s in folder_groups[fid] if self._server_matches(s)]
-            ungrouped = [s for s in ungrouped if self._server_matches(s)]
-
-        total = 0
-        is_first = True
-        for folder in self._folders:
-            members = sorted(folder_groups.get(folder.id, []), key=lambda s: s.display_name.lower())
-            if not members:
-                continue
-            self._add_section(folder.name, members, is_first)
-            is_first = False
-            total += len(members)
-
-        if ungrouped:
-            ungrouped.sort(key=lambda s: s.display_name.lower())
-            self._add_section("Without Group", ungrouped, is_first)
-            total += len(ungrouped)
+        ))
 
-        return total
+    def _on_header_bind(self, factory, list_header):
+        label = list_header.get_child()
+        label.set_label(list_header.get_item().group_name)
+        label.set_margin_top(0 if list_header.get_start() == 0 else 20)
 
     # ------------------------------------------------------------------
     # Row signals
     # ------------------------------------------------------------------
 
-    def _on_row_activated(self, list_box, row):
-        child = row.get_child()
-        if isinstance(child, ServerRow):
-            self.emit("server-activated", child.server_info)
+    def _on_row_activated(self, list_view, position):
+        item = list_view.get_model().get_item(position)
+        if item is not None:
+            self.emit("server-activated", item.server_info)
 
-    def _on_row_selected(self, list_box, row):
-        if self._selection_updating:
+    def _on_selected_item(self, selection, pspec):
+        if selection is not self._list_view.get_model():
             return
-        if row is not None:
-            # Clear selection in all other groups
-            self._selection_updating = True
-            for lb in self._list_boxes:
-                if lb is not list_box:
-                    lb.select_row(None)
-            self._selection_updating = False
-            self._active_list_box = list_box
-        is_server = row is not None and isinstance(row.get_child(), ServerRow)
-        self.emit("selection-changed", is_server)
+        self.emit("selection-changed", selection.get_selected_item() is not None)
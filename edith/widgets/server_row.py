@@ -22,7 +22,7 @@ class ServerRow(Gtk.Box):
         "unpin-requested": (GObject.SignalFlags.RUN_FIRST, None, ()),
     }
 
-    def __init__(self, server_info: ServerInfo, pinned: bool = False):
+    def __init__(self, server_info: ServerInfo | None = None, pinned: bool = False):
         super().__init__(
             orientation=Gtk.Orientation.HORIZONTAL,
             spacing=8,
@@ -31,50 +31,51 @@ class ServerRow(Gtk.Box):
             margin_top=10,
             margin_bottom=10,
         )
-        self.server_info = server_info
+        self.server_info = None
 
         labels = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, hexpand=True, spacing=2)
 
         # Top row: name + protocol badge
         name_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
         name_label = Gtk.Label(
-            label=server_info.display_name,
             xalign=0,
             css_classes=["heading"],
         )
         name_box.append(name_label)
 
-        tag, css_class = self._protocol_badge(server_info)
         badge = Gtk.Label(
-            label=tag,
             valign=Gtk.Align.CENTER,
-            css_classes=["protocol-badge", css_class, "caption"],
+            css_classes=["protocol-badge", "caption"],
         )
         name_box.append(badge)
         labels.append(name_box)
 
         detail_label = Gtk.Label(
-            label=f"{server_info.username}@{server_info.host}:{server_info.port}",
             xalign=0,
             css_classes=["dim-label", "caption"],
         )
         labels.append(detail_label)
         self.append(labels)
 
-        if pinned:
-            pin_btn = Gtk.Button(
-                icon_name="edith-pin-symbolic",
-                valign=Gtk.Align.CENTER,
-                css_classes=["flat", "dim-label"],
-                tooltip_text=_("Unpin"),
-                focusable=False,
-            )
-            pin_btn.connect("clicked", lambda _: self.emit("unpin-requested"))
-            self.append(pin_btn)
+        # Shown for pinned servers only; the row is reused for others.
+        pin_btn = Gtk.Button(
+            icon_name="edith-pin-symbolic",
+            valign=Gtk.Align.CENTER,
+            css_classes=["flat", "dim-label"],
+            tooltip_text=_("Unpin"),
+            focusable=False,
+            visible=False,
+        )
+        pin_btn.connect("clicked", lambda _: self.emit("unpin-requested"))
+        self.append(pin_btn)
 
         self._name_label = name_label
         self._detail_label = detail_label
         self._badge = badge
+        self._pin_btn = pin_btn
+
+        if server_info is not None:
+            self.update_from(server_info, pinned)
 
     @staticmethod
     def _protocol_badge(server_info: ServerInfo) -> tuple:
@@ -91,7 +92,8 @@ class ServerRow(Gtk.Box):
             return ("FTP/TLS", "badge-tls")
         return ("FTP", "badge-insecure")
 
-    def update_from(self, server_info: ServerInfo):
+    def update_from(self, server_info: ServerInfo, pinned: bool = False):
+        """Show `server_info`, for a new row or one reused by a list view."""
         self.server_info = server_info
         self._name_label.set_label(server_info.display_name)
         self._detail_label.set_label(
@@ -103,3 +105,4 @@ class ServerRow(Gtk.Box):
         for cls in ("badge-ssh", "badge-tls", "badge-insecure"):
             self._badge.remove_css_class(cls)
         self._badge.add_css_class(css_class)
+        self._pin_btn.set_visible(pinned)
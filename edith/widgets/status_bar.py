@@ -9,6 +9,7 @@ from gi.repository import GObject, Gtk
 
 from edith.monaco_languages import MONACO_LANGUAGES
 from edith.services.config import ConfigService
+from edith.services.preferences import Preferences, current as current_preferences
 from edith.i18n import _
 
 
@@ -17,7 +18,6 @@ class StatusBar(Gtk.Box):
 
     __gsignals__ = {
         "language-selected":   (GObject.SignalFlags.RUN_FIRST, None, (str,)),
-        "indent-changed":      (GObject.SignalFlags.RUN_FIRST, None, (bool, int)),
         "line-ending-changed": (GObject.SignalFlags.RUN_FIRST, None, (str,)),
         "cursor-clicked":      (GObject.SignalFlags.RUN_FIRST, None, ()),
         "wrap-toggled":        (GObject.SignalFlags.RUN_FIRST, None, ()),
@@ -122,6 +122,11 @@ class StatusBar(Gtk.Box):
         )
         self.append(self._eol_btn)
 
+        # Indentation set in Preferences shows here without anyone passing
+        # it on.
+        Preferences.get().watch(self, self._on_indent_preference,
+                                "editor_insert_spaces", "editor_tab_size")
+
     # ── Language popover ─────────────────────────────────────────────── #
 
     def _build_language_popover(self):
@@ -231,9 +236,13 @@ class StatusBar(Gtk.Box):
         popover.connect("show", self._on_indent_popover_show)
         return popover
 
+    def _on_indent_preference(self, key):
+        prefs = current_preferences()
+        self._update_indent_label(prefs.editor_insert_spaces, prefs.editor_tab_size)
+
     def _on_indent_popover_show(self, popover):
-        insert_spaces = ConfigService.get_preference("editor_insert_spaces", True)
-        tab_size = ConfigService.get_preference("editor_tab_size", 4)
+        prefs = current_preferences()
+        insert_spaces, tab_size = prefs.editor_insert_spaces, prefs.editor_tab_size
 
         self._spaces_radio.set_active(insert_spaces)
         self._tabs_radio.set_active(not insert_spaces)
@@ -248,16 +257,16 @@ class StatusBar(Gtk.Box):
     def _on_type_toggled(self, radio):
         if not radio.get_active():
             return
-        self._emit_indent_changed()
+        self._save_indent()
 
     def _on_size_btn_toggled(self, btn, size):
         if not btn.get_active():
             return
         if getattr(self, "_updating_indent", False):
             return
-        self._emit_indent_changed()
+        self._save_indent()
 
-    def _emit_indent_changed(self):
+    def _save_indent(self):
         insert_spaces = self._spaces_radio.get_active()
         tab_size = next(
             (n for n, b in self._size_btns.items() if b.get_active()), 4
@@ -265,7 +274,6 @@ class StatusBar(Gtk.Box):
         ConfigService.set_preference("editor_insert_spaces", insert_spaces)
         ConfigService.set_preference("editor_tab_size", tab_size)
         self._update_indent_label(insert_spaces, tab_size)
-        self.emit("indent-changed", insert_spaces, tab_size)
 
     def _update_indent_label(self, insert_spaces, tab_size):
         label = (_("Spaces: {n}").format(n=tab_size) if insert_spaces
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import os
+import time
 from pathlib import Path
 import gi
 
@@ -11,6 +12,8 @@ gi.require_version("Adw", "1")
 from gi.repository import Adw, Gdk, Gio, GLib, Gtk
 
 from edith.services.config import ConfigService
+from edith.services.poll_schedule import BACKGROUND_FACTOR, TAB_FACTOR, PollSchedule
+from edith.services.preferences import current as current_preferences
 from edith.widgets.path_bar import PathBar
 from edith.widgets.server_list import ServerList
 from edith.widgets.server_panel import ServerPanel
@@ -44,7 +47,12 @@ class EdithWindow(Adw.ApplicationWindow):
         self._saving_paths = set()     # paths currently being uploaded (suppress poll)
         self._poll_timer_id = None
         self._poll_in_flight = False
+        self._remote_watcher = None    # pushes changes where the server can
+        self._poll_schedule = None     # per-file poll intervals (PollSchedule)
         self._reload_dialog_paths = set()  # paths with an open reload dialog
+        self._followers = {}           # remote_path -> LogFollower (Follow mode)
+        self._follow_in_flight = set() # followed paths with a poll running
+        self._follow_timer_id = None
         self._sidebar_width_timer = None   # debounces saving the paned position
         self._sidebar_width_suppress = None  # ignores programmatic resizes
 
@@ -299,7 +307,6 @@ class EdithWindow(Adw.ApplicationWindow):
 
         self._status_bar = StatusBar()
         self._status_bar.connect("language-selected", self._on_language_selected)
-        self._status_bar.connect("indent-changed", self._on_indent_changed)
         self._status_bar.connect("line-ending-changed", self._on_line_ending_changed)
         self._status_bar.connect("cursor-clicked", lambda _: self._on_goto_line(None, None))
         self._status_bar.connect("wrap-toggled", self._on_status_wrap_toggled)
@@ -332,6 +339,7 @@ class EdithWindow(Adw.ApplicationWindow):
 
     def _setup_actions(self):
         self.connect("close-request", self._on_close_request)
+        self.connect("destroy", lambda _w: self._record_poll_stats())
         app = self.get_application()
 
         # Toggle sidebar
@@ -433,6 +441,8 @@ class EdithWindow(Adw.ApplicationWindow):
             self._save_sidebar_width()
 
         if self._force_close:
+            # "Quit Anyway": the unsaved changes were given up.
+            self._editor_panel.discard_journals(unsaved=True)
             return False  # allow close
 
         has_unsaved = self._editor_panel.has_unsaved()
@@ -441,6 +451,7 @@ class EdithWindow(Adw.ApplicationWindow):
         )
 
         if not has_unsaved and not has_transfers:
+            self._editor_panel.discard_journals()
             return False  # nothing to warn about
 
         parts = []
@@ -475,6 +486,11 @@ class EdithWindow(Adw.ApplicationWindow):
         dialog.present(self)
         return True  # block the close
 
+    def discard_clean_journals(self):
+        """Forget the journals of the tabs without unsaved changes; the
+        application is shutting down without asking."""
+        self._editor_panel.discard_journals()
+
     def _on_sidebar_toggled(self, btn):
         self._toggle_sidebar()
 
@@ -1046,6 +1062,10 @@ class EdithWindow(Adw.ApplicationWindow):
         protocol = getattr(server_info, "protocol", "sftp")
 
         def do_connect():
+            from edith.services import capability_cache
+            # With what the last connection learned, the listing can go up
+            # as soon as auth completes; the probes run again afterwards.
+            cached = capability_cache.load(server_info)
             if protocol in ("ftp", "ftps"):
                 from edith.services.ftp_client import FtpClient
                 client = FtpClient()
@@ -1059,6 +1079,7 @@ class EdithWindow(Adw.ApplicationWindow):
                     username=server_info.username,
                     password=password,
                     encryption=encryption,
+                    capabilities=cached,
                 )
             else:
                 from edith.services.sftp_client import SftpClient
@@ -1070,25 +1091,23 @@ class EdithWindow(Adw.ApplicationWindow):
                     password=password,
                     key_file=server_info.key_file or None,
                     passphrase=passphrase,
+                    capabilities=cached,
                 )
+            if cached is None or not client.home:
+                capability_cache.store(server_info, client.probe_capabilities())
+                cached = None
             resolved = initial_dir
             if initial_dir == "~" or initial_dir.startswith("~/"):
-                home = client.normalize(".")
-                resolved = home + initial_dir[1:]
-            # Probe exec capability (shared hosts often block it)
-            if hasattr(client, "exec_command"):
-                try:
-                    code, _, _ = client.exec_command("echo ok", timeout=5)
-                    client.can_exec = code == 0
-                except Exception:
-                    client.can_exec = False
-            return client, resolved
+                resolved = client.home + initial_dir[1:]
+            return client, resolved, cached is not None
 
         def on_success(result):
-            client, resolved_dir = result
+            client, resolved_dir, from_cache = result
             self._sftp_client = client
             self._connected_server = server_info
             self._on_connected(server_info, resolved_dir)
+            if from_cache:
+                self._reprobe_capabilities(client, server_info)
 
         def on_error(error):
             self._set_status("error", _("Connection failed: {error}").format(error=error))
@@ -1101,6 +1120,22 @@ class EdithWindow(Adw.ApplicationWindow):
 
         run_async(do_connect, on_success, on_error)
 
+    def _reprobe_capabilities(self, client, server_info):
+        """Check in the background that what the cache said still holds.
+
+        The answers go to the client straight away (can_exec gates the
+        exec-based fast paths) and to the cache for the next connect.
+        """
+        from edith.services import capability_cache
+        from edith.services.async_worker import run_async
+
+        def probe():
+            capability_cache.store(server_info, client.probe_capabilities())
+
+        # A failed probe changes nothing: the cached answers stay in use, and
+        # if the connection itself is gone the browser will say so.
+        run_async(probe, lambda _: None, lambda _e: None, key=client)
+
     def disconnect_server(self):
         """Disconnect from current server, confirming if there are unsaved changes."""
         if self._editor_panel.has_unsaved():
@@ -1139,7 +1174,8 @@ class EdithWindow(Adw.ApplicationWindow):
             self._sftp_client = None
             self._connected_server = None
 
-            run_async(lambda: client.close(), lambda _: None, lambda _: None)
+            # Behind whatever is still queued for it.
+            run_async(lambda: client.close(), lambda _: None, lambda _: None, key=client)
 
         self._on_disconnected()
 
@@ -1151,9 +1187,11 @@ class EdithWindow(Adw.ApplicationWindow):
             self._path_bar.set_path(path)
             self._back_btn.set_sensitive(browser.can_go_back)
             self._forward_btn.set_sensitive(browser.can_go_forward)
+            self._update_remote_watch()
 
     def _on_connected(self, server_info, initial_dir=None):
         """Called after successful connection."""
+        ConfigService.mark_server_used(server_info.id)
         self._set_status("connected", _("Connected to {server}").format(
             server=f"{server_info.username}@{server_info.host}"))
         self.lookup_action("disconnect").set_enabled(True)
@@ -1190,8 +1228,15 @@ class EdithWindow(Adw.ApplicationWindow):
         self._transfer_btn.set_visible(True)
         self._transfer_btn.set_sensitive(False)
 
-        # Start remote file-change polling
-        self._poll_timer_id = GLib.timeout_add_seconds(3, self._poll_remote_mtimes)
+        # Start remote file-change polling, and where the server can push
+        # changes, take every file it watches off the poll.  The timer only
+        # decides what is due; each file has an interval of its own.
+        from edith.services.remote_watcher import RemoteWatcher
+        if RemoteWatcher.supported(self._sftp_client):
+            self._remote_watcher = RemoteWatcher(self._sftp_client, self._on_remote_changes)
+            self._update_remote_watch()
+        self._poll_schedule = PollSchedule()
+        self._poll_timer_id = GLib.timeout_add_seconds(1, self._poll_remote_mtimes)
 
         # Show connected placeholder until the user opens a file
         self._connected_page.set_title(_("Connected to {server}").format(server=server_info.display_name))
@@ -1343,13 +1388,11 @@ class EdithWindow(Adw.ApplicationWindow):
             self._rebuild_pins_bar(self._connected_server)
 
     def _on_editor_page_changed(self, panel):
-        from edith.services.config import ConfigService
         editor = panel.get_current_editor()
         if editor:
             self._status_bar.set_language_name(editor.get_language_name())
-            insert_spaces = ConfigService.get_preference("editor_insert_spaces", True)
-            tab_size = ConfigService.get_preference("editor_tab_size", 4)
-            self._status_bar.set_indent(insert_spaces, tab_size)
+            prefs = current_preferences()
+            self._status_bar.set_indent(prefs.editor_insert_spaces, prefs.editor_tab_size)
             self._status_bar.set_line_ending(editor.get_line_ending())
             self._status_bar.set_cursor_position(*editor.get_cursor_position())
             self._status_bar.set_word_wrap(editor.get_word_wrap())
@@ -1373,9 +1416,6 @@ class EdithWindow(Adw.ApplicationWindow):
             editor.set_language(lang_id or None)
             self._status_bar.set_language_name(editor.get_language_name())
 
-    def _on_indent_changed(self, status_bar, insert_spaces, tab_size):
-        self._editor_panel.apply_indent(insert_spaces, tab_size)
-
     def _on_line_ending_changed(self, status_bar, eol):
         self._editor_panel.set_current_line_ending(eol)
 
@@ -1397,7 +1437,13 @@ class EdithWindow(Adw.ApplicationWindow):
         if self._poll_timer_id:
             GLib.source_remove(self._poll_timer_id)
             self._poll_timer_id = None
+        if self._remote_watcher:
+            self._remote_watcher.stop()
+            self._remote_watcher = None
+        self._record_poll_stats()
         self._external_edits.stop_all()
+        for remote_path in list(self._followers):
+            self.unfollow_file(remote_path)
         self._remote_mtimes.clear()
         self._saving_paths.clear()
         self._reload_dialog_paths.clear()
@@ -1452,23 +1498,47 @@ class EdithWindow(Adw.ApplicationWindow):
             self._editor_panel.focus_tab(existing)
             return
 
+        from edith.services import file_peek
+        from edith.services.content_cache import ContentCache
         from edith.services.temp_manager import TempManager
         from edith.services.transfer_queue import TransferAborted
+        from edith.widgets.image_viewer import is_image_file
 
         name = os.path.basename(remote_path)
         client = self._sftp_client
+        server_id = self._connected_server.id if self._connected_server else None
+        cache = ContentCache.get()
+        may_peek = not is_image_file(remote_path)
 
         def do_download(progress_cb, cancel_event, set_channel):
             local_path = TempManager.get_temp_path(remote_path)
+            # One stat decides whether the copy from last time will do, and
+            # whether the file is too big to fetch just to look at.
+            before = client.stat(remote_path)
+            if cache.fetch(server_id, remote_path, before, local_path):
+                return local_path, before.st_mtime, None
+            if may_peek and file_peek.should_peek(before.st_size):
+                local_path.write_bytes(
+                    file_peek.read_peek(client, remote_path, before.st_size))
+                return local_path, before.st_mtime, before.st_size
             client.download(remote_path, str(local_path), progress_cb=progress_cb,
                             cancel_event=cancel_event, set_channel=set_channel)
-            mtime = client.stat(remote_path).st_mtime
-            return local_path, mtime
+            after = client.stat(remote_path)
+            # Changed while downloading: what we have may be neither version.
+            if (after.st_size, after.st_mtime) == (before.st_size, before.st_mtime):
+                cache.store(server_id, remote_path, after, local_path)
+            return local_path, after.st_mtime, None
 
         def on_success(result):
-            local_path, mtime = result
-            self._remote_mtimes[remote_path] = mtime
-            self._editor_panel.open_file(remote_path, str(local_path))
+            local_path, mtime, peek_size = result
+            # A preview is not watched for changes: reloading it on one would
+            # mean downloading the whole file after all.
+            if peek_size is None:
+                self._remote_mtimes[remote_path] = mtime
+            self._editor_panel.open_file(
+                remote_path, str(local_path),
+                server_id=self._connected_server.id if self._connected_server else None,
+                peek_size=peek_size)
             self._content_stack.set_visible_child_name("editor")
             if self._connected_server:
                 ConfigService.push_recent(self._connected_server.id, remote_path)
@@ -1481,6 +1551,47 @@ class EdithWindow(Adw.ApplicationWindow):
 
         self._transfer_queue.enqueue(name, do_download, on_success, on_error)
 
+    def load_full_file(self, remote_path):
+        """Replace a preview tab's head and tail with the whole file."""
+        editor = self._editor_for_path(remote_path)
+        if (not editor or not editor.is_peek() or not self._sftp_client
+                or not self._transfer_queue):
+            return
+        # Stopped without fetching the preview again; the download below
+        # brings the tab up to date.
+        self.unfollow_file(remote_path, reload=False)
+
+        from edith.services.content_cache import ContentCache
+        from edith.services.transfer_queue import TransferAborted
+
+        name = os.path.basename(remote_path)
+        client = self._sftp_client
+        server_id = self._connected_server.id if self._connected_server else None
+        local_path = editor.open_file.local_path
+
+        def do_download(progress_cb, cancel_event, set_channel):
+            before = client.stat(remote_path)
+            client.download(remote_path, local_path, progress_cb=progress_cb,
+                            cancel_event=cancel_event, set_channel=set_channel)
+            after = client.stat(remote_path)
+            if (after.st_size, after.st_mtime) == (before.st_size, before.st_mtime):
+                ContentCache.get().store(server_id, remote_path, after, local_path)
+            return after.st_mtime
+
+        def on_success(mtime):
+            viewer = self._editor_for_path(remote_path)
+            if viewer is None:
+                return  # closed while downloading
+            self._remote_mtimes[remote_path] = mtime
+            viewer.end_peek()
+
+        def on_error(error):
+            if isinstance(error, TransferAborted):
+                return
+            self.show_toast(_("Failed to download: {error}").format(error=error), "error")
+
+        self._transfer_queue.enqueue(name, do_download, on_success, on_error)
+
     def enqueue_download(self, remote_path, local_path, on_done=None):
         """Queue a download of a remote file to a local path."""
         if not self._sftp_client or not self._transfer_queue:
@@ -1623,42 +1734,113 @@ class EdithWindow(Adw.ApplicationWindow):
     # --- Remote file-change polling ---
 
     def _poll_remote_mtimes(self):
-        """Periodically check remote mtimes for open, unmodified files."""
+        """Check remote mtimes for the open, unmodified files that are due."""
         if not self._sftp_client or self._poll_in_flight:
             return True  # keep timer alive
+        # A bulk transfer has the connection to itself; the poll catches up
+        # after it, and the files it wrote are reloaded by their uploads.
+        if self._transfer_queue and self._transfer_queue.is_busy:
+            return True
+
+        # Tabs opened and closed since the last tick change what to watch.
+        self._update_remote_watch()
+        watcher = self._remote_watcher
+        schedule = self._poll_schedule
+        candidates = self._remote_paths_to_check(self._remote_mtimes)
+        # The directory the browser shows is polled by its own mtime; the
+        # trailing slash keeps it apart from a file of the same name.
+        browser_path = self._file_browser.current_path
+        dir_key = browser_path.rstrip("/") + "/"
+        schedule.retain([*candidates, dir_key])
+
+        now = time.monotonic()
+        current = self._editor_panel.get_current_editor()
+        current_path = current.open_file.remote_path if current else None
+        background = 1 if self.is_active() else BACKGROUND_FACTOR
+
+        if (not (watcher and watcher.watches(browser_path))
+                and schedule.is_due(dir_key, now, background)):
+            def dir_done(changed):
+                if schedule is self._poll_schedule:
+                    schedule.polled(dir_key, changed, time.monotonic())
+
+            self._file_browser.poll_directory(dir_done)
+
+        paths_to_check = {}
+        for remote_path, known_mtime in candidates.items():
+            # The watcher reports these as they change.
+            if watcher and watcher.covers(remote_path):
+                continue
+            factor = background if remote_path == current_path else background * TAB_FACTOR
+            if schedule.is_due(remote_path, now, factor):
+                paths_to_check[remote_path] = known_mtime
+        if not paths_to_check:
+            return True
+
+        self._poll_in_flight = True
+
+        def done(changed):
+            self._poll_in_flight = False
+            if schedule is not self._poll_schedule:
+                return  # disconnected meanwhile
+            now = time.monotonic()
+            changed = {rpath for rpath, _mtime in changed}
+            for rpath in paths_to_check:
+                schedule.polled(rpath, rpath in changed, now)
+
+        self._check_remote_mtimes(paths_to_check, done)
+        return True  # keep timer alive
 
-        # Collect paths to check (skip files being saved)
+    def _record_poll_stats(self):
+        """Write what polling cost this connection to the diagnostic log."""
+        if self._poll_schedule and self._poll_schedule.stats:
+            from edith.services.freeze_watchdog import record
+            record(self._poll_schedule.summary())
+        self._poll_schedule = None
+
+    def _remote_paths_to_check(self, paths):
+        """Those of `paths` whose tab a change on the server should reload,
+        with the mtime last seen for each."""
         paths_to_check = {}
-        for remote_path, known_mtime in self._remote_mtimes.items():
+        for remote_path in paths:
+            if remote_path not in self._remote_mtimes:
+                continue
+            # Skip files being saved
             if remote_path in self._saving_paths:
                 continue
             if remote_path in self._reload_dialog_paths:
                 continue
+            # Followed files are watched far more closely by their follower.
+            if remote_path in self._followers:
+                continue
             if not self._editor_panel.find_tab(remote_path):
                 continue
-            paths_to_check[remote_path] = known_mtime
+            paths_to_check[remote_path] = self._remote_mtimes[remote_path]
+        return paths_to_check
 
-        if not paths_to_check:
-            return True
+    def _check_remote_mtimes(self, paths_to_check, done=None):
+        """Stat each of `paths_to_check` (remote path -> known mtime) on a
+        worker, and reload the tabs of those whose mtime moved.
 
-        self._poll_in_flight = True
+        done: called with the (path, mtime) pairs that moved, or () if the
+            stats failed, before any reload starts.
+        """
         client = self._sftp_client
+        paths = list(paths_to_check)
 
+        from edith.services import aio
         from edith.services.async_worker import run_async
 
-        def do_stat():
-            changed = []
-            for rpath, old_mtime in paths_to_check.items():
-                try:
-                    new_mtime = client.stat(rpath).st_mtime
-                    if new_mtime != old_mtime:
-                        changed.append((rpath, new_mtime))
-                except OSError:
-                    pass
-            return changed
+        def moved(attrs):
+            return [
+                (rpath, attr.st_mtime)
+                for rpath, attr in zip(paths, attrs)
+                if not isinstance(attr, OSError) and attr.st_mtime != paths_to_check[rpath]
+            ]
 
         def on_stat_done(changed):
-            self._poll_in_flight = False
+            if done:
+                done(changed)
             for rpath, new_mtime in changed:
                 # A save may have started *after* paths_to_check was collected;
                 # its own upload bumps the remote mtime, which would otherwise
@@ -1667,7 +1849,11 @@ class EdithWindow(Adw.ApplicationWindow):
                     continue
                 if rpath in self._reload_dialog_paths:
                     continue
+                if rpath not in self._remote_mtimes:
+                    continue  # closed meanwhile
                 self._remote_mtimes[rpath] = new_mtime
+                if rpath in self._followers:
+                    continue
                 viewer = self._viewer_for_path(rpath)
                 if not viewer:
                     continue
@@ -1677,10 +1863,55 @@ class EdithWindow(Adw.ApplicationWindow):
                     self._redownload_and_reload(rpath)
 
         def on_stat_error(_):
-            self._poll_in_flight = False
+            if done:
+                done(())
 
-        run_async(do_stat, on_stat_done, on_stat_error)
-        return True  # keep timer alive
+        # Pipelined where the client can: one round trip for all of them.
+        if aio.available():
+            async def check():
+                try:
+                    attrs = await aio.AsyncClient(client).stat_many(paths)
+                except Exception as e:
+                    on_stat_error(e)
+                else:
+                    on_stat_done(moved(attrs))
+
+            aio.spawn(check())
+        else:
+            run_async(lambda: moved(client.stat_many(paths)), on_stat_done,
+                      on_stat_error, key=client)
+
+    def _update_remote_watch(self):
+        """Point the remote watcher at the directories of the open files and
+        the one the browser shows."""
+        if not self._remote_watcher:
+            return
+        dirs = {os.path.dirname(p) for p in self._remote_paths_to_check(self._remote_mtimes)}
+        dirs.add(self._file_browser.current_path)
+        self._remote_watcher.watch(dirs)
+
+    def _on_remote_changes(self, paths):
+        """The remote watcher saw `paths` change on the server."""
+        if not self._sftp_client:
+            return
+        # Same checks as a poll: our own uploads and touches that leave the
+        # mtime where it was must not reload anything.
+        paths_to_check = self._remote_paths_to_check(paths)
+        if paths_to_check:
+            schedule = self._poll_schedule
+
+            def done(changed):
+                # Should the watcher stop, the poll starts out fast on these.
+                if schedule is self._poll_schedule:
+                    now = time.monotonic()
+                    for rpath, _mtime in changed:
+                        schedule.changed(rpath, now)
+
+            self._check_remote_mtimes(paths_to_check, done)
+        browser_path = self._file_browser.current_path
+        if any(os.path.dirname(p) == browser_path and p not in self._saving_paths
+               for p in paths):
+            self._file_browser.refresh_path(browser_path)
 
     def _editor_for_path(self, remote_path):
         """Return the MonacoEditor widget for a given remote path, or None."""
@@ -1701,14 +1932,21 @@ class EdithWindow(Adw.ApplicationWindow):
                 return widget
         return None
 
-    def _redownload_and_reload(self, remote_path):
-        """Re-download a remote file and reload its tab content."""
+    def _redownload_and_reload(self, remote_path, force=False):
+        """Re-download a remote file and reload its tab content.
+
+        force: reload even if the download didn't change the local copy,
+            for when the tab no longer shows what the local copy holds.
+        """
         viewer = self._viewer_for_path(remote_path)
         if not viewer or not self._sftp_client:
             return
 
         client = self._sftp_client
         local_path = viewer.open_file.local_path
+        if getattr(viewer, "is_peek", lambda: False)():
+            self._refresh_peek(viewer)
+            return
 
         from edith.services.async_worker import run_async
 
@@ -1727,13 +1965,37 @@ class EdithWindow(Adw.ApplicationWindow):
             return before is None or before != read_local()
 
         def on_done(changed):
-            if not changed:
+            if not changed and not force:
                 return
             v = self._viewer_for_path(remote_path)
             if v:
                 v.reload_from_disk()
 
-        run_async(do_download, on_done, lambda _: None)
+        run_async(do_download, on_done, lambda _: None, key=client)
+
+    def _refresh_peek(self, editor):
+        """Fetch a preview tab's head and tail again."""
+        from edith.services import file_peek
+        from edith.services.async_worker import run_async
+
+        client = self._sftp_client
+        remote_path = editor.open_file.remote_path
+        local_path = editor.open_file.local_path
+
+        def do_read():
+            size = client.stat(remote_path).st_size or 0
+            data = file_peek.read_peek(client, remote_path, size)
+            with open(local_path, "wb") as f:
+                f.write(data)
+            return size
+
+        def on_done(size):
+            viewer = self._editor_for_path(remote_path)
+            if viewer is not None and viewer.is_peek():
+                viewer.set_peek_size(size)
+                viewer.reload_from_disk()
+
+        run_async(do_read, on_done, lambda _: None, key=client)
 
     def _confirm_remote_reload(self, remote_path):
         """Ask the user whether to reload a file that changed remotely while
@@ -1763,6 +2025,102 @@ class EdithWindow(Adw.ApplicationWindow):
         if response == "reload":
             self._redownload_and_reload(remote_path)
 
+    # --- Follow mode (tailing remote logs) ---
+
+    def is_following(self, remote_path) -> bool:
+        return remote_path in self._followers
+
+    def follow_file(self, remote_path):
+        """Start tailing an open file: new lines are appended as they are
+        written on the server, without downloading the file again."""
+        editor = self._editor_for_path(remote_path)
+        if not editor or not self._sftp_client or remote_path in self._followers:
+            return
+        if editor.open_file.is_modified:
+            self.show_toast(_("Save or discard your changes before following this file"),
+                            "error", 5)
+            return
+
+        from edith.services.log_follower import LogFollower
+        try:
+            follower = LogFollower.from_local_copy(
+                self._sftp_client, remote_path, editor.open_file.local_path)
+        except OSError:
+            return
+        if editor.is_peek():
+            # The local copy ends where the remote file did when the preview
+            # was fetched, and starts as it does: the same starting point.
+            follower.offset = editor.open_file.peek_size
+        self._followers[remote_path] = follower
+        editor.begin_follow()
+        if self._follow_timer_id is None:
+            self._follow_timer_id = GLib.timeout_add(1000, self._poll_followers)
+        # Catch up straight away rather than a second from now.
+        self._poll_followers()
+
+    def unfollow_file(self, remote_path, reload=True):
+        """Stop tailing a file and make the tab an ordinary editor again.
+
+        reload: bring the tab back to the file (or its preview) as it is
+            now; off when the caller is about to do that itself.
+        """
+        if self._followers.pop(remote_path, None) is None:
+            return
+        self._follow_in_flight.discard(remote_path)
+        if not self._followers and self._follow_timer_id:
+            GLib.source_remove(self._follow_timer_id)
+            self._follow_timer_id = None
+
+        editor = self._editor_for_path(remote_path)
+        if not editor:
+            return  # tab already closed
+        editor.end_follow()
+        if not reload:
+            return
+        # The buffer holds a trimmed tail that is neither the local copy nor
+        # the remote file; editing and saving that would cut the file down.
+        # Bring the tab back to the whole file before it is editable.
+        if self._sftp_client:
+            self._redownload_and_reload(remote_path, force=True)
+        else:
+            editor.reload_from_disk()
+
+    def _poll_followers(self):
+        from edith.services.async_worker import run_async
+
+        for remote_path, follower in list(self._followers.items()):
+            if remote_path in self._follow_in_flight:
+                continue
+            if not self._editor_for_path(remote_path):
+                self.unfollow_file(remote_path)
+                continue
+            self._follow_in_flight.add(remote_path)
+            # A failed poll (the file briefly missing mid-rotation, a slow
+            # server) is simply tried again on the next tick, as tail -F does.
+            run_async(
+                follower.poll,
+                lambda result, p=remote_path, f=follower: self._on_follow_polled(p, f, result),
+                lambda exc, p=remote_path: self._follow_in_flight.discard(p),
+                key=follower.client,
+            )
+        if self._followers:
+            return True
+        self._follow_timer_id = None
+        return False
+
+    def _on_follow_polled(self, remote_path, follower, result):
+        self._follow_in_flight.discard(remote_path)
+        if self._followers.get(remote_path) is not follower:
+            return  # stopped (or restarted) while the poll was out
+        editor = self._editor_for_path(remote_path)
+        if not editor:
+            return
+        reset, text = result
+        if reset:
+            editor.follow_reset(text)
+        elif text:
+            editor.follow_append(text)
+
     # --- Transfer queue signal handlers ---
 
     def _on_xfer_queued(self, queue, label, job_id):
@@ -1924,36 +2282,6 @@ class EdithWindow(Adw.ApplicationWindow):
         self._sidebar_stack.set_visible_child_name("file_browser")
         self._file_browser.reveal_file(remote_path)
 
-    def apply_syntax_scheme(self, scheme_id: str):
-        """Apply a syntax colour scheme to all open editor tabs."""
-        self._editor_panel.apply_syntax_scheme(scheme_id)
-
-    def apply_editor_font(self, font_family: str, font_size: int):
-        """Apply a font to all open editor tabs."""
-        self._editor_panel.apply_font(font_family, font_size)
-
-    def apply_navigation_settings(self):
-        """Re-read the single/double click behaviour from config."""
-        self._file_browser.apply_navigation_settings()
-        self._server_panel.apply_navigation_settings()
-
-    def apply_editor_settings(self):
-        """Re-read global editor settings from config and push to all open tabs."""
-        from edith.services.config import ConfigService
-        settings = {
-            "minimap":          ConfigService.get_preference("editor_minimap", False),
-            "renderWhitespace": ConfigService.get_preference("editor_render_whitespace", "selection"),
-            "stickyScroll":     ConfigService.get_preference("editor_sticky_scroll", False),
-            "fontLigatures":    ConfigService.get_preference("editor_font_ligatures", False),
-            "lineNumbers":      ConfigService.get_preference("editor_line_numbers", "on"),
-            "customOptions":    ConfigService.get_preference("editor_overrides", {}),
-        }
-        self._editor_panel.apply_editor_settings(settings)
-        # Refresh the indent display in the status bar too
-        insert_spaces = ConfigService.get_preference("editor_insert_spaces", True)
-        tab_size = ConfigService.get_preference("editor_tab_size", 4)
-        self._status_bar.set_indent(insert_spaces, tab_size)
-
     def show_toast(self, title: str, kind: str = "info", timeout: int = 3):
         """Show a transient toast. kind: 'info', 'success', 'error'."""
         _icons = {"error": ("dialog-error-symbolic", "toast-error-icon"),
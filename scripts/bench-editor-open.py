@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2025 Kreuder <mk@singular.de>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Time from opening an editor tab to the file first on screen, with and
+without the pool of pre-loaded WebViews.
+
+Opens the same file a number of times in a bare window: first with the
+pool turned off, so every editor starts a WebView and loads Monaco from
+scratch, then with a pool that is given time to refill between opens.
+Each time is what MonacoEditor's "first-paint" signal reports, i.e. from
+the widget being created to two animation frames after the file was set.
+
+Runs against the installed edith package and needs a display:
+
+    python3 scripts/bench-editor-open.py [--rounds N] [FILE]
+
+Config and cache go to a throwaway directory, so neither the user's
+settings nor their recovery journals are touched.
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("file", nargs="?", default=__file__,
+                        help="file to open (default: this script)")
+    parser.add_argument("--rounds", type=int, default=10,
+                        help="opens per mode (default: 10)")
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix="edith-bench-")
+    os.environ["XDG_CONFIG_HOME"] = os.path.join(scratch, "config")
+    os.environ["XDG_CACHE_HOME"] = os.path.join(scratch, "cache")
+    # Its own copy, since the editor writes next to the file it opens.
+    local_path = os.path.join(scratch, os.path.basename(args.file))
+    shutil.copyfile(args.file, local_path)
+
+    import gi
+
+    gi.require_version("Gtk", "4.0")
+    gi.require_version("Adw", "1")
+    from gi.repository import Adw, GLib
+
+    from edith.models.open_file import OpenFile
+    from edith.services.config import ConfigService
+    from edith.widgets.editor_pool import EditorPool
+    from edith.widgets.monaco_editor import MonacoEditor
+
+    results = {False: [], True: []}
+    plan = [False] * args.rounds + [True] * args.rounds
+    pool = EditorPool.get()
+
+    def on_activate(app):
+        win = Adw.ApplicationWindow(application=app, default_width=900,
+                                    default_height=700)
+        win.present()
+
+        def next_round():
+            if not plan:
+                app.quit()
+                return GLib.SOURCE_REMOVE
+            pooled = plan[0]
+            ConfigService.set_preference("editor_webview_pool", 1 if pooled else 0)
+            if pooled and not any(s.ready for s in pool._spares):
+                pool.prefill()
+                GLib.timeout_add(100, next_round)
+                return GLib.SOURCE_REMOVE
+            plan.pop(0)
+
+            editor = MonacoEditor(OpenFile(remote_path="/bench/" + os.path.basename(local_path),
+                                           local_path=local_path))
+
+            def on_painted(_editor, elapsed_ms, was_pooled):
+                results[was_pooled].append(elapsed_ms)
+                win.set_content(None)
+                GLib.timeout_add(250, next_round)
+
+            editor.connect("first-paint", on_painted)
+            win.set_content(editor)
+            return GLib.SOURCE_REMOVE
+
+        GLib.idle_add(next_round)
+
+    app = Adw.Application(application_id="de.singular.edith.BenchEditorOpen")
+    app.connect("activate", on_activate)
+    try:
+        app.run([])
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    print(f"{'':8} {'n':>3} {'median':>8} {'mean':>8} {'min':>8} {'max':>8}")
+    for pooled, label in ((False, "fresh"), (True, "pooled")):
+        times = results[pooled]
+        if not times:
+            print(f"{label:8} {0:>3}")
+            continue
+        print(f"{label:8} {len(times):>3} {statistics.median(times):>7.0f}ms "
+              f"{statistics.mean(times):>7.0f}ms {min(times):>7.0f}ms {max(times):>7.0f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2025 Kreuder <mk@singular.de>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Time to load and to edit thousands of servers in the sidebar and the
+server panel.
+
+Saves N servers (5,000 by default) in M groups to the config, opens a
+bare window with the sidebar and the panel wired up the way EdithWindow
+wires them, and times the first load, then a series of edits made the
+way the UI makes them: rename a server, pin and unpin one, move one to
+another group, add one, delete one, rename a group and move a group to
+the top.  Each time runs from the change until the window has painted
+it; "update" is the part spent updating the models.  "rows" is how many
+server rows were built along the way.
+
+Runs against the installed edith package and needs a display:
+
+    python3 scripts/bench-server-list.py [--servers N] [--groups M]
+
+Config and cache go to a throwaway directory, so the user's servers are
+not touched.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import replace
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--servers", type=int, default=5000,
+                        help="servers to load (default: 5000)")
+    parser.add_argument("--groups", type=int, default=50,
+                        help="groups to spread them over (default: 50)")
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix="edith-bench-")
+    os.environ["XDG_CONFIG_HOME"] = os.path.join(scratch, "config")
+    os.environ["XDG_CACHE_HOME"] = os.path.join(scratch, "cache")
+
+    import gi
+
+    gi.require_version("Gtk", "4.0")
+    gi.require_version("Adw", "1")
+    from gi.repository import Adw, GLib, Gtk
+
+    from edith.models.server import FolderInfo, ServerInfo
+    from edith.services.config import ConfigService
+    from edith.widgets.server_list import ServerList
+    from edith.widgets.server_panel import ServerPanel
+    from edith.widgets.server_row import ServerRow
+
+    folders = [FolderInfo(name=f"Group {i:03}") for i in range(args.groups)]
+    servers = [
+        ServerInfo(name=f"server-{i:05}", host=f"host{i}.example.com",
+                   username="deploy",
+                   # Every tenth server in no group.
+                   folder_id=folders[i % len(folders)].id if folders and i % 10 else "")
+        for i in range(args.servers)
+    ]
+    ConfigService.save_all(servers, folders)
+    ConfigService.flush()
+
+    rows_built = [0]
+    row_init = ServerRow.__init__
+
+    def counting_init(self, *a, **kw):
+        rows_built[0] += 1
+        row_init(self, *a, **kw)
+
+    ServerRow.__init__ = counting_init
+
+    results = []
+
+    def on_activate(app):
+        win = Adw.ApplicationWindow(application=app, default_width=1100,
+                                    default_height=800)
+        paned = Gtk.Paned(position=260)
+        win.set_content(paned)
+        win.present()
+        sidebar = panel = None
+
+        def show_group(_sidebar, key):
+            panel.show_group(key, ConfigService.load_folders(), ConfigService.load_servers())
+
+        def servers_changed(_panel):
+            key = sidebar.get_selected_key()
+            sidebar.load_servers()
+            sidebar.select_group(key or "__all__")
+
+        def load():
+            nonlocal sidebar, panel
+            sidebar = ServerList()
+            panel = ServerPanel()
+            sidebar.connect("group-selected", show_group)
+            panel.connect("servers-changed", servers_changed)
+            paned.set_start_child(sidebar)
+            paned.set_end_child(panel)
+            sidebar.select_group("__all__")
+
+        def changed_servers():
+            panel.reload()
+            panel.emit("servers-changed")
+
+        def rename_server():
+            s = servers[len(servers) // 2]
+            ConfigService.update_server(replace(s, name="a renamed server"))
+            changed_servers()
+
+        def toggle_pin():
+            ConfigService.toggle_server_pin(servers[len(servers) // 3].id)
+            changed_servers()
+
+        def move_server():
+            s = servers[len(servers) // 4]
+            target = folders[-1].id if folders else ""
+            ConfigService.update_server(replace(s, folder_id=target))
+            changed_servers()
+
+        added = ServerInfo(name="added server", host="added.example.com")
+
+        def add_server():
+            ConfigService.add_server(added)
+            changed_servers()
+
+        def delete_server():
+            ConfigService.delete_server(added.id)
+            changed_servers()
+
+        def rename_group():
+            if folders:
+                folder = replace(folders[0], name="A renamed group")
+                ConfigService.update_folder(folder)
+            servers_changed(panel)
+
+        def reorder_groups():
+            if folders:
+                ConfigService.reorder_folders([folders[-1].id])
+            servers_changed(panel)
+
+        steps = [
+            ("first load", load),
+            ("rename server", rename_server),
+            ("pin server", toggle_pin),
+            ("unpin server", toggle_pin),
+            ("move server", move_server),
+            ("add server", add_server),
+            ("delete server", delete_server),
+            ("rename group", rename_group),
+            ("reorder groups", reorder_groups),
+        ]
+
+        def next_step():
+            if not steps:
+                app.quit()
+                return GLib.SOURCE_REMOVE
+            label, action = steps.pop(0)
+            rows_before = rows_built[0]
+            start = time.perf_counter()
+            action()
+            update_ms = (time.perf_counter() - start) * 1000
+            clock = win.get_frame_clock()
+
+            def painted(_clock):
+                clock.disconnect(handler)
+                total_ms = (time.perf_counter() - start) * 1000
+                results.append((label, update_ms, total_ms, rows_built[0] - rows_before))
+                # Let anything the change left behind settle first.
+                GLib.timeout_add(200, next_step)
+
+            handler = clock.connect("after-paint", painted)
+            win.queue_draw()
+            return GLib.SOURCE_REMOVE
+
+        GLib.timeout_add(500, next_step)
+
+    app = Adw.Application(application_id="de.singular.edith.BenchServerList")
+    app.connect("activate", on_activate)
+    try:
+        app.run([])
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    print(f"{args.servers} servers in {args.groups} groups")
+    print(f"{'':16} {'update':>8} {'painted':>8} {'rows':>5}")
+    for label, update_ms, total_ms, rows in results:
+        print(f"{label:16} {update_ms:>6.1f}ms {total_ms:>6.1f}ms {rows:>5}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
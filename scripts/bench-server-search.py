@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2025 Kreuder <mk@singular.de>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Time per keystroke of the server search, over thousands of servers.
+
+Indexes N made-up servers (5,000 by default) in a few dozen groups, then
+types a handful of queries into ServerIndex one character at a time the
+way the search bar hands them over: plain words, words of name, host and
+group mixed, abbreviations that only match as a subsequence, and one
+that matches nothing.  Prints the time per keystroke, against the 16 ms
+of a frame, and what it costs to index them all, to re-index after one
+server changed and to take in new last-used times.
+
+Runs against the installed edith package and needs no display:
+
+    python3 scripts/bench-server-search.py [--servers N]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+
+_ROLES = ("web", "db", "cache", "mail", "api", "worker", "lb", "ci", "backup", "search")
+_ENVS = ("prod", "stage", "dev", "test")
+_SITES = ("fra1", "ams3", "nyc2", "sfo1", "sgp1")
+_USERS = ("deploy", "root", "admin", "www-data", "ubuntu")
+_QUERIES = ("web-prod", "db stage 12", "wkrprd", "acme cache", "example.com", "root fra", "zzzz")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--servers", type=int, default=5000,
+                        help="servers to index (default: 5000)")
+    args = parser.parse_args()
+
+    from dataclasses import replace
+
+    from edith.models.server import FolderInfo, ServerInfo
+    from edith.services.server_index import ServerIndex
+
+    rng = random.Random(1)
+    folders = [FolderInfo(name=f"{customer} {kind}")
+               for customer in ("Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark")
+               for kind in ("Hosting", "Internal", "Legacy", "Staging", "Mail", "Shop")]
+    servers = []
+    for i in range(args.servers):
+        name = f"{rng.choice(_ROLES)}-{rng.choice(_ENVS)}-{i:04}"
+        servers.append(ServerInfo(
+            name=name,
+            host=f"{name}.{rng.choice(_SITES)}.example.com",
+            username=rng.choice(_USERS),
+            folder_id=rng.choice(folders).id if i % 10 else "",
+        ))
+    last_used = {s.id: 1_700_000_000 + i for i, s in enumerate(rng.sample(servers, 50))}
+
+    index = ServerIndex()
+    start = time.perf_counter()
+    index.sync(servers, folders)
+    build_ms = (time.perf_counter() - start) * 1000
+    index.set_last_used(last_used)
+
+    print(f"{args.servers} servers in {len(folders)} groups, "
+          f"indexed in {build_ms:.0f} ms")
+    print(f"{'query':14} {'matches':>8} {'median':>8} {'max':>8}")
+    every = []
+    for query in _QUERIES:
+        times = []
+        for n in range(1, len(query) + 1):
+            start = time.perf_counter()
+            matches = index.search(query[:n])
+            times.append((time.perf_counter() - start) * 1000)
+        every.extend(times)
+        print(f"{query:14} {len(matches):>8} {statistics.median(times):>6.2f}ms "
+              f"{max(times):>6.2f}ms")
+    print(f"{'every key':14} {'':>8} {statistics.median(every):>6.2f}ms "
+          f"{max(every):>6.2f}ms")
+
+    servers[len(servers) // 2] = replace(servers[len(servers) // 2], name="renamed")
+    start = time.perf_counter()
+    index.sync(servers, folders)
+    print(f"re-index after one edit: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    last_used[servers[0].id] = int(time.time())
+    start = time.perf_counter()
+    index.set_last_used(last_used)
+    index.search("web")
+    print(f"new last-used, then search: {(time.perf_counter() - start) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
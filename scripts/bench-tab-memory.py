@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2025 Kreuder <mk@singular.de>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Resident memory of many open editor tabs, live and hibernated.
+
+Opens the same file in N tabs (50 by default) of a bare EditorPanel,
+waits until every editor has loaded it, then hibernates all but the
+selected one.  Prints the resident memory of Edith and its web processes
+at each step, which is what editor_memory_budget_mb is measured against.
+
+Runs against the installed edith package and needs a display:
+
+    python3 scripts/bench-tab-memory.py [--tabs N] [FILE]
+
+Config and cache go to a throwaway directory, the WebView pool is off
+so spares don't count towards the numbers, and automatic hibernation is
+off so that only the benchmark decides what hibernates.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+# After the last tab loads or hibernates, for memory to settle: web
+# processes take a moment to exit, and the numbers to stop moving.
+_SETTLE_S = 3
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("file", nargs="?", default=__file__,
+                        help="file to open (default: this script)")
+    parser.add_argument("--tabs", type=int, default=50,
+                        help="tabs to open (default: 50)")
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix="edith-bench-")
+    os.environ["XDG_CONFIG_HOME"] = os.path.join(scratch, "config")
+    os.environ["XDG_CACHE_HOME"] = os.path.join(scratch, "cache")
+
+    import gi
+
+    gi.require_version("Gtk", "4.0")
+    gi.require_version("Adw", "1")
+    from gi.repository import Adw, GLib
+
+    from edith.services.config import ConfigService
+    from edith.services.process_memory import tree_rss
+    from edith.widgets.editor_panel import EditorPanel
+
+    ConfigService.set_preference("editor_webview_pool", 0)
+    # Only the benchmark decides what hibernates.
+    ConfigService.set_preference("editor_hibernate_after_min", 0)
+    ConfigService.set_preference("editor_memory_budget_mb", 0)
+    samples = []
+
+    def sample(label):
+        samples.append((label, tree_rss() or 0))
+
+    def wait_until(condition, then):
+        def settled():
+            then()
+            return GLib.SOURCE_REMOVE
+
+        def poll():
+            if not condition():
+                return GLib.SOURCE_CONTINUE
+            GLib.timeout_add_seconds(_SETTLE_S, settled)
+            return GLib.SOURCE_REMOVE
+
+        GLib.timeout_add(100, poll)
+
+    def on_activate(app):
+        win = Adw.ApplicationWindow(application=app, default_width=1000,
+                                    default_height=700)
+        panel = EditorPanel()
+        win.set_content(panel)
+        win.present()
+        loaded = set()
+
+        def open_tabs():
+            sample("no tabs")
+            name = os.path.basename(args.file)
+            for i in range(args.tabs):
+                # Each tab its own copy, as each would be after a download.
+                local_path = os.path.join(scratch, str(i), name)
+                os.makedirs(os.path.dirname(local_path))
+                shutil.copyfile(args.file, local_path)
+                panel.open_file(f"/bench/{i}/{name}", local_path)
+                editor = panel.get_current_editor()
+                editor.connect("line-ending-detected",
+                               lambda ed, _eol: loaded.add(ed))
+            wait_until(lambda: len(loaded) == args.tabs, hibernate_tabs)
+            return GLib.SOURCE_REMOVE
+
+        def hibernate_tabs():
+            sample(f"{args.tabs} live")
+            current = panel.get_current_editor()
+            editors = list(panel._editors())
+            for editor in editors:
+                if editor is not current:
+                    editor.hibernate()
+
+            def done():
+                sample(f"{args.tabs - 1} hibernated")
+                app.quit()
+
+            wait_until(lambda: all(e.is_hibernated() for e in editors if e is not current),
+                       done)
+
+        GLib.idle_add(open_tabs)
+
+    app = Adw.Application(application_id="de.singular.edith.BenchTabMemory")
+    app.connect("activate", on_activate)
+    try:
+        app.run([])
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    for label, rss in samples:
+        print(f"{label:>16}: {rss / (1024 * 1024):8.0f} MiB")
+    if len(samples) == 3 and args.tabs:
+        per_tab = (samples[1][1] - samples[0][1]) / args.tabs
+        print(f"{'per live tab':>16}: {per_tab / (1024 * 1024):8.1f} MiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())